@@ -0,0 +1,300 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import argparse
+import sys
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.config import Settings
+
+
+def build_service(args: argparse.Namespace):
+    """
+    Build a FileService for the provider selected on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        FileService: The configured FileService instance.
+    """
+
+    if args.provider == "google":
+        from src.factories.google.container import file_service
+        return file_service(
+            args.bucket,
+            args.folder,
+            args.collection,
+            endpoint_url=args.endpoint_url or None
+        )
+
+    if args.provider == "amazon":
+        from src.factories.amazon.container import file_service
+        return file_service(
+            args.bucket,
+            args.folder,
+            args.table,
+            endpoint_url=args.endpoint_url or None
+        )
+
+    if args.provider == "local":
+        from src.factories.local.container import file_service
+        return file_service(args.root, args.folder, args.database)
+
+    raise ValueError(f"Unknown provider: {args.provider}")
+
+
+def ingest(args: argparse.Namespace) -> int:
+    """
+    Run a resumable bulk ingestion.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+
+    from src.application.ingestion import DirectoryIngestor, iter_directory, iter_manifest
+    from src.infrastructure.local.checkpoint import SqliteCheckpoint
+
+    if args.manifest:
+        items = iter_manifest(args.manifest, id_prefix=args.id_prefix)
+    else:
+        items = iter_directory(args.source, id_prefix=args.id_prefix)
+
+    checkpoint = SqliteCheckpoint(args.checkpoint)
+    print(f"Resuming with {checkpoint.count()} items already checkpointed")
+
+    try:
+        if args.cpu_workers:
+            from src.application.pipeline import IngestionPipeline
+
+            runner = IngestionPipeline(
+                build_service(args),
+                checkpoint=checkpoint,
+                cpu_workers=args.cpu_workers,
+                upload_workers=args.workers,
+                compress=args.compress,
+                progress_interval=args.progress_interval,
+            )
+        else:
+            runner = DirectoryIngestor(
+                build_service(args),
+                checkpoint,
+                workers=args.workers,
+                progress_interval=args.progress_interval,
+            )
+
+        stats = runner.run(items)
+    finally:
+        checkpoint.close()
+
+    return 1 if stats.failed else 0
+
+
+def export(args: argparse.Namespace) -> int:
+    """
+    Export all version metadata to a Parquet, Arrow or JSONL file.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+
+    from src.application.export import export_versions
+
+    stats = export_versions(
+        build_service(args).repository,
+        args.output,
+        format=args.format,
+        segments=args.segments,
+        page_size=args.page_size,
+    )
+    print(f"Exported {stats.rows} versions in {stats.pages} pages")
+    return 0
+
+
+def import_(args: argparse.Namespace) -> int:
+    """
+    Load version metadata written by the export command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+
+    from src.application.export import import_versions
+    from src.domain.entities import FileVersion
+
+    stats = import_versions(
+        build_service(args).repository,
+        args.input,
+        FileVersion,
+        format=args.format,
+        batch_size=args.batch_size,
+    )
+    print(f"Imported {stats.rows} versions in {stats.batches} batches")
+    return 0
+
+
+def load(args: argparse.Namespace) -> int:
+    """
+    Drive the configured backend with a synthetic or recorded workload.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+
+    from src.application.loadgen import LoadRunner, Workload, generate, parse_weights, preload, read_trace
+
+    workload = Workload(
+        rate=args.rate,
+        duration=args.duration,
+        mix=parse_weights(args.mix),
+        sizes=[(int(size), weight) for size, weight in parse_weights(args.sizes).items()],
+        keys=args.keys,
+        zipf=args.zipf,
+        poisson=not args.uniform_arrivals,
+        id_prefix=args.id_prefix,
+        seed=args.seed,
+    )
+    runner = LoadRunner(build_service(args), workers=args.workers)
+
+    if args.preload and not args.replay:
+        stats = runner.run(preload(workload)).operations.get("create")
+        print(f"Preloaded {stats.count if stats else 0} files")
+
+    operations = read_trace(args.replay) if args.replay else generate(workload)
+    report = runner.run(operations, record=args.record, speed=args.speed)
+
+    rows = report.summary()
+    columns = list(rows[0]) if rows else []
+    print(" ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        print(" ".join(
+            f"{value:>12.2f}" if isinstance(value, float) else f"{value:>12}"
+            for value in row.values()
+        ))
+    total = sum(row["count"] for row in rows)
+    print(f"{total} operations in {report.elapsed:.1f}s ({total / report.elapsed if report.elapsed else 0:.1f}/s)")
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list[str] | None): The arguments, defaulting to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    settings = Settings.from_env()
+    default_provider = {"s3": "amazon", "local": "local"}.get(settings.storage_provider, "google")
+
+    parser = argparse.ArgumentParser(description="File persistence tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backend = argparse.ArgumentParser(add_help=False)
+    backend.add_argument("--provider", choices=["google", "amazon", "local"], default=default_provider)
+    backend.add_argument("--bucket", default=settings.bucket_name)
+    backend.add_argument("--folder", default=settings.folder)
+    backend.add_argument("--collection", default=settings.collection_name)
+    backend.add_argument("--table", default=settings.table_name)
+    backend.add_argument(
+        "--endpoint-url",
+        default=settings.storage_endpoint_url,
+        help="Object storage endpoint, e.g. a local S3 or GCS emulator",
+    )
+    backend.add_argument("--root", default=settings.local_root, help="Storage directory for --provider local")
+    backend.add_argument("--database", default=settings.sqlite_database, help="SQLite file for --provider local")
+
+    ingest_parser = commands.add_parser(
+        "ingest",
+        parents=[backend],
+        help="Recursively ingest a directory tree or manifest file",
+    )
+    ingest_parser.add_argument("source", nargs="?", help="Directory to ingest")
+    ingest_parser.add_argument("--manifest", help="File with one path or JSON object per line")
+    ingest_parser.add_argument("--checkpoint", default="ingest-checkpoint.sqlite")
+    ingest_parser.add_argument("--workers", type=int, default=16)
+    ingest_parser.add_argument("--id-prefix", default="")
+    ingest_parser.add_argument("--progress-interval", type=float, default=5.0)
+    ingest_parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=0,
+        help="Hash and compress in this many processes before uploading",
+    )
+    ingest_parser.add_argument("--compress", action="store_true", help="Gzip content before upload")
+    ingest_parser.set_defaults(handler=ingest)
+
+    export_parser = commands.add_parser(
+        "export",
+        parents=[backend],
+        help="Export all version metadata with parallel segment scans",
+    )
+    export_parser.add_argument("output", help="Output file (.parquet, .arrow or .jsonl)")
+    export_parser.add_argument("--format", choices=["parquet", "arrow", "jsonl"])
+    export_parser.add_argument("--segments", type=int, default=4)
+    export_parser.add_argument("--page-size", type=int, default=1000)
+    export_parser.set_defaults(handler=export)
+
+    import_parser = commands.add_parser(
+        "import",
+        parents=[backend],
+        help="Load version metadata written by export",
+    )
+    import_parser.add_argument("input", help="Input file (.parquet, .arrow or .jsonl)")
+    import_parser.add_argument("--format", choices=["parquet", "arrow", "jsonl"])
+    import_parser.add_argument("--batch-size", type=int, default=500)
+    import_parser.set_defaults(handler=import_)
+
+    load_parser = commands.add_parser(
+        "load",
+        parents=[backend],
+        help="Generate or replay load and report latency percentiles",
+    )
+    load_parser.add_argument("--rate", type=float, default=100.0, help="Target operations per second")
+    load_parser.add_argument("--duration", type=float, default=60.0, help="Seconds of generated load")
+    load_parser.add_argument("--mix", default="get_active=0.8,update=0.15,create=0.05")
+    load_parser.add_argument("--sizes", default="4096=1", help="Content sizes and weights, e.g. 1024=0.9,10485760=0.1")
+    load_parser.add_argument("--keys", type=int, default=1000, help="Number of existing files")
+    load_parser.add_argument("--zipf", type=float, default=1.0, help="Key popularity skew, 0 for uniform")
+    load_parser.add_argument("--uniform-arrivals", action="store_true", help="Evenly spaced instead of Poisson arrivals")
+    load_parser.add_argument("--preload", action="store_true", help="Create every key before the run")
+    load_parser.add_argument("--workers", type=int, default=32)
+    load_parser.add_argument("--id-prefix", default="load-")
+    load_parser.add_argument("--seed", type=int)
+    load_parser.add_argument("--record", help="Append issued operations to this JSONL trace")
+    load_parser.add_argument("--replay", help="Replay a recorded trace instead of generating load")
+    load_parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier")
+    load_parser.set_defaults(handler=load)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest" and not (args.source or args.manifest):
+        parser.error("ingest requires a source directory or --manifest")
+
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
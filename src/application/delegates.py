@@ -0,0 +1,277 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.checksums import Checksums
+from src.domain.entities import ObjectInfo, Page, SignedRequest, UploadTarget, VersionRecord
+from src.domain.repositories import FileMetadataRepository, FileStorage
+
+
+TVersion = TypeVar("TVersion")
+
+
+class DelegatingFileMetadataRepository(FileMetadataRepository, Generic[TVersion]):
+    """
+    Base class for repository wrappers that forward every call to an inner repository.
+
+    Subclasses override `_invoke` to add behaviour around all calls at once,
+    or override individual methods when only some calls need it. Every
+    interface method is declared here, so nothing reaches the inner
+    repository without passing through `_invoke`.
+    """
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository[TVersion]
+    ):
+        """
+        Initialize the DelegatingFileMetadataRepository.
+
+        Args:
+            inner (FileMetadataRepository[TVersion]): The wrapped repository.
+
+        Returns:
+            None
+        """
+
+        self._inner = inner
+
+
+    def _invoke(
+        self,
+        name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Invoke a method on the inner repository.
+
+        Args:
+            name (str): The method name.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Any: The result of the inner call.
+        """
+
+        return getattr(self._inner, name)(*args, **kwargs)
+
+
+    def get_active(self, id: str) -> Optional[TVersion]:
+        return self._invoke("get_active", id)
+
+    def get_versions(self, id: str) -> List[TVersion]:
+        return self._invoke("get_versions", id)
+
+    def save(self, version: TVersion, path: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        return self._invoke("save", version=version, path=path, attributes=attributes)
+
+    def save_many(self, items: Iterable[Tuple]) -> None:
+        return self._invoke("save_many", list(items))
+
+    def deactivate_versions(self, id: str, below: Optional[int] = None) -> None:
+        return self._invoke("deactivate_versions", id, below)
+
+    def delete_versions(self, id: str) -> None:
+        return self._invoke("delete_versions", id)
+
+    def find(
+        self,
+        filters: Dict[str, Any],
+        *,
+        active_only: bool = True,
+        limit: int = 100,
+        page_token: Optional[str] = None
+    ) -> Page[TVersion]:
+        return self._invoke(
+            "find",
+            filters,
+            active_only=active_only,
+            limit=limit,
+            page_token=page_token,
+        )
+
+    def get_record(self, id: str, version: Optional[int] = None) -> Optional[VersionRecord[TVersion]]:
+        return self._invoke("get_record", id, version)
+
+    def get_records(self, id: str) -> List[VersionRecord[TVersion]]:
+        return self._invoke("get_records", id)
+
+    def get_as_of(self, id: str, timestamp: datetime) -> Optional[TVersion]:
+        return self._invoke("get_as_of", id, timestamp)
+
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None
+    ) -> Page[VersionRecord[TVersion]]:
+        return self._invoke("snapshot", selection, timestamp, limit=limit, page_token=page_token)
+
+    def scan(
+        self,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None,
+        segment: int = 0,
+        total_segments: int = 1
+    ) -> Page[VersionRecord[TVersion]]:
+        return self._invoke(
+            "scan",
+            limit=limit,
+            page_token=page_token,
+            segment=segment,
+            total_segments=total_segments,
+        )
+
+    def allocate_version(self, id: str) -> int:
+        return self._invoke("allocate_version", id)
+
+    def update_location(
+        self,
+        id: str,
+        version: int,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        return self._invoke("update_location", id, version, path, attributes)
+
+    def purge(self, versions: List[TVersion]) -> None:
+        return self._invoke("purge", versions)
+
+
+class DelegatingFileStorage(FileStorage):
+    """
+    Base class for storage wrappers that forward every call to an inner storage.
+    """
+
+    def __init__(
+        self,
+        inner: FileStorage
+    ):
+        """
+        Initialize the DelegatingFileStorage.
+
+        Args:
+            inner (FileStorage): The wrapped storage.
+
+        Returns:
+            None
+        """
+
+        self._inner = inner
+
+
+    def _invoke(
+        self,
+        name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Invoke a method on the inner storage.
+
+        Args:
+            name (str): The method name.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Any: The result of the inner call.
+        """
+
+        return getattr(self._inner, name)(*args, **kwargs)
+
+
+    def upload(
+        self,
+        path: str,
+        content: bytes,
+        content_type: str,
+        checksums: Optional[Checksums] = None
+    ) -> None:
+        return self._invoke("upload", path, content, content_type, checksums)
+
+    def download(self, path: str) -> bytes:
+        return self._invoke("download", path)
+
+    def delete(self, path: str) -> None:
+        return self._invoke("delete", path)
+
+    def copy(self, source: str, destination: str) -> None:
+        return self._invoke("copy", source, destination)
+
+    def upload_multipart(
+        self,
+        path: str,
+        content: memoryview,
+        content_type: str,
+        checksums: Optional[Checksums] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: int = 8
+    ) -> None:
+        return self._invoke(
+            "upload_multipart",
+            path,
+            content,
+            content_type,
+            checksums,
+            part_size=part_size,
+            concurrency=concurrency,
+        )
+
+    def delete_objects(self, paths: List[str]) -> None:
+        return self._invoke("delete_objects", paths)
+
+    def download_range(self, path: str, offset: int, length: int) -> bytes:
+        return self._invoke("download_range", path, offset, length)
+
+    def list_objects(self, prefix: str) -> List[str]:
+        return self._invoke("list_objects", prefix)
+
+    def transition(self, path: str, tier: str) -> None:
+        return self._invoke("transition", path, tier)
+
+    def restore(self, path: str, days: int = 1) -> bool:
+        return self._invoke("restore", path, days)
+
+    def stat(self, path: str) -> Optional[ObjectInfo]:
+        return self._invoke("stat", path)
+
+    def signed_upload(
+        self,
+        path: str,
+        content_type: str,
+        size: int,
+        *,
+        md5: Optional[str] = None,
+        expires: timedelta = timedelta(hours=1),
+        part_size: Optional[int] = None
+    ) -> UploadTarget:
+        return self._invoke(
+            "signed_upload",
+            path,
+            content_type,
+            size,
+            md5=md5,
+            expires=expires,
+            part_size=part_size,
+        )
+
+    def complete_upload(self, target: UploadTarget, parts: Optional[List[str]] = None) -> None:
+        return self._invoke("complete_upload", target, parts)
+
+    def abort_upload(self, target: UploadTarget) -> None:
+        return self._invoke("abort_upload", target)
+
+    def signed_download(self, path: str, *, expires: timedelta = timedelta(hours=1)) -> SignedRequest:
+        return self._invoke("signed_download", path, expires=expires)
@@ -0,0 +1,177 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.events import EventOutbox, EventSink, FileEvent
+
+
+class InMemoryEventOutbox(EventOutbox):
+    """
+    Non-durable outbox for tests and processes that can tolerate losing
+    undelivered events on exit.
+    """
+
+    def __init__(self):
+        self._events: "OrderedDict[str, FileEvent]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, event: FileEvent) -> None:
+        with self._lock:
+            self._events[event.event_id] = event
+
+    def pending(self, limit: int) -> List[FileEvent]:
+        with self._lock:
+            return [event for _, event in zip(range(limit), self._events.values())]
+
+    def acknowledge(self, event_ids: List[str]) -> None:
+        with self._lock:
+            for event_id in event_ids:
+                self._events.pop(event_id, None)
+
+
+class EventEmitter:
+    """
+    Batches file lifecycle events from an outbox to a set of sinks.
+
+    `emit` only appends to the outbox, so the request path never waits on
+    a sink. A background thread drains the outbox in batches and removes a
+    batch only after every sink has accepted it; a failing sink causes the
+    batch to be redelivered later, giving at-least-once delivery. Consumers
+    should deduplicate on `event_id`.
+    """
+
+    def __init__(
+        self,
+        outbox: EventOutbox,
+        sinks: Sequence[EventSink],
+        *,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        retry_interval: float = 5.0
+    ):
+        """
+        Initialize the EventEmitter and start its flusher thread.
+
+        Args:
+            outbox (EventOutbox): Where events wait until delivered.
+            sinks (Sequence[EventSink]): The destinations of every batch.
+            batch_size (int): The maximum number of events per batch.
+            flush_interval (float): Seconds between flushes when traffic is low.
+            retry_interval (float): Seconds to wait after a sink failure.
+
+        Returns:
+            None
+        """
+
+        self._outbox = outbox
+        self._sinks = list(sinks)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._retry_interval = retry_interval
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def emit(
+        self,
+        type: str,
+        id: str,
+        *,
+        version: Optional[int] = None,
+        path: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> FileEvent:
+        """
+        Record an event for asynchronous delivery.
+
+        Args:
+            type (str): The event type, e.g. FILE_CREATED.
+            id (str): The ID of the file.
+            version (Optional[int]): The version the event refers to.
+            path (Optional[str]): The storage path of the version.
+            attributes (Optional[Dict[str, Any]]): Extra event attributes.
+
+        Returns:
+            FileEvent: The recorded event.
+        """
+
+        event = FileEvent(
+            event_id=uuid.uuid4().hex,
+            type=type,
+            id=id,
+            occurred_at=datetime.now(),
+            version=version,
+            path=path,
+            attributes=attributes or {},
+        )
+        self._outbox.append(event)
+
+        with self._lock:
+            self._pending += 1
+            if self._pending >= self._batch_size:
+                self._wakeup.set()
+
+        return event
+
+
+    def flush(self) -> bool:
+        """
+        Deliver everything currently in the outbox.
+
+        Returns:
+            bool: True if the outbox was drained, False if a sink failed.
+        """
+
+        with self._flush_lock:
+            while True:
+                batch = self._outbox.pending(self._batch_size)
+                if not batch:
+                    return True
+
+                try:
+                    for sink in self._sinks:
+                        sink.publish(batch)
+                except Exception as exc:
+                    print(f"Error publishing events: {exc}")
+                    return False
+
+                self._outbox.acknowledge([event.event_id for event in batch])
+
+                with self._lock:
+                    self._pending = max(0, self._pending - len(batch))
+
+
+    def close(self) -> None:
+        """
+        Stop the flusher thread after a final flush.
+        """
+
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+
+            if self._stopped.is_set():
+                return
+
+            if not self.flush():
+                self._stopped.wait(self._retry_interval)
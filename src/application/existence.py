@@ -0,0 +1,395 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import hashlib
+import math
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import DelegatingFileMetadataRepository
+from src.application.export import read_batches
+from src.domain.repositories import FileMetadataRepository
+
+
+MAGIC = b"BLM1"
+HEADER = struct.Struct(">4sQBQ")
+
+
+class BloomFilter:
+    """
+    Bloom filter over file IDs.
+
+    Sized from the expected number of IDs and the target false-positive
+    rate, optionally capped by a memory budget (which raises the actual
+    false-positive rate). Positions come from double hashing one 128-bit
+    BLAKE2b digest, so every lookup hashes the ID once.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        fp_rate: float = 0.01,
+        *,
+        max_bytes: int | None = None
+    ):
+        """
+        Initialize an empty BloomFilter.
+
+        Args:
+            capacity (int): The expected number of distinct IDs.
+            fp_rate (float): The target false-positive rate at `capacity`.
+            max_bytes (int | None): The memory budget of the bit array.
+
+        Returns:
+            None
+        """
+
+        if capacity <= 0 or not 0 < fp_rate < 1:
+            raise ValueError("capacity must be positive and fp_rate between 0 and 1")
+
+        bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            bits = min(bits, max_bytes * 8)
+        bits = max(bits, 64)
+
+        self._init(bits, max(1, round(bits / capacity * math.log(2))), bytearray((bits + 7) // 8), 0)
+
+
+    def _init(
+        self,
+        bits: int,
+        hashes: int,
+        array: bytearray,
+        count: int
+    ) -> None:
+        self._bits = bits
+        self._hashes = hashes
+        self._array = array
+        self._count = count
+        self._lock = threading.Lock()
+
+
+    @classmethod
+    def load(
+        cls,
+        path: str
+    ) -> "BloomFilter":
+        """
+        Load a filter written by `save`.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+
+        with open(path, "rb") as file:
+            magic, bits, hashes, count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a bloom filter file")
+            array = bytearray(file.read())
+
+        if len(array) != (bits + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+
+        bloom = cls.__new__(cls)
+        bloom._init(bits, hashes, array, count)
+        return bloom
+
+
+    def save(
+        self,
+        path: str
+    ) -> None:
+        """
+        Write the filter to disk atomically.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            header = HEADER.pack(MAGIC, self._bits, self._hashes, self._count)
+            array = bytes(self._array)
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(header)
+            file.write(array)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, path)
+
+
+    def add(
+        self,
+        id: str
+    ) -> None:
+        """
+        Add an ID.
+
+        Args:
+            id (str): The file ID.
+
+        Returns:
+            None
+        """
+
+        positions = self._positions(id)
+        with self._lock:
+            for position in positions:
+                self._array[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+
+
+    def might_contain(
+        self,
+        id: str
+    ) -> bool:
+        """
+        Check an ID. False means the ID was definitely never added.
+
+        Args:
+            id (str): The file ID.
+
+        Returns:
+            bool: True if the ID may have been added.
+        """
+
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in self._positions(id))
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the size and the estimated false-positive rate of the filter.
+
+        Returns:
+            Dict[str, Any]: The filter stats.
+        """
+
+        with self._lock:
+            set_bits = sum(bin(byte).count("1") for byte in self._array)
+            count = self._count
+
+        fill = set_bits / self._bits
+        return {
+            "bits": self._bits,
+            "bytes": len(self._array),
+            "hashes": self._hashes,
+            "added": count,
+            "fill_ratio": fill,
+            "estimated_fp_rate": fill ** self._hashes,
+        }
+
+
+    def _positions(
+        self,
+        id: str
+    ) -> List[int]:
+        digest = hashlib.blake2b(id.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", digest)
+        h2 |= 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes)]
+
+
+def rebuild_from_repository(
+    repository: FileMetadataRepository,
+    bloom: BloomFilter,
+    *,
+    segments: int = 4,
+    page_size: int = 1000
+) -> int:
+    """
+    Add every stored file ID to a filter with parallel segment scans.
+
+    Args:
+        repository (FileMetadataRepository): The repository to scan.
+        bloom (BloomFilter): The filter to fill.
+        segments (int): The number of parallel scan segments.
+        page_size (int): The number of records per scan page.
+
+    Returns:
+        int: The number of records scanned.
+    """
+
+    def scan_segment(segment: int) -> int:
+        token = None
+        scanned = 0
+        while True:
+            page = repository.scan(
+                limit=page_size,
+                page_token=token,
+                segment=segment,
+                total_segments=segments,
+            )
+            for id in dict.fromkeys(record.version.id for record in page.items):
+                bloom.add(id)
+            scanned += len(page.items)
+
+            token = page.next_token
+            if not token:
+                return scanned
+
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        return sum(pool.map(scan_segment, range(segments)))
+
+
+def rebuild_from_export(
+    source: Any,
+    bloom: BloomFilter,
+    *,
+    format: Optional[str] = None
+) -> int:
+    """
+    Add every file ID in a metadata export to a filter.
+
+    Args:
+        source (Any): A file written by export_versions, a pyarrow Table or a pandas DataFrame.
+        bloom (BloomFilter): The filter to fill.
+        format (Optional[str]): The file format; inferred from the suffix if None.
+
+    Returns:
+        int: The number of rows read.
+    """
+
+    rows = 0
+    for batch in read_batches(source, format, 10000):
+        for id in dict.fromkeys(row["id"] for row in batch):
+            bloom.add(id)
+        rows += len(batch)
+    return rows
+
+
+class ExistenceFilteredRepository(DelegatingFileMetadataRepository):
+    """
+    Repository wrapper that answers reads for never-seen IDs without a round trip.
+
+    Every saved ID is added to the filter before it is written, so a
+    negative filter lookup is a definite miss and the read returns empty
+    immediately; positives go to the backend. The filter only knows what
+    was written through this wrapper or loaded at startup, so every writer
+    of the repository must go through a wrapper sharing the filter, or the
+    filter must be rebuilt before use. IDs are never removed; deleted files
+    simply become false positives.
+    """
+
+    READS = frozenset({"get_active", "get_record", "get_as_of", "get_versions", "get_records"})
+    LIST_READS = frozenset({"get_versions", "get_records"})
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository,
+        bloom: BloomFilter,
+        *,
+        path: str | None = None
+    ):
+        """
+        Initialize the ExistenceFilteredRepository.
+
+        Args:
+            inner (FileMetadataRepository): The wrapped repository.
+            bloom (BloomFilter): The existence filter.
+            path (str | None): Where `checkpoint` persists the filter.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._bloom = bloom
+        self._path = path
+        self._lock = threading.Lock()
+        self._stats = {
+            "lookups": 0,
+            "skipped": 0,
+            "passed": 0,
+            "false_positives": 0,
+        }
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        if name == "save":
+            version = args[0] if args else kwargs["version"]
+            self._bloom.add(version.id)
+        elif name == "save_many":
+            items = list(args[0])
+            for id in dict.fromkeys(item[0].id for item in items):
+                self._bloom.add(id)
+            return super()._invoke(name, items)
+        elif name in self.READS:
+            return self._read(name, *args, **kwargs)
+
+        return super()._invoke(name, *args, **kwargs)
+
+
+    def checkpoint(self) -> None:
+        """
+        Persist the filter to its path, if one was given.
+        """
+
+        if self._path:
+            self._bloom.save(self._path)
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get lookup counters and filter stats.
+
+        `observed_fp_rate` is the share of lookups for missing IDs that the
+        filter let through.
+
+        Returns:
+            Dict[str, Any]: The stats.
+        """
+
+        with self._lock:
+            data = dict(self._stats)
+
+        misses = data["skipped"] + data["false_positives"]
+        data["observed_fp_rate"] = data["false_positives"] / misses if misses else 0.0
+        data.update(self._bloom.stats())
+        return data
+
+
+    def _read(
+        self,
+        name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        id = args[0] if args else kwargs["id"]
+
+        if not self._bloom.might_contain(id):
+            self._count("lookups", "skipped")
+            return [] if name in self.LIST_READS else None
+
+        result = super()._invoke(name, *args, **kwargs)
+
+        # Only lookups that ask "does this file exist at all" tell a false
+        # positive apart from a file that lacks one version or point in time.
+        version = args[1] if len(args) > 1 else kwargs.get("version")
+        if not result and name != "get_as_of" and version is None:
+            self._count("lookups", "passed", "false_positives")
+        else:
+            self._count("lookups", "passed")
+        return result
+
+
+    def _count(
+        self,
+        *keys: str
+    ) -> None:
+        with self._lock:
+            for key in keys:
+                self._stats[key] += 1
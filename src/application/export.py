@@ -0,0 +1,340 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import dataclasses
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+# ---------------------------------------------------------------------
+# Third-party libraries
+# ---------------------------------------------------------------------
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without the wheel
+    pa = None
+    pq = None
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.entities import VersionRecord
+from src.domain.repositories import FileMetadataRepository
+from src.domain.snapshots import normalize_timestamp
+
+
+# Version fields promoted to their own columns; every other field of the
+# version class travels in the JSON `data` column.
+COLUMNS = ("id", "version", "status", "created_at", "storage_path", "data", "attributes")
+FORMATS = ("parquet", "arrow", "jsonl")
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet export and import")
+
+
+def _schema():
+    return pa.schema([
+        ("id", pa.string()),
+        ("version", pa.int64()),
+        ("status", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("storage_path", pa.string()),
+        ("data", pa.string()),
+        ("attributes", pa.string()),
+    ])
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def to_row(record: VersionRecord) -> Dict[str, Any]:
+    """
+    Flatten a version record into an export row.
+
+    Args:
+        record (VersionRecord): The version record.
+
+    Returns:
+        Dict[str, Any]: The row, keyed by COLUMNS.
+    """
+
+    data = dataclasses.asdict(record.version)
+    created_at = data.pop("created_at", None)
+
+    return {
+        "id": data.pop("id"),
+        "version": data.pop("version", 1),
+        "status": data.pop("status", "ACTIVE"),
+        "created_at": normalize_timestamp(created_at) if isinstance(created_at, datetime) else None,
+        "storage_path": record.storage_path,
+        "data": json.dumps(data, default=_encode),
+        "attributes": json.dumps(record.attributes, default=_encode) if record.attributes else None,
+    }
+
+
+def from_row(
+    row: Dict[str, Any],
+    version_cls: Type
+) -> tuple:
+    """
+    Rebuild a (version, storage path, attributes) item from an export row.
+
+    Args:
+        row (Dict[str, Any]): The row, keyed by COLUMNS.
+        version_cls (Type): The version class.
+
+    Returns:
+        tuple: The item, ready for `save_many`.
+    """
+
+    data = json.loads(row["data"]) if row.get("data") else {}
+    data.update(id=row["id"], version=row["version"], status=row["status"])
+
+    created_at = row.get("created_at")
+    data["created_at"] = datetime.fromisoformat(created_at) if isinstance(created_at, str) else created_at
+
+    fields = {f.name: f for f in dataclasses.fields(version_cls)}
+    for name, field in fields.items():
+        if field.type in (datetime, "datetime") and isinstance(data.get(name), str):
+            data[name] = datetime.fromisoformat(data[name])
+
+    version = version_cls(**{k: v for k, v in data.items() if k in fields})
+    attributes = json.loads(row["attributes"]) if row.get("attributes") else None
+    return version, row.get("storage_path"), attributes
+
+
+@dataclass(slots=True)
+class ExportStats:
+    segments: int = 0
+    pages: int = 0
+    rows: int = 0
+
+
+@dataclass(slots=True)
+class ImportStats:
+    batches: int = 0
+    rows: int = 0
+
+
+class _Sink:
+    """
+    Serializes concurrent page writes into one output file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: str
+    ):
+        self._format = format
+        self._lock = threading.Lock()
+
+        if format == "jsonl":
+            self._file = open(path, "w", encoding="utf-8")
+            self._writer = None
+        else:
+            _require_pyarrow()
+            self._file = None
+            if format == "parquet":
+                self._writer = pq.ParquetWriter(path, _schema())
+            else:
+                self._writer = pa.ipc.new_file(path, _schema())
+
+
+    def write(
+        self,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        if self._format == "jsonl":
+            lines = "".join(json.dumps(row, default=_encode) + "\n" for row in rows)
+            with self._lock:
+                self._file.write(lines)
+            return
+
+        # Building the batch is the expensive part and runs unlocked.
+        batch = pa.RecordBatch.from_pylist(rows, schema=_schema())
+        with self._lock:
+            if self._format == "parquet":
+                self._writer.write_batch(batch)
+            else:
+                self._writer.write(batch)
+
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        else:
+            self._writer.close()
+
+
+def _format_of(
+    path: str,
+    format: Optional[str]
+) -> str:
+    format = format or {".parquet": "parquet", ".arrow": "arrow", ".jsonl": "jsonl"}.get(
+        Path(path).suffix.lower()
+    )
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format for {path}; use one of {', '.join(FORMATS)}")
+    return format
+
+
+def export_versions(
+    repository: FileMetadataRepository,
+    path: str,
+    *,
+    format: Optional[str] = None,
+    segments: int = 4,
+    page_size: int = 1000
+) -> ExportStats:
+    """
+    Stream every version record into a Parquet, Arrow IPC or JSONL file.
+
+    The repository is scanned as `segments` parallel segment scans (a
+    DynamoDB parallel Scan, document ID ranges on Firestore). Each page is
+    converted to a record batch and appended as soon as it arrives, so
+    memory stays bounded by one page per segment. Row order across segments
+    is not defined.
+
+    Args:
+        repository (FileMetadataRepository): The repository to export.
+        path (str): The output file.
+        format (Optional[str]): "parquet", "arrow" or "jsonl"; inferred from the suffix if None.
+        segments (int): The number of parallel scan segments.
+        page_size (int): The number of records per scan page.
+
+    Returns:
+        ExportStats: Counters for the export.
+    """
+
+    sink = _Sink(path, _format_of(path, format))
+    stats = ExportStats(segments=segments)
+    lock = threading.Lock()
+
+    def scan_segment(segment: int) -> None:
+        token = None
+        while True:
+            page = repository.scan(
+                limit=page_size,
+                page_token=token,
+                segment=segment,
+                total_segments=segments,
+            )
+            if page.items:
+                sink.write([to_row(record) for record in page.items])
+
+            with lock:
+                stats.pages += 1
+                stats.rows += len(page.items)
+
+            token = page.next_token
+            if not token:
+                return
+
+    try:
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            # list() re-raises the first failed segment.
+            list(pool.map(scan_segment, range(segments)))
+    finally:
+        sink.close()
+
+    return stats
+
+
+def read_batches(
+    source: Any,
+    format: Optional[str],
+    batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read an import source as lists of rows.
+
+    Args:
+        source (Any): A file path, a pyarrow Table or a pandas DataFrame.
+        format (Optional[str]): The file format; inferred from the suffix if None.
+        batch_size (int): The number of rows per batch.
+
+    Returns:
+        Iterator[List[Dict[str, Any]]]: The row batches.
+    """
+
+    if isinstance(source, (str, Path)):
+        format = _format_of(str(source), format)
+
+        if format == "jsonl":
+            batch = []
+            with open(source, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        batch.append(json.loads(line))
+                    if len(batch) == batch_size:
+                        yield batch
+                        batch = []
+            if batch:
+                yield batch
+            return
+
+        _require_pyarrow()
+        if format == "parquet":
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+                yield batch.to_pylist()
+            return
+
+        with pa.memory_map(str(source)) as file:
+            table = pa.ipc.open_file(file).read_all()
+        source = table
+
+    _require_pyarrow()
+    if not isinstance(source, pa.Table):
+        source = pa.Table.from_pandas(source, preserve_index=False)
+
+    for batch in source.to_batches(max_chunksize=batch_size):
+        yield batch.to_pylist()
+
+
+def import_versions(
+    repository: FileMetadataRepository,
+    source: Any,
+    version_cls: Type,
+    *,
+    format: Optional[str] = None,
+    batch_size: int = 500
+) -> ImportStats:
+    """
+    Load exported version records into a repository with batched writes.
+
+    Rows are read column-batch by column-batch and every batch becomes one
+    `save_many` call, which the backends turn into a single transaction or
+    batched write. Records keep their version numbers, statuses, storage
+    paths and attributes.
+
+    Args:
+        repository (FileMetadataRepository): The target repository.
+        source (Any): A file written by export_versions, a pyarrow Table or a pandas DataFrame.
+        version_cls (Type): The version class to rebuild.
+        format (Optional[str]): The file format; inferred from the suffix if None.
+        batch_size (int): The number of records per write batch.
+
+    Returns:
+        ImportStats: Counters for the import.
+    """
+
+    stats = ImportStats()
+
+    for rows in read_batches(source, format, batch_size):
+        repository.save_many([from_row(row, version_cls) for row in rows])
+        stats.batches += 1
+        stats.rows += len(rows)
+
+    return stats
+
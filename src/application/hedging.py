@@ -0,0 +1,241 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, FrozenSet
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import DelegatingFileMetadataRepository
+from src.application.retry import RetryBudget
+from src.domain.repositories import FileMetadataRepository
+
+
+HEDGED_METHODS = frozenset({"get_active", "get_versions", "get_record", "get_records", "get_as_of"})
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent call latencies with percentile lookups.
+    """
+
+    def __init__(
+        self,
+        window: int = 1000
+    ):
+        """
+        Initialize the LatencyTracker.
+
+        Args:
+            window (int): The number of most recent samples kept.
+
+        Returns:
+            None
+        """
+
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+    def record(
+        self,
+        seconds: float
+    ) -> None:
+        """
+        Add a latency sample.
+
+        Args:
+            seconds (float): The observed latency.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self._samples.append(seconds)
+
+
+    def percentile(
+        self,
+        p: float
+    ) -> float:
+        """
+        Get a percentile of the recorded latencies.
+
+        Args:
+            p (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, 0.0 without samples.
+        """
+
+        with self._lock:
+            ordered = sorted(self._samples)
+
+        if not ordered:
+            return 0.0
+
+        rank = min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))
+        return ordered[rank]
+
+
+class HedgedFileMetadataRepository(DelegatingFileMetadataRepository):
+    """
+    Repository wrapper that hedges slow point reads.
+
+    A read that has not answered after the `percentile` latency of recent
+    reads is issued a second time and the first response wins; the other
+    is cancelled if it has not started and otherwise left to finish with
+    its result discarded. Hedges draw from a token bucket refilled by
+    `max_extra_load` tokens per request, so hedging never adds more than
+    that fraction of extra load. Writes are never hedged.
+    """
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository,
+        *,
+        percentile: float = 95.0,
+        min_delay: float = 0.005,
+        initial_delay: float = 0.05,
+        min_samples: int = 50,
+        max_extra_load: float = 0.05,
+        methods: FrozenSet[str] = HEDGED_METHODS,
+        workers: int = 32,
+        tracker: LatencyTracker | None = None
+    ):
+        """
+        Initialize the HedgedFileMetadataRepository.
+
+        Args:
+            inner (FileMetadataRepository): The wrapped repository.
+            percentile (float): The latency percentile after which a read is hedged.
+            min_delay (float): The lowest hedge delay in seconds.
+            initial_delay (float): The hedge delay until `min_samples` latencies are known.
+            min_samples (int): The number of samples needed to trust the percentile.
+            max_extra_load (float): The maximum fraction of extra requests from hedging.
+            methods (FrozenSet[str]): The repository methods that are hedged.
+            workers (int): The number of concurrent backend calls.
+            tracker (LatencyTracker | None): The latency window, shared across wrappers if given.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._initial_delay = initial_delay
+        self._min_samples = min_samples
+        self._methods = methods
+        self._budget = RetryBudget(ratio=max_extra_load, min_per_second=0.0, max_tokens=100.0)
+        self._tracker = tracker or LatencyTracker()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_won": 0,
+            "budget_exhausted": 0,
+        }
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        if name not in self._methods:
+            return super()._invoke(name, *args, **kwargs)
+
+        self._budget.record_request()
+        self._count("requests")
+
+        primary = self._submit(name, args, kwargs)
+        done, _ = wait([primary], timeout=self.delay())
+        if done:
+            return primary.result()
+
+        if not self._budget.try_spend():
+            self._count("budget_exhausted")
+            return primary.result()
+
+        self._count("hedged")
+        hedge = self._submit(name, args, kwargs)
+        pending = {primary, hedge}
+        failed = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        self._count("hedge_won")
+                    return future.result()
+                failed = failed or future
+
+        # Only reached when both calls failed.
+        return failed.result()
+
+
+    def delay(self) -> float:
+        """
+        Get the current hedge delay.
+
+        Returns:
+            float: Seconds a read waits before it is hedged.
+        """
+
+        if len(self._tracker) < self._min_samples:
+            return self._initial_delay
+        return max(self._min_delay, self._tracker.percentile(self._percentile))
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hedging counters and the current delay.
+
+        Returns:
+            Dict[str, Any]: The hedging stats.
+        """
+
+        with self._lock:
+            data = dict(self._stats)
+        data["delay"] = self.delay()
+        return data
+
+
+    def close(self) -> None:
+        """
+        Wait for in-flight reads and release the worker threads.
+        """
+
+        self._pool.shutdown(wait=True)
+
+
+    def _submit(
+        self,
+        name: str,
+        args: tuple,
+        kwargs: Dict[str, Any]
+    ) -> Future:
+        started = time.monotonic()
+        future = self._pool.submit(super()._invoke, name, *args, **kwargs)
+        future.add_done_callback(
+            lambda f: f.cancelled() or self._tracker.record(time.monotonic() - started)
+        )
+        return future
+
+
+    def _count(
+        self,
+        key: str
+    ) -> None:
+        with self._lock:
+            self._stats[key] += 1
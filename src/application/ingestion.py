@@ -0,0 +1,341 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import json
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.use_cases import FileService
+from src.domain.entities import FileVersion
+
+
+@dataclass(slots=True)
+class IngestionItem:
+    key: str
+    path: str
+    id: str
+    content_type: str
+    size_bytes: int = 0
+
+
+@dataclass(slots=True)
+class IngestionStats:
+    completed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def throughput(self) -> tuple[float, float]:
+        """
+        Get the files/s and MB/s rates since the run started.
+
+        Returns:
+            tuple[float, float]: The file and megabyte rates.
+        """
+
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return self.completed / elapsed, self.bytes / elapsed / 1_000_000
+
+    def format(self, final: bool = False) -> str:
+        """
+        Render the counters as a single progress line.
+
+        Args:
+            final (bool): Whether this is the end-of-run summary.
+
+        Returns:
+            str: The progress line.
+        """
+
+        files_per_s, mb_per_s = self.throughput()
+        label = "done" if final else "progress"
+        return (
+            f"[{label}] completed={self.completed} "
+            f"skipped={self.skipped} failed={self.failed} "
+            f"{files_per_s:.1f} files/s {mb_per_s:.2f} MB/s"
+        )
+
+
+class ProgressReporter:
+    """
+    Background thread that periodically reports ingestion throughput.
+    """
+
+    def __init__(
+        self,
+        stats: Callable[[], IngestionStats],
+        *,
+        interval: float = 5.0,
+        report: Callable[[str], None] = print
+    ):
+        """
+        Initialize the ProgressReporter.
+
+        Args:
+            stats (Callable[[], IngestionStats]): Returns the current run counters.
+            interval (float): Seconds between progress reports.
+            report (Callable[[str], None]): Where progress lines are written.
+
+        Returns:
+            None
+        """
+
+        self._stats = stats
+        self._interval = interval
+        self._report = report
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "ProgressReporter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._report(self._stats().format(final=True))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._report(self._stats().format())
+
+
+def _guess_content_type(path: str) -> str:
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or "application/octet-stream"
+
+
+def iter_directory(
+    root: str,
+    *,
+    id_prefix: str = ""
+) -> Iterator[IngestionItem]:
+    """
+    Recursively list the files under a directory in a stable order.
+
+    Args:
+        root (str): The directory to walk.
+        id_prefix (str): A prefix prepended to every file id.
+
+    Returns:
+        Iterator[IngestionItem]: One item per regular file.
+    """
+
+    root_path = Path(root).resolve()
+
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            full = Path(dirpath) / name
+            if not full.is_file():
+                continue
+            relative = full.relative_to(root_path).as_posix()
+            yield IngestionItem(
+                key=relative,
+                path=str(full),
+                id=f"{id_prefix}{relative}",
+                content_type=_guess_content_type(name),
+            )
+
+
+def iter_manifest(
+    manifest: str,
+    *,
+    id_prefix: str = ""
+) -> Iterator[IngestionItem]:
+    """
+    Read ingestion items from a manifest file.
+
+    Each line is either a plain file path or a JSON object with a `path` and
+    optional `id` and `content_type`.
+
+    Args:
+        manifest (str): The path to the manifest file.
+        id_prefix (str): A prefix prepended to every file id.
+
+    Returns:
+        Iterator[IngestionItem]: One item per manifest line.
+    """
+
+    with open(manifest, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("{"):
+                entry = json.loads(line)
+            else:
+                entry = {"path": line}
+
+            path = entry["path"]
+            yield IngestionItem(
+                key=entry.get("id", path),
+                path=path,
+                id=f"{id_prefix}{entry.get('id', path)}",
+                content_type=entry.get("content_type") or _guess_content_type(path),
+            )
+
+
+def default_version_factory(item: IngestionItem) -> FileVersion:
+    """
+    Build the metadata for an ingested file.
+
+    Args:
+        item (IngestionItem): The item being ingested.
+
+    Returns:
+        FileVersion: The version metadata.
+    """
+
+    return FileVersion(
+        id=item.id,
+        created_at=datetime.now(),
+        metadata={
+            "source_path": item.path,
+            "size_bytes": str(item.size_bytes),
+        },
+    )
+
+
+class DirectoryIngestor:
+    """
+    Parallel, resumable bulk ingestion through a FileService.
+
+    Items already recorded in the checkpoint are skipped before any bytes are
+    read, and an item is only checkpointed after its metadata is committed.
+    """
+
+    def __init__(
+        self,
+        service: FileService,
+        checkpoint: Any,
+        *,
+        workers: int = 16,
+        batch_size: int = 1000,
+        version_factory: Callable[[IngestionItem], Any] = default_version_factory,
+        progress_interval: float = 5.0,
+        report: Callable[[str], None] = print
+    ):
+        """
+        Initialize the DirectoryIngestor.
+
+        Args:
+            service (FileService): The service files are created through.
+            checkpoint (Any): The checkpoint store, e.g. SqliteCheckpoint.
+            workers (int): The number of parallel upload workers.
+            batch_size (int): How many items are checked against the checkpoint at once.
+            version_factory (Callable[[IngestionItem], Any]): Builds version metadata for an item.
+            progress_interval (float): Seconds between progress reports.
+            report (Callable[[str], None]): Where progress lines are written.
+
+        Returns:
+            None
+        """
+
+        self._service = service
+        self._checkpoint = checkpoint
+        self._workers = workers
+        self._batch_size = batch_size
+        self._version_factory = version_factory
+        self._progress_interval = progress_interval
+        self._report = report
+        self._stats = IngestionStats()
+        self._lock = threading.Lock()
+
+
+    def run(
+        self,
+        items: Iterable[IngestionItem]
+    ) -> IngestionStats:
+        """
+        Ingest all items that are not yet checkpointed.
+
+        Args:
+            items (Iterable[IngestionItem]): The items to ingest.
+
+        Returns:
+            IngestionStats: Counters for the run.
+        """
+
+        self._stats = IngestionStats()
+        slots = threading.BoundedSemaphore(self._workers * 4)
+        iterator = iter(items)
+
+        with ProgressReporter(
+            lambda: self._stats,
+            interval=self._progress_interval,
+            report=self._report,
+        ):
+            with ThreadPoolExecutor(max_workers=self._workers) as pool:
+                while True:
+                    batch = list(islice(iterator, self._batch_size))
+                    if not batch:
+                        break
+
+                    by_key = {item.key: item for item in batch}
+                    pending = self._checkpoint.pending(by_key)
+
+                    with self._lock:
+                        self._stats.skipped += len(batch) - len(pending)
+
+                    for key in pending:
+                        # Bound the number of queued items so multi-million
+                        # file runs do not materialize every future up front.
+                        slots.acquire()
+                        future = pool.submit(self._ingest, by_key[key])
+                        future.add_done_callback(lambda _: slots.release())
+
+        return self._stats
+
+
+    def _ingest(
+        self,
+        item: IngestionItem
+    ) -> None:
+        """
+        Upload one item and checkpoint it once committed.
+
+        Args:
+            item (IngestionItem): The item to ingest.
+
+        Returns:
+            None
+        """
+
+        try:
+            with open(item.path, "rb") as handle:
+                content = handle.read()
+
+            item.size_bytes = len(content)
+            saved = self._service.create(
+                content=content,
+                content_type=item.content_type,
+                version=self._version_factory(item),
+            )
+
+            if saved is None:
+                raise RuntimeError("file service did not commit the version")
+
+            self._checkpoint.mark_done(item.key, item.id, item.size_bytes)
+
+            with self._lock:
+                self._stats.completed += 1
+                self._stats.bytes += item.size_bytes
+        except Exception as exc:
+            with self._lock:
+                self._stats.failed += 1
+            print(f"Error ingesting {item.path}: {exc}")
+
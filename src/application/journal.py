@@ -0,0 +1,665 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import dataclasses
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple, TypeVar
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import DelegatingFileMetadataRepository
+from src.application.retry import RetryPolicy
+from src.domain.entities import VersionRecord
+from src.domain.repositories import FileMetadataRepository
+
+
+TVersion = TypeVar("TVersion")
+
+FRAME = struct.Struct(">II")
+SEGMENT_SUFFIX = ".journal"
+
+# Writes that are journaled and replayed in order. Saves are batched into
+# save_many; every other write is a barrier applied on its own.
+JOURNALED = frozenset({"save", "save_many", "deactivate_versions", "delete_versions", "update_location", "purge"})
+SAVES = frozenset({"save", "save_many"})
+
+
+@dataclass(slots=True)
+class _Entry:
+    seq: int
+    name: str
+    args: tuple
+
+
+@dataclass(slots=True)
+class JournalStats:
+    appended: int = 0
+    commits: int = 0
+    flushed: int = 0
+    batches: int = 0
+    failures: int = 0
+    recovered: int = 0
+
+
+def _normalize(
+    name: str,
+    args: tuple,
+    kwargs: Dict[str, Any]
+) -> tuple:
+    """
+    Turn a repository write into positional arguments for the journal.
+
+    Args:
+        name (str): The repository method.
+        args (tuple): Positional arguments.
+        kwargs (Dict[str, Any]): Keyword arguments.
+
+    Returns:
+        tuple: The arguments, in signature order.
+    """
+
+    if name == "save":
+        params = dict(zip(("version", "path", "attributes"), args), **kwargs)
+        return params["version"], params["path"], params.get("attributes")
+    if name == "save_many":
+        return ([tuple(item) for item in args[0]],)
+    if name == "update_location":
+        params = dict(zip(("id", "version", "path", "attributes"), args), **kwargs)
+        return params["id"], params["version"], params["path"], params.get("attributes")
+    if name == "purge":
+        return (list(args[0] if args else kwargs["versions"]),)
+    if name == "deactivate_versions":
+        params = dict(zip(("id", "below"), args), **kwargs)
+        return params["id"], params.get("below")
+    return (args[0] if args else kwargs["id"],)
+
+
+def _ids(
+    name: str,
+    args: tuple
+) -> List[str]:
+    if name == "save":
+        return [args[0].id]
+    if name == "save_many":
+        return [item[0].id for item in args[0]]
+    if name == "purge":
+        return [version.id for version in args[0]]
+    return [args[0]]
+
+
+def _apply(
+    records: Dict[int, VersionRecord],
+    name: str,
+    args: tuple
+) -> None:
+    """
+    Apply one journaled write to the records of a single file, in memory.
+
+    Args:
+        records (Dict[int, VersionRecord]): The records by version number, updated in place.
+        name (str): The repository method.
+        args (tuple): The normalized arguments.
+
+    Returns:
+        None
+    """
+
+    if name in SAVES:
+        items = [args] if name == "save" else args[0]
+        for version, path, *attributes in items:
+            records[version.version] = VersionRecord(
+                version=version,
+                storage_path=path,
+                attributes=(attributes[0] if attributes else None) or {},
+            )
+    elif name in ("deactivate_versions", "delete_versions"):
+        status = "INACTIVE" if name == "deactivate_versions" else "DELETED"
+        below = args[1] if len(args) > 1 else None
+        for number, record in records.items():
+            if name == "delete_versions" or (
+                record.version.status == "ACTIVE" and (below is None or number < below)
+            ):
+                # Pending writes have no backend stamp yet; treating them as
+                # just made keeps retention from acting on them early.
+                now = datetime.now()
+                records[number] = dataclasses.replace(
+                    record,
+                    version=dataclasses.replace(record.version, status=status),
+                    deactivated_at=record.deactivated_at or (now if record.version.status == "ACTIVE" else None),
+                    deleted_at=record.deleted_at or (now if name == "delete_versions" else None),
+                )
+    elif name == "update_location":
+        _, number, path, attributes = args
+        if number in records:
+            records[number] = dataclasses.replace(
+                records[number],
+                storage_path=path,
+                attributes=attributes or {},
+            )
+    elif name == "purge":
+        for version in args[0]:
+            records.pop(version.version, None)
+
+
+class WriteBehindFileMetadataRepository(DelegatingFileMetadataRepository):
+    """
+    Repository wrapper that acknowledges writes once they are in a local journal.
+
+    Every write is appended to a segmented journal file and fsynced before
+    the call returns. Concurrent writers share fsyncs: while one fsync runs,
+    later appends queue up and the next fsync commits all of them. A
+    background flusher then replays the journal against the backend in
+    order, turning runs of saves into `save_many` batches.
+
+    Point reads (`get_active`, `get_versions`, `get_record`, `get_records`)
+    of a file with unflushed writes read the backend and replay those
+    writes on top, so callers read their own writes. Queries (`find`,
+    `snapshot`, `scan`, `get_as_of`) see writes once they are flushed.
+
+    On startup, segments left by a previous process are replayed into the
+    flush queue; a torn frame at the end of a segment is a write that was
+    never acknowledged and is dropped. Replayed writes may reach the backend
+    twice, which is harmless because each write is idempotent when the
+    sequence is reapplied in order: every backend stores a version under a
+    key derived from its file ID and version number, so a repeated save
+    overwrites the record instead of adding a duplicate.
+    """
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository[TVersion],
+        directory: str,
+        *,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        commit_delay: float = 0.0,
+        max_pending: int = 100000,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+        policy: RetryPolicy | None = None
+    ):
+        """
+        Initialize the WriteBehindFileMetadataRepository and recover its journal.
+
+        Args:
+            inner (FileMetadataRepository[TVersion]): The wrapped repository.
+            directory (str): The journal directory, one per process.
+            batch_size (int): The maximum number of saves per `save_many` call.
+            flush_interval (float): The longest time a write waits before a flush starts.
+            commit_delay (float): Extra seconds a commit waits to gather more appends.
+            max_pending (int): Writers block while this many writes are unflushed.
+            segment_bytes (int): The size after which a new journal segment is started.
+            fsync (bool): Whether commits are fsynced; without it a host crash can lose acknowledged writes.
+            policy (RetryPolicy | None): Backoff between failed flushes.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._directory = directory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._commit_delay = commit_delay
+        self._max_pending = max_pending
+        self._segment_bytes = segment_bytes
+        self._fsync = fsync
+        self._policy = policy or RetryPolicy(base_delay=0.1, max_delay=30.0)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = JournalStats()
+        self._pending: List[_Entry] = []
+        self._pending_ids: Dict[str, int] = {}
+        self._buffer: List[Tuple[_Entry, bytes]] = []
+        self._next_seq = 1
+        self._durable = 0
+        self._committing = False
+        self._urgent = False
+        self._closed = False
+        self._error: BaseException | None = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._segments: Dict[int, int] = {}
+        self._recover()
+
+        self._segment = max(self._segments, default=0) + 1
+        self._segments[self._segment] = 0
+        self._file = open(self._segment_path(self._segment), "ab")
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        if name in JOURNALED:
+            return self._append(name, _normalize(name, args, kwargs))
+
+        if name in ("get_active", "get_versions", "get_record", "get_records"):
+            id = args[0] if args else kwargs["id"]
+            if id in self._pending_ids:
+                return self._overlay(name, id, *args[1:], **kwargs)
+
+        if name == "allocate_version":
+            return self._allocate(*args, **kwargs)
+
+        return super()._invoke(name, *args, **kwargs)
+
+
+    def flush(self) -> None:
+        """
+        Block until every acknowledged write has reached the backend.
+        """
+
+        with self._cond:
+            target = self._durable
+            self._urgent = True
+            self._cond.notify_all()
+            while self._pending and self._pending[0].seq <= target:
+                self._cond.wait()
+
+
+    def close(self) -> None:
+        """
+        Flush every write, stop the flusher and close the journal.
+        """
+
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._file.close()
+
+        if not self._pending:
+            for segment in self._segments:
+                os.remove(self._segment_path(segment))
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the journal counters.
+
+        Returns:
+            Dict[str, Any]: The counters and the number of unflushed writes.
+        """
+
+        with self._cond:
+            data = dataclasses.asdict(self._stats)
+            data["pending"] = len(self._pending)
+        return data
+
+
+    def _append(
+        self,
+        name: str,
+        args: tuple
+    ) -> None:
+        """
+        Journal one write and wait until it is durable.
+
+        The first waiter without a commit in progress becomes the leader: it
+        takes every buffered frame, writes and fsyncs them outside the lock,
+        queues them for flushing in sequence order and wakes everyone whose
+        write is now durable.
+
+        Args:
+            name (str): The repository method.
+            args (tuple): The normalized arguments.
+
+        Returns:
+            None
+        """
+
+        with self._cond:
+            while len(self._pending) >= self._max_pending and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError("Journal is closed")
+            if self._error is not None:
+                raise RuntimeError("Journal failed") from self._error
+
+            entry = _Entry(seq=self._next_seq, name=name, args=args)
+            self._next_seq += 1
+            payload = pickle.dumps((entry.seq, name, args), protocol=pickle.HIGHEST_PROTOCOL)
+            self._buffer.append((entry, FRAME.pack(len(payload), zlib.crc32(payload)) + payload))
+            self._stats.appended += 1
+
+            while self._durable < entry.seq:
+                if self._error is not None:
+                    # The frames of a failed commit may be partly on disk, so
+                    # the journal cannot tell which writes survived.
+                    raise RuntimeError("Journal failed") from self._error
+                if self._committing:
+                    self._cond.wait()
+                    continue
+
+                self._committing = True
+                self._cond.release()
+                try:
+                    if self._commit_delay:
+                        time.sleep(self._commit_delay)
+                    self._commit()
+                except BaseException as exc:
+                    self._error = exc
+                    raise
+                finally:
+                    self._cond.acquire()
+                    self._committing = False
+                    self._cond.notify_all()
+
+
+    def _commit(self) -> None:
+        """
+        Write and fsync every buffered frame. Called by the commit leader without the lock.
+        """
+
+        with self._cond:
+            buffered = self._buffer
+            self._buffer = []
+            segment = self._segment
+
+        if not buffered:
+            return
+
+        self._file.write(b"".join(frame for _, frame in buffered))
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+        with self._cond:
+            # Writes become visible to reads and the flusher only once durable.
+            for entry, _ in buffered:
+                self._enqueue(entry)
+            target = buffered[-1][0].seq
+            self._durable = target
+            self._segments[segment] = target
+            self._stats.commits += 1
+
+            if self._file.tell() >= self._segment_bytes:
+                self._rotate()
+
+
+    def _enqueue(
+        self,
+        entry: _Entry
+    ) -> None:
+        self._pending.append(entry)
+        for id in _ids(entry.name, entry.args):
+            self._pending_ids[id] = self._pending_ids.get(id, 0) + 1
+        self._cond.notify_all()
+
+
+    def _overlay(
+        self,
+        name: str,
+        id: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Answer a point read from the backend plus the unflushed writes of the file.
+
+        Args:
+            name (str): The read method.
+            id (str): The ID of the file.
+            *args: The remaining positional arguments of the read.
+            **kwargs: The remaining keyword arguments of the read.
+
+        Returns:
+            Any: The result the read would return once the writes are flushed.
+        """
+
+        # Snapshot the writes before reading the backend: a write flushed in
+        # between is then applied twice, which is harmless, instead of not at all.
+        with self._cond:
+            entries = [entry for entry in self._pending if id in _ids(entry.name, entry.args)]
+
+        records = {record.version.version: record for record in self._inner.get_records(id)}
+        for entry in entries:
+            if entry.name in SAVES:
+                items = [entry.args] if entry.name == "save" else entry.args[0]
+                items = [item for item in items if item[0].id == id]
+                _apply(records, "save_many", (items,))
+            elif entry.name == "purge":
+                _apply(records, "purge", ([version for version in entry.args[0] if version.id == id],))
+            else:
+                _apply(records, entry.name, entry.args)
+
+        ordered = [records[number] for number in sorted(records, reverse=True)]
+
+        if name == "get_records":
+            return ordered
+        if name == "get_versions":
+            return [record.version for record in ordered]
+
+        version = args[0] if args else kwargs.get("version")
+        if version is not None:
+            return records.get(version)
+
+        active = next((record for record in ordered if record.version.status == "ACTIVE"), None)
+        return active.version if name == "get_active" and active else active
+
+
+    def _allocate(
+        self,
+        id: str
+    ) -> int:
+        """
+        Reserve a version number above every journaled version of the file.
+
+        A backend counter seeded from stored versions does not know about
+        unflushed ones, so numbers it hands out below them are skipped.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            int: The reserved version number.
+        """
+
+        with self._cond:
+            highest = 0
+            for entry in self._pending:
+                if entry.name in SAVES:
+                    items = [entry.args] if entry.name == "save" else entry.args[0]
+                    highest = max([highest] + [item[0].version for item in items if item[0].id == id])
+
+        while True:
+            number = self._inner.allocate_version(id)
+            if number > highest:
+                return number
+
+
+    def _flush_loop(self) -> None:
+        failures = 0
+
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self._flush_interval
+                while not self._closed and len(self._pending) < self._batch_size:
+                    remaining = deadline - time.monotonic()
+                    if self._pending and (remaining <= 0 or self._urgent):
+                        break
+                    self._cond.wait(remaining if self._pending else None)
+
+                if not self._pending:
+                    self._urgent = False
+                    if self._closed:
+                        return
+                    continue
+                batch = self._next_batch()
+
+            try:
+                self._write(batch)
+            except Exception as exc:
+                failures += 1
+                with self._cond:
+                    self._stats.failures += 1
+                print(f"Error flushing journal: {exc}")
+                time.sleep(self._policy.backoff(min(failures, 16)))
+                continue
+
+            failures = 0
+            with self._cond:
+                self._done(batch)
+
+
+    def _next_batch(self) -> List[_Entry]:
+        """
+        Take the next round of writes that can be applied together.
+
+        Writes to different files commute, so ordering only matters per
+        file. A round takes, for every file, a prefix of its pending writes
+        made of barrier writes followed by saves; the barriers are applied
+        first, then all saves in one `save_many`. The first write that would
+        break that shape blocks its files until the next round.
+
+        Returns:
+            List[_Entry]: The entries of the round, oldest first.
+        """
+
+        batch: List[_Entry] = []
+        blocked: set = set()
+        saved: set = set()
+        size = 0
+
+        for entry in self._pending:
+            ids = _ids(entry.name, entry.args)
+            if entry.name in SAVES:
+                count = len(entry.args[0]) if entry.name == "save_many" else 1
+                if blocked.intersection(ids) or (size and size + count > self._batch_size):
+                    blocked.update(ids)
+                    continue
+                saved.update(ids)
+                size += count
+            elif blocked.intersection(ids) or saved.intersection(ids):
+                blocked.update(ids)
+                continue
+            batch.append(entry)
+
+        return batch
+
+
+    def _write(
+        self,
+        batch: List[_Entry]
+    ) -> None:
+        # Reapplying barriers after a failed round is harmless, so a retry
+        # simply starts the round over.
+        for entry in batch:
+            if entry.name not in SAVES:
+                getattr(self._inner, entry.name)(*entry.args)
+
+        # A later save of the same version replaces an earlier one; batched
+        # writes reject duplicate keys.
+        items: Dict[Tuple[str, int], tuple] = {}
+        for entry in batch:
+            if entry.name in SAVES:
+                for item in ([entry.args] if entry.name == "save" else entry.args[0]):
+                    key = (item[0].id, item[0].version)
+                    items.pop(key, None)
+                    items[key] = item
+        if items:
+            self._inner.save_many(list(items.values()))
+
+
+    def _done(
+        self,
+        batch: List[_Entry]
+    ) -> None:
+        """
+        Drop flushed entries and delete journal segments with nothing left to flush.
+
+        Args:
+            batch (List[_Entry]): The flushed entries.
+
+        Returns:
+            None
+        """
+
+        done = {entry.seq for entry in batch}
+        self._pending = [entry for entry in self._pending if entry.seq not in done]
+        for entry in batch:
+            for id in _ids(entry.name, entry.args):
+                count = self._pending_ids[id] - 1
+                if count:
+                    self._pending_ids[id] = count
+                else:
+                    del self._pending_ids[id]
+
+        self._stats.flushed += len(batch)
+        self._stats.batches += 1
+
+        # Start a fresh segment once everything written is flushed, so the
+        # old one can go. No commit may be writing to the file meanwhile.
+        if not self._pending and not self._buffer and not self._committing and self._file.tell():
+            self._rotate()
+
+        flushed = self._pending[0].seq - 1 if self._pending else self._durable
+        for segment, last in list(self._segments.items()):
+            if segment != self._segment and last <= flushed:
+                os.remove(self._segment_path(segment))
+                del self._segments[segment]
+
+        self._cond.notify_all()
+
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._segment += 1
+        self._segments[self._segment] = self._durable
+        self._file = open(self._segment_path(self._segment), "ab")
+
+
+    def _recover(self) -> None:
+        """
+        Load the writes of journal segments left by a previous process.
+        """
+
+        for segment in sorted(
+            int(name[:-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self._directory) if name.endswith(SEGMENT_SUFFIX)
+        ):
+            last = 0
+            for seq, name, args in self._read_segment(self._segment_path(segment)):
+                with self._cond:
+                    self._enqueue(_Entry(seq=seq, name=name, args=args))
+                last = seq
+                self._stats.recovered += 1
+
+            self._segments[segment] = last
+            self._next_seq = max(self._next_seq, last + 1)
+
+        self._durable = self._next_seq - 1
+
+
+    def _read_segment(
+        self,
+        path: str
+    ) -> Iterator[Tuple[int, str, tuple]]:
+        with open(path, "rb") as file:
+            while True:
+                header = file.read(FRAME.size)
+                if len(header) < FRAME.size:
+                    return
+                length, crc = FRAME.unpack(header)
+                payload = file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    print(f"Dropping torn journal tail in {path}")
+                    return
+                yield pickle.loads(payload)
+
+
+    def _segment_path(
+        self,
+        segment: int
+    ) -> str:
+        return os.path.join(self._directory, f"{segment:012d}{SEGMENT_SUFFIX}")
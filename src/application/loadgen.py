@@ -0,0 +1,386 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import bisect
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.use_cases import FileService
+from src.domain.entities import FileVersion
+
+
+OPERATIONS = ("create", "update", "get_active", "delete")
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+CONTENT_TYPE = "application/octet-stream"
+
+
+@dataclass(slots=True)
+class Operation:
+    """
+    One scheduled call, `at` seconds after the start of the run.
+    """
+
+    at: float
+    op: str
+    id: str
+    size: int = 0
+
+
+@dataclass(slots=True)
+class Workload:
+    """
+    Shape of a synthetic workload.
+
+    Creates always use new IDs; the other operations pick one of `keys`
+    existing IDs with Zipf popularity (`zipf` = 0 is uniform).
+    """
+
+    rate: float = 100.0
+    duration: float = 60.0
+    mix: Dict[str, float] = field(default_factory=lambda: {"get_active": 0.8, "update": 0.15, "create": 0.05})
+    sizes: Sequence[Tuple[int, float]] = ((4096, 1.0),)
+    keys: int = 1000
+    zipf: float = 1.0
+    poisson: bool = True
+    id_prefix: str = "load-"
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class OperationStats:
+    count: int = 0
+    errors: int = 0
+    misses: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def percentile(
+        self,
+        p: float
+    ) -> float:
+        """
+        Get a latency percentile.
+
+        Args:
+            p (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, 0.0 without samples.
+        """
+
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))]
+
+
+@dataclass(slots=True)
+class LoadReport:
+    elapsed: float = 0.0
+    operations: Dict[str, OperationStats] = field(default_factory=dict)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Get one row of throughput and latency figures per operation.
+
+        Returns:
+            List[Dict[str, Any]]: The rows, latencies in milliseconds.
+        """
+
+        rows = []
+        for op, stats in sorted(self.operations.items()):
+            row = {
+                "op": op,
+                "count": stats.count,
+                "errors": stats.errors,
+                "misses": stats.misses,
+                "ops_per_second": stats.count / self.elapsed if self.elapsed else 0.0,
+            }
+            for p in PERCENTILES:
+                row[f"p{p:g}_ms"] = stats.percentile(p) * 1000
+            row["max_ms"] = max(stats.latencies, default=0.0) * 1000
+            rows.append(row)
+        return rows
+
+
+class ZipfSampler:
+    """
+    Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** s.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        s: float,
+        rng: random.Random
+    ):
+        """
+        Initialize the ZipfSampler.
+
+        Args:
+            n (int): The number of ranks.
+            s (float): The exponent; 0 is uniform, larger is more skewed.
+            rng (random.Random): The random source.
+
+        Returns:
+            None
+        """
+
+        self._cumulative = list(itertools.accumulate(1.0 / (rank + 1) ** s for rank in range(n)))
+        self._rng = rng
+
+
+    def sample(self) -> int:
+        point = self._rng.random() * self._cumulative[-1]
+        return min(bisect.bisect_left(self._cumulative, point), len(self._cumulative) - 1)
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """
+    Parse "name=weight,name=weight" into a dict.
+
+    Args:
+        spec (str): The weights, e.g. "get_active=0.8,update=0.2".
+
+    Returns:
+        Dict[str, float]: The weight of each name.
+    """
+
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1.0)
+    return weights
+
+
+def generate(workload: Workload) -> Iterator[Operation]:
+    """
+    Generate the operations of a synthetic workload in schedule order.
+
+    Args:
+        workload (Workload): The workload shape.
+
+    Returns:
+        Iterator[Operation]: The operations.
+    """
+
+    unknown = set(workload.mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(workload.seed)
+    keys = ZipfSampler(workload.keys, workload.zipf, rng)
+    ops, op_weights = zip(*workload.mix.items())
+    sizes, size_weights = zip(*workload.sizes)
+    created = itertools.count(workload.keys)
+
+    at = 0.0
+    while True:
+        at += rng.expovariate(workload.rate) if workload.poisson else 1.0 / workload.rate
+        if at >= workload.duration:
+            return
+
+        op = rng.choices(ops, op_weights)[0]
+        number = next(created) if op == "create" else keys.sample()
+        size = rng.choices(sizes, size_weights)[0] if op in ("create", "update") else 0
+        yield Operation(at=at, op=op, id=f"{workload.id_prefix}{number}", size=size)
+
+
+def preload(workload: Workload) -> Iterator[Operation]:
+    """
+    Generate creates for every key of the workload, to run before it.
+
+    Args:
+        workload (Workload): The workload shape.
+
+    Returns:
+        Iterator[Operation]: Unscheduled creates (`at` is 0).
+    """
+
+    rng = random.Random(workload.seed)
+    sizes, size_weights = zip(*workload.sizes)
+    for number in range(workload.keys):
+        size = rng.choices(sizes, size_weights)[0]
+        yield Operation(at=0.0, op="create", id=f"{workload.id_prefix}{number}", size=size)
+
+
+def read_trace(path: str) -> Iterator[Operation]:
+    """
+    Read operations recorded by LoadRunner.
+
+    Args:
+        path (str): The JSONL trace file.
+
+    Returns:
+        Iterator[Operation]: The operations.
+    """
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield Operation(**json.loads(line))
+
+
+class LoadRunner:
+    """
+    Drives a FileService with a stream of scheduled operations.
+
+    Operations are issued open-loop: each one starts at its scheduled time
+    whether or not earlier ones have finished, and its latency is measured
+    from that scheduled time. A backend that falls behind therefore shows
+    up as queueing in the percentiles instead of as a lower request rate.
+    """
+
+    def __init__(
+        self,
+        service: FileService,
+        *,
+        workers: int = 32,
+        max_pending: int = 10000
+    ):
+        """
+        Initialize the LoadRunner.
+
+        Args:
+            service (FileService): The service under test.
+            workers (int): The number of concurrent calls.
+            max_pending (int): The number of scheduled calls allowed to wait for a worker.
+
+        Returns:
+            None
+        """
+
+        self._service = service
+        self._workers = workers
+        self._pending = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._payload = b""
+
+
+    def run(
+        self,
+        operations: Iterable[Operation],
+        *,
+        record: str | None = None,
+        speed: float = 1.0
+    ) -> LoadReport:
+        """
+        Run operations at their scheduled times and collect latencies.
+
+        Args:
+            operations (Iterable[Operation]): The operations, in schedule order.
+            record (str | None): Append every issued operation to this JSONL trace.
+            speed (float): Replay speed; 2.0 issues operations twice as fast as scheduled.
+
+        Returns:
+            LoadReport: Throughput and latencies per operation.
+        """
+
+        report = LoadReport()
+        trace = open(record, "a", encoding="utf-8") if record else None
+        started = time.monotonic()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="load") as pool:
+                for operation in operations:
+                    due = started + operation.at / speed
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                    if trace is not None:
+                        trace.write(json.dumps(asdict(operation)) + "\n")
+
+                    self._pending.acquire()
+                    pool.submit(self._execute, operation, due, report)
+        finally:
+            if trace is not None:
+                trace.close()
+
+        report.elapsed = time.monotonic() - started
+        return report
+
+
+    def _execute(
+        self,
+        operation: Operation,
+        due: float,
+        report: LoadReport
+    ) -> None:
+        """
+        Issue one operation and record its outcome.
+
+        Args:
+            operation (Operation): The operation.
+            due (float): The scheduled start, on the monotonic clock.
+            report (LoadReport): The report to update.
+
+        Returns:
+            None
+        """
+
+        error = False
+        result = None
+        try:
+            result = self._call(operation)
+        except Exception as exc:
+            print(f"Error running {operation.op} on {operation.id}: {exc}")
+            error = True
+        finally:
+            self._pending.release()
+
+        latency = time.monotonic() - due
+        with self._lock:
+            stats = report.operations.setdefault(operation.op, OperationStats())
+            stats.count += 1
+            stats.latencies.append(latency)
+            if error:
+                stats.errors += 1
+            elif result is None and operation.op != "delete":
+                stats.misses += 1
+
+
+    def _call(
+        self,
+        operation: Operation
+    ) -> Any:
+        service = self._service
+
+        if operation.op == "get_active":
+            return service.get_active(operation.id)
+
+        if operation.op == "delete":
+            return service.delete(operation.id)
+
+        version = FileVersion(id=operation.id, version=1, created_at=datetime.now(), metadata={})
+        content = self._content(operation.size)
+
+        if operation.op == "create":
+            return service.create(content=content, content_type=CONTENT_TYPE, version=version)
+        if operation.op == "update":
+            return service.update(version=version, content=content, content_type=CONTENT_TYPE)
+
+        raise ValueError(f"Unknown operation: {operation.op}")
+
+
+    def _content(
+        self,
+        size: int
+    ) -> bytes:
+        # Random bytes defeat compression and deduplication; one buffer is
+        # generated up front and sliced so payloads cost no CPU per call.
+        if len(self._payload) < size:
+            with self._lock:
+                if len(self._payload) < size:
+                    self._payload = os.urandom(size)
+        return self._payload[:size]
@@ -0,0 +1,448 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import json
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.checksums import compute_checksums
+from src.domain.entities import VersionRecord
+from src.domain.repositories import FileMetadataRepository, FileStorage
+
+
+PACK_ATTRIBUTE = "pack"
+INDEX_SUFFIX = ".index"
+
+
+def is_packed(record: VersionRecord) -> bool:
+    """
+    Check whether a record's content lives inside a pack object.
+
+    Args:
+        record (VersionRecord): The version record.
+
+    Returns:
+        bool: True if the record points at a pack entry.
+    """
+
+    return bool(record.attributes.get(PACK_ATTRIBUTE))
+
+
+def read_packed(
+    storage: FileStorage,
+    record: VersionRecord
+) -> bytes:
+    """
+    Read the content of a packed record with a range request.
+
+    Args:
+        storage (FileStorage): The storage holding the pack.
+        record (VersionRecord): The packed version record.
+
+    Returns:
+        bytes: The content of the version.
+    """
+
+    return storage.download_range(
+        record.storage_path,
+        record.attributes["offset"],
+        record.attributes["length"],
+    )
+
+
+@dataclass(slots=True)
+class _Batch:
+    entries: List[Tuple[str, int, bytes]] = field(default_factory=list)
+    size: int = 0
+    done: threading.Event = field(default_factory=threading.Event)
+    sealed: bool = False
+    attributes: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+
+class PackWriter:
+    """
+    Packs small files into shared objects with group commit.
+
+    Concurrent `put` calls join the open batch. The batch is written as one
+    pack object when it reaches `max_pack_bytes` or `max_entries`, or when
+    its oldest writer has waited `max_delay`; whichever caller seals it
+    performs the upload while the others wait. Every pack has a JSON index
+    object next to it with its write time and the (id, version, offset,
+    length) of each entry, which the compactor uses to find dead entries.
+    """
+
+    def __init__(
+        self,
+        storage: FileStorage,
+        *,
+        prefix: str = "packs",
+        threshold: int = 4096,
+        max_pack_bytes: int = 8 * 1024 * 1024,
+        max_entries: int = 2000,
+        max_delay: float = 0.05
+    ):
+        """
+        Initialize the PackWriter.
+
+        Args:
+            storage (FileStorage): The storage packs are written to.
+            prefix (str): The path prefix of pack objects.
+            threshold (int): Files up to this many bytes are packed.
+            max_pack_bytes (int): Seal a pack once it holds this many bytes.
+            max_entries (int): Seal a pack once it holds this many files.
+            max_delay (float): Seconds a writer waits for others to join its pack.
+
+        Returns:
+            None
+        """
+
+        self._storage = storage
+        self._prefix = prefix.strip("/")
+        self._threshold = threshold
+        self._max_pack_bytes = max_pack_bytes
+        self._max_entries = max_entries
+        self._max_delay = max_delay
+        self._batch = _Batch()
+        self._lock = threading.Lock()
+
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+
+    def accepts(
+        self,
+        size: int
+    ) -> bool:
+        """
+        Check whether a file of the given size is packed.
+
+        Args:
+            size (int): The size of the file in bytes.
+
+        Returns:
+            bool: True if the file should go into a pack.
+        """
+
+        return size <= self._threshold
+
+
+    def put(
+        self,
+        id: str,
+        version: int,
+        content: bytes
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Add a file to the open pack and wait until the pack is stored.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+            content (bytes): The content of the file.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The pack path and the record attributes.
+        """
+
+        with self._lock:
+            batch = self._batch
+            index = len(batch.entries)
+            batch.entries.append((id, version, content))
+            batch.size += len(content)
+            full = batch.size >= self._max_pack_bytes or len(batch.entries) >= self._max_entries
+            leader = full and self._seal(batch)
+
+        if not leader and not batch.done.wait(self._max_delay):
+            with self._lock:
+                leader = self._seal(batch)
+
+        if leader:
+            self._commit(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        attributes = batch.attributes[index]
+        return attributes[PACK_ATTRIBUTE], attributes
+
+
+    def write_pack(
+        self,
+        entries: List[Tuple[str, int, bytes]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Write entries as one pack object plus its index.
+
+        The index is written first, so a pack never exists without one.
+
+        Args:
+            entries (List[Tuple[str, int, bytes]]): (id, version, content) triples.
+
+        Returns:
+            List[Dict[str, Any]]: The record attributes of each entry, in order.
+        """
+
+        path = f"{self._prefix}/{uuid.uuid4().hex}"
+        attributes = []
+        offset = 0
+
+        for id, version, content in entries:
+            attributes.append({
+                PACK_ATTRIBUTE: path,
+                "offset": offset,
+                "length": len(content),
+            })
+            offset += len(content)
+
+        index = {
+            "written_at": time.time(),
+            "entries": [
+                {"id": id, "version": version, "offset": attrs["offset"], "length": attrs["length"]}
+                for (id, version, _), attrs in zip(entries, attributes)
+            ],
+        }
+
+        index_payload = json.dumps(index).encode("utf-8")
+        payload = b"".join(content for _, _, content in entries)
+
+        self._storage.upload(
+            path + INDEX_SUFFIX,
+            index_payload,
+            "application/json",
+            compute_checksums(index_payload),
+        )
+        self._storage.upload(
+            path,
+            payload,
+            "application/octet-stream",
+            compute_checksums(payload),
+        )
+        return attributes
+
+
+    def _seal(
+        self,
+        batch: _Batch
+    ) -> bool:
+        """
+        Close a batch to new writers. Must be called with the lock held.
+
+        Args:
+            batch (_Batch): The batch to seal.
+
+        Returns:
+            bool: True if this caller sealed it and must commit it.
+        """
+
+        if batch.sealed:
+            return False
+
+        batch.sealed = True
+        if self._batch is batch:
+            self._batch = _Batch()
+        return True
+
+
+    def _commit(
+        self,
+        batch: _Batch
+    ) -> None:
+        try:
+            batch.attributes = self.write_pack(batch.entries)
+        except BaseException as exc:
+            batch.error = exc
+        finally:
+            batch.done.set()
+
+
+@dataclass(slots=True)
+class CompactionStats:
+    packs: int = 0
+    rewritten: int = 0
+    removed: int = 0
+    entries_moved: int = 0
+    bytes_reclaimed: int = 0
+    errors: int = 0
+
+
+class PackCompactor:
+    """
+    Rewrites packs whose share of dead entries is too high.
+
+    An entry is live while any version record still points at it. Packs
+    with no live entries are deleted; packs at or above `min_dead_ratio` of
+    dead bytes have their live entries copied into a new pack, the records
+    repointed, and the old pack deleted. Readers that resolved a record
+    before it was repointed may fail once and must re-read it.
+
+    A pack is uploaded before the records pointing at it are saved, so
+    packs younger than `grace` seconds are skipped, and every entry is
+    checked again right before a pack is deleted.
+    """
+
+    def __init__(
+        self,
+        repository: FileMetadataRepository,
+        storage: FileStorage,
+        writer: PackWriter,
+        *,
+        min_dead_ratio: float = 0.5,
+        grace: float = 3600.0
+    ):
+        """
+        Initialize the PackCompactor.
+
+        Args:
+            repository (FileMetadataRepository): The metadata repository.
+            storage (FileStorage): The storage holding the packs.
+            writer (PackWriter): Writes the rewritten packs.
+            min_dead_ratio (float): The dead byte share that triggers a rewrite.
+            grace (float): Seconds a new pack is left alone while its records are saved.
+
+        Returns:
+            None
+        """
+
+        self._repository = repository
+        self._storage = storage
+        self._writer = writer
+        self._min_dead_ratio = min_dead_ratio
+        self._grace = grace
+
+
+    def run(self) -> CompactionStats:
+        """
+        Examine every pack once.
+
+        Returns:
+            CompactionStats: Counters for the pass.
+        """
+
+        stats = CompactionStats()
+        indexes = [
+            path for path in self._storage.list_objects(self._writer.prefix + "/")
+            if path.endswith(INDEX_SUFFIX)
+        ]
+
+        for index_path in indexes:
+            stats.packs += 1
+            try:
+                self._compact(index_path[:-len(INDEX_SUFFIX)], index_path, stats)
+            except Exception as exc:
+                stats.errors += 1
+                print(f"Error compacting {index_path}: {exc}")
+
+        return stats
+
+
+    def _compact(
+        self,
+        pack: str,
+        index_path: str,
+        stats: CompactionStats
+    ) -> None:
+        """
+        Rewrite or delete one pack if enough of it is dead.
+
+        Args:
+            pack (str): The pack path.
+            index_path (str): The path of the pack's index object.
+            stats (CompactionStats): The counters to update.
+
+        Returns:
+            None
+        """
+
+        # A pack still being uploaded has its index but not its data yet.
+        if self._storage.stat(pack) is None:
+            return
+
+        index = json.loads(self._storage.download(index_path))
+        # Indexes written before the timestamp was added are plain lists.
+        if isinstance(index, list):
+            index = {"written_at": 0.0, "entries": index}
+
+        # Records are saved after their pack is uploaded, so every entry of
+        # a young pack looks dead until its writers have finished.
+        if time.time() - index["written_at"] < self._grace:
+            return
+
+        entries = index["entries"]
+        live = []
+        for entry in entries:
+            records = self._referencing(pack, entry)
+            if records:
+                live.append((entry, records))
+
+        total = sum(entry["length"] for entry in entries)
+        dead = total - sum(entry["length"] for entry, _ in live)
+
+        if live and (total == 0 or dead / total < self._min_dead_ratio):
+            return
+
+        if live:
+            data = self._storage.download(pack)
+            moved = [
+                (entry["id"], entry["version"], data[entry["offset"]:entry["offset"] + entry["length"]])
+                for entry, _ in live
+            ]
+            for (_, records), attributes in zip(live, self._writer.write_pack(moved)):
+                for record in records:
+                    self._repository.update_location(
+                        record.version.id,
+                        record.version.version,
+                        attributes[PACK_ATTRIBUTE],
+                        attributes,
+                    )
+
+        # A record saved late (past the grace window) or a metadata-only
+        # update sharing an entry may have started pointing at the pack since
+        # the first pass; moved entries now point at the new pack.
+        if any(self._referencing(pack, entry) for entry in entries):
+            return
+
+        if live:
+            stats.rewritten += 1
+            stats.entries_moved += len(live)
+        else:
+            stats.removed += 1
+
+        self._storage.delete_objects([pack, index_path])
+        stats.bytes_reclaimed += dead
+
+
+    def _referencing(
+        self,
+        pack: str,
+        entry: Dict[str, Any]
+    ) -> List[VersionRecord]:
+        """
+        Find the records that point at a pack entry.
+
+        Metadata-only updates share the entry of an earlier version, so every
+        version of the file is checked, not only the one that wrote it.
+
+        Args:
+            pack (str): The pack path.
+            entry (Dict[str, Any]): The index entry.
+
+        Returns:
+            List[VersionRecord]: The referencing records; empty if the entry is dead.
+        """
+
+        return [
+            record for record in self._repository.get_records(entry["id"])
+            if record.storage_path == pack
+            and record.attributes.get("offset") == entry["offset"]
+        ]
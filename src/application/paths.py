@@ -0,0 +1,114 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import hashlib
+from abc import ABC, abstractmethod
+
+
+class PathStrategy(ABC):
+    """
+    Maps a file id to the storage key prefix that holds all of its versions.
+
+    Strategies must be deterministic: reads and prefix deletes rebuild the
+    same key from the id alone.
+    """
+
+    @abstractmethod
+    def prefix(
+        self,
+        id: str
+    ) -> str:
+        """
+        Build the key prefix for a file id, without base path.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            str: The key prefix.
+        """
+        raise NotImplementedError
+
+    def build(
+        self,
+        id: str,
+        version: int | str
+    ) -> str:
+        """
+        Build the key for one version of a file, without base path.
+
+        Args:
+            id (str): The ID of the file.
+            version (int | str): The version of the file, or "" for the prefix.
+
+        Returns:
+            str: The storage key.
+        """
+
+        prefix = self.prefix(id)
+        if str(version):
+            return f"{prefix}/v{version}"
+        return prefix
+
+
+class PlainPathStrategy(PathStrategy):
+    """
+    Lays objects out as `{id}/v{n}`.
+    """
+
+    def prefix(self, id: str) -> str:
+        return id
+
+
+class HashedPrefixPathStrategy(PathStrategy):
+    """
+    Prepends hash-derived directories so sequential ids spread across the key space.
+
+    With the defaults, `invoice-123` becomes `ce/56/invoice-123`. A salt
+    changes the distribution without changing the layout, for example to
+    keep two tenants sharing a bucket on different partitions.
+    """
+
+    def __init__(
+        self,
+        depth: int = 2,
+        width: int = 2,
+        salt: str = ""
+    ):
+        """
+        Initialize the HashedPrefixPathStrategy.
+
+        Args:
+            depth (int): The number of hash directories.
+            width (int): The number of hex characters per directory.
+            salt (str): A salt mixed into the hash.
+
+        Returns:
+            None
+        """
+
+        if depth * width > 32:
+            raise ValueError("depth * width cannot exceed 32 hex characters")
+
+        self._depth = depth
+        self._width = width
+        self._salt = salt
+
+
+    def prefix(self, id: str) -> str:
+        digest = hashlib.md5(f"{self._salt}{id}".encode("utf-8")).hexdigest()
+        parts = [
+            digest[i * self._width:(i + 1) * self._width]
+            for i in range(self._depth)
+        ]
+        parts.append(id)
+        return "/".join(parts)
+
+
+class ReversedIdPathStrategy(PathStrategy):
+    """
+    Reverses the id so the fastest-changing characters lead the key.
+    """
+
+    def prefix(self, id: str) -> str:
+        return id[::-1]
@@ -0,0 +1,329 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import gzip
+import hashlib
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Iterable, Optional
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.ingestion import IngestionItem, IngestionStats, ProgressReporter
+from src.application.use_cases import FileService
+from src.domain.checksums import Checksums, compute_checksums
+from src.domain.entities import FileVersion
+
+
+_DONE = object()
+
+
+@dataclass(slots=True)
+class PreparedContent:
+    payload: bytes
+    sha256: str
+    size_bytes: int
+    checksums: Checksums
+    content_encoding: Optional[str] = None
+
+
+def prepare_content(
+    content: bytes,
+    compress: bool = False,
+    level: int = 6
+) -> PreparedContent:
+    """
+    Hash and optionally compress file content.
+
+    Runs in a worker process, so it must stay a module-level function. The
+    upload checksums cover the payload as stored; `sha256` always covers
+    the raw content.
+
+    Args:
+        content (bytes): The raw file content.
+        compress (bool): Whether to gzip the content.
+        level (int): The gzip compression level.
+
+    Returns:
+        PreparedContent: The encoded payload, its checksums and the content digest.
+    """
+
+    if compress:
+        payload = gzip.compress(content, compresslevel=level)
+        return PreparedContent(
+            payload=payload,
+            sha256=hashlib.sha256(content).hexdigest(),
+            size_bytes=len(content),
+            checksums=compute_checksums(payload),
+            content_encoding="gzip",
+        )
+
+    checksums = compute_checksums(content)
+    return PreparedContent(
+        payload=content,
+        sha256=checksums.sha256,
+        size_bytes=len(content),
+        checksums=checksums,
+    )
+
+
+def prepared_version_factory(
+    item: IngestionItem,
+    prepared: PreparedContent
+) -> FileVersion:
+    """
+    Build version metadata that records the digest and encoding.
+
+    Args:
+        item (IngestionItem): The item being ingested.
+        prepared (PreparedContent): The output of the CPU stage.
+
+    Returns:
+        FileVersion: The version metadata.
+    """
+
+    metadata = {
+        "source_path": item.path,
+        "size_bytes": str(prepared.size_bytes),
+        "sha256": prepared.sha256,
+    }
+    if prepared.content_encoding:
+        metadata["content_encoding"] = prepared.content_encoding
+
+    return FileVersion(id=item.id, created_at=datetime.now(), metadata=metadata)
+
+
+class IngestionPipeline:
+    """
+    Three-stage ingestion: read, prepare in a process pool, upload and commit.
+
+    Reading and uploading run on threads because they wait on I/O, while
+    hashing and compression run in separate processes so they are not
+    serialized by the GIL. Every hand-off goes through a bounded queue, so a
+    slow stage stalls the stages in front of it instead of buffering the
+    whole input in memory.
+    """
+
+    def __init__(
+        self,
+        service: FileService,
+        *,
+        checkpoint: Any = None,
+        read_workers: int = 4,
+        cpu_workers: int | None = None,
+        upload_workers: int = 16,
+        queue_size: int = 64,
+        compress: bool = False,
+        compress_level: int = 6,
+        version_factory: Callable[[IngestionItem, PreparedContent], Any] = prepared_version_factory,
+        batch_size: int = 1000,
+        progress_interval: float = 5.0,
+        report: Callable[[str], None] = print
+    ):
+        """
+        Initialize the IngestionPipeline.
+
+        Args:
+            service (FileService): The service files are created through.
+            checkpoint (Any): Optional checkpoint store, e.g. SqliteCheckpoint.
+            read_workers (int): Threads reading files from disk.
+            cpu_workers (int | None): Processes hashing and compressing, defaults to the CPU count.
+            upload_workers (int): Threads uploading and committing metadata.
+            queue_size (int): Capacity of each queue between stages.
+            compress (bool): Whether to gzip content before upload.
+            compress_level (int): The gzip compression level.
+            version_factory (Callable[[IngestionItem, PreparedContent], Any]): Builds version metadata.
+            batch_size (int): How many items are checked against the checkpoint at once.
+            progress_interval (float): Seconds between progress reports.
+            report (Callable[[str], None]): Where progress lines are written.
+
+        Returns:
+            None
+        """
+
+        self._service = service
+        self._checkpoint = checkpoint
+        self._read_workers = read_workers
+        self._cpu_workers = cpu_workers or os.cpu_count() or 1
+        self._upload_workers = upload_workers
+        self._queue_size = queue_size
+        self._compress = compress
+        self._compress_level = compress_level
+        self._version_factory = version_factory
+        self._batch_size = batch_size
+        self._progress_interval = progress_interval
+        self._report = report
+        self._stats = IngestionStats()
+        self._lock = threading.Lock()
+
+
+    def run(
+        self,
+        items: Iterable[IngestionItem]
+    ) -> IngestionStats:
+        """
+        Push all items through the pipeline and wait for completion.
+
+        Args:
+            items (Iterable[IngestionItem]): The items to ingest.
+
+        Returns:
+            IngestionStats: Counters for the run.
+        """
+
+        self._stats = IngestionStats()
+        read_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        upload_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+
+        reporter = ProgressReporter(
+            lambda: self._stats,
+            interval=self._progress_interval,
+            report=self._report,
+        )
+
+        with reporter, ProcessPoolExecutor(max_workers=self._cpu_workers) as pool:
+            readers = [
+                threading.Thread(target=self._read_stage, args=(read_queue, upload_queue, pool))
+                for _ in range(self._read_workers)
+            ]
+            uploaders = [
+                threading.Thread(target=self._upload_stage, args=(upload_queue,))
+                for _ in range(self._upload_workers)
+            ]
+
+            for thread in readers + uploaders:
+                thread.start()
+
+            try:
+                self._feed(items, read_queue)
+            finally:
+                for _ in readers:
+                    read_queue.put(_DONE)
+                for thread in readers:
+                    thread.join()
+
+                for _ in uploaders:
+                    upload_queue.put(_DONE)
+                for thread in uploaders:
+                    thread.join()
+
+        return self._stats
+
+
+    def stats(self) -> IngestionStats:
+        """
+        Get the counters of the current or last run.
+
+        Returns:
+            IngestionStats: The run counters.
+        """
+
+        return self._stats
+
+
+    def _feed(
+        self,
+        items: Iterable[IngestionItem],
+        read_queue: queue.Queue
+    ) -> None:
+        iterator = iter(items)
+
+        while True:
+            batch = list(islice(iterator, self._batch_size))
+            if not batch:
+                return
+
+            if self._checkpoint is not None:
+                by_key = {item.key: item for item in batch}
+                pending = [by_key[key] for key in self._checkpoint.pending(by_key)]
+            else:
+                pending = batch
+
+            with self._lock:
+                self._stats.skipped += len(batch) - len(pending)
+
+            for item in pending:
+                read_queue.put(item)
+
+
+    def _read_stage(
+        self,
+        read_queue: queue.Queue,
+        upload_queue: queue.Queue,
+        pool: ProcessPoolExecutor
+    ) -> None:
+        while True:
+            item = read_queue.get()
+            if item is _DONE:
+                return
+
+            try:
+                with open(item.path, "rb") as handle:
+                    content = handle.read()
+            except Exception as exc:
+                self._fail(item, exc)
+                continue
+
+            future = pool.submit(prepare_content, content, self._compress, self._compress_level)
+            # The future is queued rather than awaited here, so readers keep
+            # the process pool busy while the bounded upload queue caps how
+            # many prepared payloads can be held in memory.
+            upload_queue.put((item, future))
+
+
+    def _upload_stage(
+        self,
+        upload_queue: queue.Queue
+    ) -> None:
+        while True:
+            entry = upload_queue.get()
+            if entry is _DONE:
+                return
+
+            item, future = entry
+            self._upload(item, future)
+
+
+    def _upload(
+        self,
+        item: IngestionItem,
+        future: Future
+    ) -> None:
+        try:
+            prepared: PreparedContent = future.result()
+            item.size_bytes = prepared.size_bytes
+
+            saved = self._service.create(
+                content=prepared.payload,
+                content_type=item.content_type,
+                version=self._version_factory(item, prepared),
+                checksums=prepared.checksums,
+            )
+
+            if saved is None:
+                raise RuntimeError("file service did not commit the version")
+
+            if self._checkpoint is not None:
+                self._checkpoint.mark_done(item.key, item.id, prepared.size_bytes)
+
+            with self._lock:
+                self._stats.completed += 1
+                self._stats.bytes += prepared.size_bytes
+        except Exception as exc:
+            self._fail(item, exc)
+
+
+    def _fail(
+        self,
+        item: IngestionItem,
+        exc: Exception
+    ) -> None:
+        with self._lock:
+            self._stats.failed += 1
+        print(f"Error ingesting {item.path}: {exc}")
@@ -0,0 +1,155 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import threading
+from typing import Any, Callable, List
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.retry import RateLimiter, RetryPolicy
+from src.domain.entities import ReclaimTask
+from src.domain.repositories import FileStorage, ReclaimQueue
+
+
+class ReclaimWorker:
+    """
+    Background worker pool that physically deletes queued storage paths.
+
+    A task ending in "/" is a prefix and everything under it is deleted;
+    any other task is one object. The objects of a batch are removed with
+    one bulk delete. Deletes are rate limited so a burst of reclaims cannot
+    starve live traffic of storage request quota, and failed tasks are
+    retried with backoff until the policy's attempts are exhausted.
+    """
+
+    def __init__(
+        self,
+        queue: ReclaimQueue,
+        storage: FileStorage,
+        *,
+        workers: int = 4,
+        rate: float = 10.0,
+        policy: RetryPolicy | None = None,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the ReclaimWorker.
+
+        Args:
+            queue (ReclaimQueue): The queue of paths and prefixes to delete.
+            storage (FileStorage): The storage to delete from.
+            workers (int): The number of worker threads.
+            rate (float): The maximum number of delete calls per second.
+            policy (RetryPolicy | None): Backoff and attempt limit for failed deletes.
+            lease_seconds (float): How long a task is hidden while being processed.
+            poll_interval (float): Seconds to sleep when the queue is empty.
+
+        Returns:
+            None
+        """
+
+        self._queue = queue
+        self._storage = storage
+        self._workers = workers
+        self._limiter = RateLimiter(rate)
+        self._policy = policy or RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=600.0)
+        self._lease_seconds = lease_seconds
+        self._poll_interval = poll_interval
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+
+    def start(self) -> None:
+        """
+        Start the worker threads.
+        """
+
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+
+    def stop(self) -> None:
+        """
+        Stop the worker threads after their current task.
+        """
+
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+    def drain_once(
+        self,
+        limit: int = 100
+    ) -> int:
+        """
+        Process one batch of due tasks on the calling thread.
+
+        Args:
+            limit (int): The maximum number of tasks.
+
+        Returns:
+            int: The number of tasks processed.
+        """
+
+        tasks = self._queue.lease(limit, self._lease_seconds)
+        objects = [task for task in tasks if not task.prefix.endswith("/")]
+
+        for task in tasks:
+            if task.prefix.endswith("/"):
+                self._process([task], self._storage.delete, task.prefix)
+        if objects:
+            self._process(objects, self._storage.delete_objects, [task.prefix for task in objects])
+        return len(tasks)
+
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if not self.drain_once():
+                self._stopped.wait(self._poll_interval)
+
+
+    def _process(
+        self,
+        tasks: List[ReclaimTask],
+        delete: Callable[[Any], None],
+        target: Any
+    ) -> None:
+        """
+        Run one delete call and settle the tasks it covers.
+
+        Args:
+            tasks (List[ReclaimTask]): The tasks covered by the call.
+            delete (Callable[[Any], None]): The storage delete method.
+            target (Any): The prefix or list of paths passed to it.
+
+        Returns:
+            None
+        """
+
+        self._limiter.acquire()
+
+        try:
+            delete(target)
+        except Exception as exc:
+            for task in tasks:
+                attempt = task.attempts + 1
+
+                if attempt >= self._policy.max_attempts:
+                    print(f"Error reclaiming {task.prefix}, giving up: {exc}")
+                    self._queue.fail(task, str(exc))
+                else:
+                    print(f"Error reclaiming {task.prefix}, will retry: {exc}")
+                    self._queue.retry(task, self._policy.backoff(attempt), str(exc))
+            return
+
+        for task in tasks:
+            self._queue.complete(task)
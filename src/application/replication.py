@@ -0,0 +1,625 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import DelegatingFileStorage
+from src.application.retry import RateLimiter, RetryPolicy
+from src.domain.checksums import Checksums, compute_checksums
+from src.domain.entities import RepairTask, UploadTarget
+from src.domain.repositories import FileStorage, RepairQueue
+
+
+REPAIR_PUT = "put"
+REPAIR_DELETE_PREFIX = "delete_prefix"
+REPAIR_DELETE_OBJECT = "delete_object"
+
+
+@dataclass(slots=True)
+class _ReplicaHealth:
+    latency: float = 0.0
+    failures: int = 0
+    down_until: float = 0.0
+
+
+class ReplicatingFileStorage(DelegatingFileStorage):
+    """
+    Storage that keeps the same objects in several backends.
+
+    Writes fan out to every replica concurrently and return once
+    `write_quorum` replicas (and the primary, if `require_primary`) have
+    acknowledged; with a quorum of 1 the secondaries are written
+    asynchronously. Replicas that fail or finish after the caller returned
+    are recorded in the repair queue and brought up to date by
+    ReplicaRepairWorker. Reads start on the fastest healthy replica and are
+    hedged to the next one when it has not answered within `hedge_delay`,
+    or immediately when it fails; the first successful answer wins.
+
+    The first replica is the primary. Listings, stat and presigned URLs are
+    forwarded to it alone, and direct uploads completed against it are queued
+    for replication to the others.
+    """
+
+    def __init__(
+        self,
+        replicas: Dict[str, FileStorage],
+        *,
+        write_quorum: int | None = None,
+        require_primary: bool = True,
+        repair_queue: RepairQueue | None = None,
+        hedge_delay: float = 0.05,
+        cooldown: float = 1.0,
+        max_cooldown: float = 60.0,
+        workers: int = 32
+    ):
+        """
+        Initialize the ReplicatingFileStorage.
+
+        Args:
+            replicas (Dict[str, FileStorage]): The replicas by name; the first one is the primary.
+            write_quorum (int | None): Acknowledgements a write waits for, a majority by default.
+            require_primary (bool): Whether the primary must be among the acknowledgements.
+            repair_queue (RepairQueue | None): Where missed writes are recorded; logged only if None.
+            hedge_delay (float): Seconds before a read is also sent to the next replica.
+            cooldown (float): Seconds a failed replica is moved to the back of the read order.
+            max_cooldown (float): Upper bound of the cooldown after repeated failures.
+            workers (int): The number of concurrent backend calls.
+
+        Returns:
+            None
+        """
+
+        if not replicas:
+            raise ValueError("At least one replica is required")
+
+        quorum = write_quorum if write_quorum is not None else len(replicas) // 2 + 1
+        if not 1 <= quorum <= len(replicas):
+            raise ValueError(f"Write quorum must be between 1 and {len(replicas)}")
+
+        super().__init__(next(iter(replicas.values())))
+        self._replicas = dict(replicas)
+        self._primary = next(iter(replicas))
+        self._write_quorum = quorum
+        self._require_primary = require_primary
+        self._repair_queue = repair_queue
+        self._hedge_delay = hedge_delay
+        self._cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._health = {name: _ReplicaHealth() for name in replicas}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replica")
+
+
+    @property
+    def replicas(self) -> Dict[str, FileStorage]:
+        return dict(self._replicas)
+
+
+    def upload(
+        self,
+        path: str,
+        content: bytes,
+        content_type: str,
+        checksums: Optional[Checksums] = None
+    ) -> None:
+        return self._write([(REPAIR_PUT, path)], "upload", path, content, content_type, checksums)
+
+
+    def upload_multipart(
+        self,
+        path: str,
+        content: memoryview,
+        content_type: str,
+        checksums: Optional[Checksums] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: int = 8
+    ) -> None:
+        return self._write(
+            [(REPAIR_PUT, path)],
+            "upload_multipart",
+            path,
+            content,
+            content_type,
+            checksums,
+            part_size=part_size,
+            concurrency=concurrency,
+        )
+
+
+    def download(self, path: str) -> bytes:
+        return self._read("download", path)
+
+
+    def download_range(self, path: str, offset: int, length: int) -> bytes:
+        return self._read("download_range", path, offset, length)
+
+
+    def delete(self, prefix: str) -> None:
+        return self._write([(REPAIR_DELETE_PREFIX, prefix)], "delete", prefix)
+
+
+    def delete_objects(self, paths: List[str]) -> None:
+        paths = list(paths)
+        return self._write(
+            [(REPAIR_DELETE_OBJECT, path) for path in paths],
+            "delete_objects",
+            paths,
+        )
+
+
+    def copy(self, source: str, destination: str) -> None:
+        return self._write([(REPAIR_PUT, destination)], "copy", source, destination)
+
+
+    def transition(self, path: str, tier: str) -> None:
+        # A replica left in the wrong tier costs money but serves the same
+        # bytes, so it is only logged; the next tiering pass retries it.
+        return self._write([], "transition", path, tier)
+
+
+    def restore(self, path: str, days: int = 1) -> bool:
+        futures = [
+            self._pool.submit(self._call, replica, "restore", path, days)
+            for replica in self._replicas
+        ]
+        wait(futures)
+        results = [future.result() for future in futures if future.exception() is None]
+        if not results:
+            return futures[0].result()
+        return any(results)
+
+
+    def complete_upload(self, target: UploadTarget, parts: Optional[List[str]] = None) -> None:
+        self._inner.complete_upload(target, parts)
+        for replica in self._replicas:
+            if replica != self._primary:
+                self._lagging(replica, [(REPAIR_PUT, target.path)], None)
+
+
+    def abort_upload(self, target: UploadTarget) -> None:
+        self._inner.abort_upload(target)
+        for replica in self._replicas:
+            if replica != self._primary:
+                self._pool.submit(self._call, replica, "delete_objects", [target.path]) \
+                    .add_done_callback(self._settle(replica, [(REPAIR_DELETE_OBJECT, target.path)]))
+
+
+    def repair(
+        self,
+        task: RepairTask
+    ) -> None:
+        """
+        Apply a missed operation to a lagging replica.
+
+        Missing objects are copied from the fastest healthy replica that has
+        them, keeping the content type it reports. An object no replica has
+        any more was deleted in the meantime, so there is nothing left to
+        repair.
+
+        Args:
+            task (RepairTask): The repair task.
+
+        Returns:
+            None
+        """
+
+        if task.replica not in self._replicas:
+            raise ValueError(f"Unknown replica: {task.replica}")
+
+        if task.op == REPAIR_DELETE_PREFIX:
+            self._call(task.replica, "delete", task.path)
+        elif task.op == REPAIR_DELETE_OBJECT:
+            self._call(task.replica, "delete_objects", [task.path])
+        elif task.op == REPAIR_PUT:
+            try:
+                content = self._read("download", task.path, exclude=task.replica)
+            except Exception:
+                if self._missing_everywhere(task.path, exclude=task.replica):
+                    return
+                raise
+            info = self._read("stat", task.path, exclude=task.replica)
+            self._call(
+                task.replica,
+                "upload",
+                task.path,
+                content,
+                info.content_type if info and info.content_type else "application/octet-stream",
+                compute_checksums(content),
+            )
+        else:
+            raise ValueError(f"Unknown repair operation: {task.op}")
+
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report the read latency estimate and failure state of each replica.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Health per replica name.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "latency": state.latency,
+                    "failures": state.failures,
+                    "healthy": state.down_until <= now,
+                }
+                for name, state in self._health.items()
+            }
+
+
+    def close(self) -> None:
+        """
+        Wait for in-flight replica calls and release the worker threads.
+        """
+
+        self._pool.shutdown(wait=True)
+
+
+    def _write(
+        self,
+        repairs: List[Tuple[str, str]],
+        name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Fan a write out to every replica and wait for the quorum.
+
+        Args:
+            repairs (List[Tuple[str, str]]): The (op, path) repairs a replica needs if it misses the write.
+            name (str): The storage method.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Any: The primary's result, or another acknowledging replica's.
+        """
+
+        futures: Dict[Future, str] = {
+            self._pool.submit(self._call, replica, name, *args, **kwargs): replica
+            for replica in self._replicas
+        }
+        acked: Dict[str, Any] = {}
+        failed: Dict[str, BaseException] = {}
+        pending = set(futures)
+
+        while pending and not self._satisfied(acked) and self._reachable(failed):
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                replica = futures[future]
+                if future.exception() is not None:
+                    failed[replica] = future.exception()
+                else:
+                    acked[replica] = future.result()
+
+        if not self._satisfied(acked):
+            # The caller sees the failure and decides whether to retry, so
+            # replicas that did apply the write are not chased by repairs.
+            wait(pending)
+            raise failed.get(self._primary) or next(iter(failed.values()))
+
+        for replica, exc in failed.items():
+            self._lagging(replica, repairs, exc)
+        for future in pending:
+            future.add_done_callback(self._settle(futures[future], repairs))
+
+        return acked.get(self._primary, next(iter(acked.values())))
+
+
+    def _satisfied(
+        self,
+        acked: Dict[str, Any]
+    ) -> bool:
+        if self._require_primary and self._primary not in acked:
+            return False
+        return len(acked) >= self._write_quorum
+
+
+    def _reachable(
+        self,
+        failed: Dict[str, BaseException]
+    ) -> bool:
+        if self._require_primary and self._primary in failed:
+            return False
+        return len(self._replicas) - len(failed) >= self._write_quorum
+
+
+    def _settle(
+        self,
+        replica: str,
+        repairs: List[Tuple[str, str]]
+    ):
+        def done(future: Future) -> None:
+            if future.exception() is not None:
+                self._lagging(replica, repairs, future.exception())
+        return done
+
+
+    def _lagging(
+        self,
+        replica: str,
+        repairs: List[Tuple[str, str]],
+        exc: BaseException | None
+    ) -> None:
+        """
+        Record that a replica missed a write.
+
+        Args:
+            replica (str): The lagging replica.
+            repairs (List[Tuple[str, str]]): The (op, path) repairs it needs.
+            exc (BaseException | None): The failure, or None if it was never attempted.
+
+        Returns:
+            None
+        """
+
+        if exc is not None:
+            print(f"Error writing to replica {replica}: {exc}")
+
+        if self._repair_queue is None:
+            if repairs:
+                print(f"Replica {replica} is missing {len(repairs)} operation(s) and no repair queue is set")
+            return
+
+        for op, path in repairs:
+            try:
+                self._repair_queue.enqueue(replica, op, path)
+            except Exception as enqueue_exc:
+                print(f"Error queueing repair of {path} on {replica}: {enqueue_exc}")
+
+
+    def _read(
+        self,
+        name: str,
+        *args,
+        exclude: str | None = None
+    ) -> Any:
+        """
+        Read from the fastest healthy replica, hedging to the next ones.
+
+        Args:
+            name (str): The storage method.
+            *args: Positional arguments for the method.
+            exclude (str | None): A replica not to read from.
+
+        Returns:
+            Any: The first successful result.
+        """
+
+        order = [replica for replica in self._read_order() if replica != exclude]
+        if not order:
+            raise ValueError("No replica left to read from")
+
+        futures: Dict[Future, str] = {}
+        errors: List[BaseException] = []
+
+        def launch() -> None:
+            replica = order.pop(0)
+            futures[self._pool.submit(self._call, replica, name, *args)] = replica
+
+        launch()
+        while futures:
+            done, _ = wait(
+                futures,
+                timeout=self._hedge_delay if order else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                del futures[future]
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+
+            # Hedge on a slow replica, fail over on a broken one.
+            if order and (not done or not futures):
+                launch()
+
+        raise errors[0]
+
+
+    def _read_order(self) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            return sorted(
+                self._replicas,
+                key=lambda name: (self._health[name].down_until > now, self._health[name].latency),
+            )
+
+
+    def _call(
+        self,
+        replica: str,
+        name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Call one replica and update its health.
+
+        Args:
+            replica (str): The replica name.
+            name (str): The storage method.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Any: The result of the call.
+        """
+
+        started = time.monotonic()
+        try:
+            result = getattr(self._replicas[replica], name)(*args, **kwargs)
+        except FileNotFoundError:
+            self._record(replica, time.monotonic() - started, failed=False)
+            raise
+        except Exception:
+            self._record(replica, time.monotonic() - started, failed=True)
+            raise
+
+        self._record(replica, time.monotonic() - started, failed=False)
+        return result
+
+
+    def _record(
+        self,
+        replica: str,
+        elapsed: float,
+        failed: bool
+    ) -> None:
+        with self._lock:
+            state = self._health[replica]
+            state.latency = elapsed if state.latency == 0.0 else 0.8 * state.latency + 0.2 * elapsed
+            if failed:
+                state.failures += 1
+                backoff = min(self._max_cooldown, self._cooldown * 2 ** (state.failures - 1))
+                state.down_until = time.monotonic() + backoff
+            else:
+                state.failures = 0
+                state.down_until = 0.0
+
+
+    def _missing_everywhere(
+        self,
+        path: str,
+        exclude: str
+    ) -> bool:
+        for replica, storage in self._replicas.items():
+            if replica == exclude:
+                continue
+            try:
+                if storage.stat(path) is not None:
+                    return False
+            except Exception:
+                return False
+        return True
+
+
+class ReplicaRepairWorker:
+    """
+    Background worker pool that brings lagging replicas up to date.
+
+    Repairs are rate limited so catching up after an outage cannot starve
+    live traffic, and failed repairs are retried with backoff until the
+    policy's attempts are exhausted.
+    """
+
+    def __init__(
+        self,
+        queue: RepairQueue,
+        storage: ReplicatingFileStorage,
+        *,
+        workers: int = 4,
+        rate: float = 20.0,
+        policy: RetryPolicy | None = None,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the ReplicaRepairWorker.
+
+        Args:
+            queue (RepairQueue): The queue of missed operations.
+            storage (ReplicatingFileStorage): The replicated storage to repair.
+            workers (int): The number of worker threads.
+            rate (float): The maximum number of repairs per second.
+            policy (RetryPolicy | None): Backoff and attempt limit for failed repairs.
+            lease_seconds (float): How long a task is hidden while being processed.
+            poll_interval (float): Seconds to sleep when the queue is empty.
+
+        Returns:
+            None
+        """
+
+        self._queue = queue
+        self._storage = storage
+        self._workers = workers
+        self._limiter = RateLimiter(rate)
+        self._policy = policy or RetryPolicy(max_attempts=20, base_delay=1.0, max_delay=600.0)
+        self._lease_seconds = lease_seconds
+        self._poll_interval = poll_interval
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+
+    def start(self) -> None:
+        """
+        Start the worker threads.
+        """
+
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+
+    def stop(self) -> None:
+        """
+        Stop the worker threads after their current task.
+        """
+
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+    def drain_once(
+        self,
+        limit: int = 100
+    ) -> int:
+        """
+        Process one batch of due tasks on the calling thread.
+
+        Args:
+            limit (int): The maximum number of tasks.
+
+        Returns:
+            int: The number of tasks processed.
+        """
+
+        tasks = self._queue.lease(limit, self._lease_seconds)
+        for task in tasks:
+            self._process(task)
+        return len(tasks)
+
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if not self.drain_once(limit=1):
+                self._stopped.wait(self._poll_interval)
+
+
+    def _process(
+        self,
+        task: RepairTask
+    ) -> None:
+        self._limiter.acquire()
+
+        try:
+            self._storage.repair(task)
+        except Exception as exc:
+            attempt = task.attempts + 1
+
+            if attempt >= self._policy.max_attempts:
+                print(f"Error repairing {task.path} on {task.replica}, giving up: {exc}")
+                self._queue.fail(task, str(exc))
+            else:
+                print(f"Error repairing {task.path} on {task.replica}, will retry: {exc}")
+                self._queue.retry(task, self._policy.backoff(attempt), str(exc))
+            return
+
+        self._queue.complete(task)
@@ -0,0 +1,331 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.packing import is_packed
+from src.domain.entities import VersionRecord
+from src.domain.indexing import extract
+from src.domain.repositories import FileMetadataRepository, FileStorage
+
+
+CURSOR_KEY = "retention.cursor"
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """
+    Rules deciding when a non-active version expires.
+
+    An inactive version expires when it falls outside the newest `keep_last`
+    versions of its file or has been inactive for longer than `max_age`.
+    Soft-deleted versions expire `purge_deleted_after` after they were
+    deleted. Active versions never expire. Rows stored before the
+    repositories stamped these times fall back to their creation time.
+    """
+
+    keep_last: Optional[int] = None
+    max_age: Optional[timedelta] = None
+    purge_deleted_after: Optional[timedelta] = None
+
+    def expired(
+        self,
+        record: VersionRecord,
+        rank: int,
+        now: datetime
+    ) -> bool:
+        """
+        Decide whether a version has expired.
+
+        Args:
+            record (VersionRecord): The version record.
+            rank (int): The position of the version in its history, newest first.
+            now (datetime): The reference time.
+
+        Returns:
+            bool: True if the version can be removed.
+        """
+
+        status = getattr(record.version, "status", "ACTIVE")
+        created_at = getattr(record.version, "created_at", None)
+
+        if status == "DELETED":
+            age = age_of(record.deleted_at or record.deactivated_at or created_at, now)
+            return self.purge_deleted_after is not None and age is not None \
+                and age > self.purge_deleted_after
+
+        if status != "INACTIVE":
+            return False
+
+        if self.keep_last is not None and rank >= self.keep_last:
+            return True
+
+        age = age_of(record.deactivated_at or created_at, now)
+        return self.max_age is not None and age is not None and age > self.max_age
+
+
+@dataclass(slots=True)
+class RetentionStats:
+    pages: int = 0
+    files: int = 0
+    versions: int = 0
+    expired: int = 0
+    objects_deleted: int = 0
+    rows_deleted: int = 0
+    errors: int = 0
+
+
+def age_of(
+    created_at: Any,
+    now: datetime
+) -> Optional[timedelta]:
+    """
+    Compute how long ago a timestamp was, across naive and aware datetimes.
+
+    Args:
+        created_at (Any): The timestamp; anything but a datetime has no age.
+        now (datetime): The current time.
+
+    Returns:
+        Optional[timedelta]: The age, or None if the timestamp is missing.
+    """
+
+    if not isinstance(created_at, datetime):
+        return None
+    if created_at.tzinfo is not None and now.tzinfo is None:
+        now = now.astimezone(timezone.utc)
+    elif created_at.tzinfo is None and now.tzinfo is not None:
+        now = now.replace(tzinfo=None)
+    return now - created_at
+
+
+def field_classifier(
+    path: str,
+    default: str = "default"
+) -> Callable[[Any], str]:
+    """
+    Build a classifier that reads the retention class from a version field.
+
+    Args:
+        path (str): The dotted field path, e.g. "metadata.retention_class".
+        default (str): The class used when the field is missing.
+
+    Returns:
+        Callable[[Any], str]: The classifier.
+    """
+
+    def classify(version: Any) -> str:
+        value = extract(dataclasses.asdict(version), path)
+        return str(value) if value is not None else default
+
+    return classify
+
+
+class RetentionEngine:
+    """
+    Removes expired versions and their blobs in bounded, resumable passes.
+
+    Metadata is scanned page by page. Each file in a page is evaluated
+    against the policy of its class on a bounded worker pool, and expired
+    versions are removed in bulk: blobs first, then rows, so an interrupted
+    pass never leaves rows pointing at deleted blobs it still considers live.
+    The scan cursor is checkpointed after every page.
+    """
+
+    def __init__(
+        self,
+        repository: FileMetadataRepository,
+        storage: FileStorage,
+        policies: Dict[str, RetentionPolicy] | RetentionPolicy,
+        *,
+        classifier: Callable[[Any], str] | None = None,
+        checkpoint: Any = None,
+        page_size: int = 1000,
+        batch_size: int = 500,
+        workers: int = 8,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        """
+        Initialize the RetentionEngine.
+
+        Args:
+            repository (FileMetadataRepository): The metadata repository.
+            storage (FileStorage): The storage holding version blobs.
+            policies (Dict[str, RetentionPolicy] | RetentionPolicy): Policy per class, or one policy.
+            classifier (Callable[[Any], str] | None): Maps a file's newest version to its class.
+            checkpoint (Any): Optional store with get_state/set_state, e.g. SqliteCheckpoint.
+            page_size (int): The number of records per scan page.
+            batch_size (int): The number of objects or rows per bulk delete.
+            workers (int): The number of files evaluated concurrently.
+            clock (Callable[[], datetime]): The time source.
+
+        Returns:
+            None
+        """
+
+        if isinstance(policies, RetentionPolicy):
+            policies = {"default": policies}
+
+        self._repository = repository
+        self._storage = storage
+        self._policies = policies
+        self._classifier = classifier or (lambda version: "default")
+        self._checkpoint = checkpoint
+        self._page_size = page_size
+        self._batch_size = batch_size
+        self._workers = workers
+        self._clock = clock
+
+
+    def run(
+        self,
+        max_pages: int | None = None
+    ) -> RetentionStats:
+        """
+        Run a retention pass, resuming from the checkpointed cursor.
+
+        Args:
+            max_pages (int | None): Stop after this many pages, leaving the cursor for the next run.
+
+        Returns:
+            RetentionStats: Counters for the pass.
+        """
+
+        stats = RetentionStats()
+        token = self._load_cursor()
+        previous_id = None
+        now = self._clock()
+
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            while max_pages is None or stats.pages < max_pages:
+                page = self._repository.scan(limit=self._page_size, page_token=token)
+                stats.pages += 1
+
+                ids = []
+                for record in page.items:
+                    id = record.version.id
+                    # Ordered scans can split one file across pages; it was
+                    # already evaluated with its full history last page.
+                    if id != previous_id and (not ids or ids[-1] != id):
+                        ids.append(id)
+                if page.items:
+                    previous_id = page.items[-1].version.id
+
+                plans = pool.map(lambda id: self._plan(id, now), ids)
+                self._apply([plan for plan in plans if plan is not None], stats)
+
+                token = page.next_token
+                self._save_cursor(token)
+
+                if not token:
+                    break
+
+        return stats
+
+
+    def _plan(
+        self,
+        id: str,
+        now: datetime
+    ) -> Tuple[List[VersionRecord], int] | None:
+        """
+        Find the expired records of one file.
+
+        Args:
+            id (str): The ID of the file.
+            now (datetime): The reference time.
+
+        Returns:
+            Tuple[List[VersionRecord], int] | None: The expired records and the history size.
+        """
+
+        try:
+            records = self._repository.get_records(id)
+        except Exception as exc:
+            print(f"Error loading versions of {id}: {exc}")
+            return None
+
+        if not records:
+            return [], 0
+
+        policy = self._policies.get(
+            self._classifier(records[0].version),
+            self._policies.get("default"),
+        )
+        if policy is None:
+            return [], len(records)
+
+        expired = []
+        kept_paths = set()
+        for rank, record in enumerate(records):
+            if policy.expired(record, rank, now):
+                expired.append(record)
+            else:
+                kept_paths.add(record.storage_path)
+
+        # Only rows are removed when the blob is still referenced by a kept
+        # version or shared with other files in a pack; packs are reclaimed
+        # by PackCompactor once all their entries are gone.
+        return [
+            dataclasses.replace(record, storage_path=None)
+            if record.storage_path in kept_paths or is_packed(record) else record
+            for record in expired
+        ], len(records)
+
+
+    def _apply(
+        self,
+        plans: List[Tuple[List[VersionRecord], int]],
+        stats: RetentionStats
+    ) -> None:
+        """
+        Delete the blobs and rows of expired records in bulk.
+
+        Args:
+            plans (List[Tuple[List[VersionRecord], int]]): The per-file plans.
+            stats (RetentionStats): The counters to update.
+
+        Returns:
+            None
+        """
+
+        expired = [record for records, _ in plans for record in records]
+        stats.files += len(plans)
+        stats.versions += sum(size for _, size in plans)
+        stats.expired += len(expired)
+
+        for start in range(0, len(expired), self._batch_size):
+            chunk = expired[start:start + self._batch_size]
+            paths = list(dict.fromkeys(record.storage_path for record in chunk if record.storage_path))
+
+            try:
+                if paths:
+                    self._storage.delete_objects(paths)
+                    stats.objects_deleted += len(paths)
+
+                self._repository.purge([record.version for record in chunk])
+                stats.rows_deleted += len(chunk)
+            except Exception as exc:
+                stats.errors += 1
+                print(f"Error applying retention: {exc}")
+
+
+    def _load_cursor(self) -> Optional[str]:
+        if self._checkpoint is None:
+            return None
+        return self._checkpoint.get_state(CURSOR_KEY) or None
+
+
+    def _save_cursor(
+        self,
+        token: Optional[str]
+    ) -> None:
+        if self._checkpoint is not None:
+            self._checkpoint.set_state(CURSOR_KEY, token or "")
@@ -0,0 +1,531 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, TypeVar
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import (
+    DelegatingFileMetadataRepository,
+    DelegatingFileStorage,
+)
+from src.domain.repositories import FileMetadataRepository, FileStorage
+
+
+T = TypeVar("T")
+
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+
+ErrorClassifier = Callable[[BaseException], Optional[str]]
+
+# Repository writes that change state each time they run. A transient error
+# (a timeout, a dropped connection) may arrive after the write committed, so
+# these are only retried when the backend throttled them, which means it
+# rejected the request without running it. Saves are not listed: every
+# backend keys a version by its file ID and number, so a repeated save
+# overwrites the same record.
+NON_IDEMPOTENT_METHODS = frozenset({"allocate_version"})
+
+
+class RetriesExhaustedError(Exception):
+    """
+    Raised when a retryable backend error persists after every allowed retry.
+
+    The last backend error is chained as `__cause__`. FileService re-raises
+    it instead of returning None, so callers can tell an overloaded backend
+    from a missing file.
+    """
+
+
+def never_retry(exc: BaseException) -> Optional[str]:
+    """
+    Classifier that treats every error as permanent.
+    """
+    return None
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+    """
+
+    max_attempts: int = 8
+    base_delay: float = 0.05
+    max_delay: float = 20.0
+
+    def backoff(
+        self,
+        attempt: int
+    ) -> float:
+        """
+        Compute the delay before the given retry attempt.
+
+        Args:
+            attempt (int): The retry attempt number, starting at 1.
+
+        Returns:
+            float: The delay in seconds.
+        """
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a fraction of the request rate.
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so
+    retries can never amplify load by more than `1 + ratio`. A small
+    time-based allowance keeps low-traffic callers able to retry at all.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 10.0,
+        max_tokens: float = 1000.0
+    ):
+        """
+        Initialize the RetryBudget.
+
+        Args:
+            ratio (float): Retry tokens earned per request.
+            min_per_second (float): Retry tokens earned per second regardless of traffic.
+            max_tokens (float): Maximum number of banked tokens.
+
+        Returns:
+            None
+        """
+
+        self._ratio = ratio
+        self._min_per_second = min_per_second
+        self._max_tokens = max_tokens
+        self._tokens = min_per_second
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def record_request(self) -> None:
+        """
+        Deposit the per-request share of retry tokens.
+        """
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+
+    def try_spend(self) -> bool:
+        """
+        Withdraw one retry token if available.
+
+        Returns:
+            bool: True if the retry is allowed.
+        """
+
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self._max_tokens, self._tokens + elapsed * self._min_per_second)
+
+
+class RateLimiter:
+    """
+    Blocking token bucket that caps a call rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None
+    ):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            rate (float): The sustained number of calls per second.
+            burst (float | None): The bucket size, defaulting to one second of rate.
+
+        Returns:
+            None
+        """
+
+        self._rate = rate
+        self._burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def acquire(
+        self,
+        tokens: float = 1.0
+    ) -> None:
+        """
+        Block until the given number of tokens is available and take them.
+
+        Args:
+            tokens (float): The cost of the call.
+
+        Returns:
+            None
+        """
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                wait = (tokens - self._tokens) / self._rate
+
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for a single backend.
+
+    The limit grows by roughly one slot per window of successful calls and is
+    cut multiplicatively when the backend signals throttling, converging on
+    the highest concurrency the backend currently accepts.
+    """
+
+    def __init__(
+        self,
+        initial: int = 16,
+        minimum: int = 1,
+        maximum: int = 512,
+        decrease_factor: float = 0.7,
+        cooldown: float = 0.5
+    ):
+        """
+        Initialize the AdaptiveConcurrencyLimiter.
+
+        Args:
+            initial (int): The starting concurrency limit.
+            minimum (int): The lowest allowed limit.
+            maximum (int): The highest allowed limit.
+            decrease_factor (float): Multiplier applied to the limit on throttling.
+            cooldown (float): Minimum seconds between two decreases.
+
+        Returns:
+            None
+        """
+
+        self._limit = float(initial)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._decrease_factor = decrease_factor
+        self._cooldown = cooldown
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+
+    def acquire(self) -> None:
+        """
+        Block until a concurrency slot is free and take it.
+        """
+
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+
+    def release(
+        self,
+        throttled: bool = False
+    ) -> None:
+        """
+        Return a concurrency slot and adjust the limit.
+
+        Args:
+            throttled (bool): Whether the call was rejected by backend throttling.
+
+        Returns:
+            None
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+
+            if throttled:
+                now = time.monotonic()
+                # One decrease per cooldown: a burst of rejections caused by
+                # the same overload should not collapse the limit to minimum.
+                if now - self._last_decrease >= self._cooldown:
+                    self._limit = max(self._minimum, self._limit * self._decrease_factor)
+                    self._last_decrease = now
+            else:
+                self._limit = min(self._maximum, self._limit + 1.0 / self._limit)
+
+            self._condition.notify_all()
+
+
+class RetryController:
+    """
+    Shared retry and admission layer for one backend.
+
+    Calls are admitted through an adaptive concurrency limit, retried with
+    backoff when the classifier reports a throttling or transient error, and
+    stop retrying once the retry budget is exhausted. A retryable error that
+    outlasts the policy or the budget is raised as RetriesExhaustedError;
+    other errors are raised unchanged.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        classifier: ErrorClassifier = never_retry,
+        *,
+        policy: RetryPolicy | None = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        budget: RetryBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the RetryController.
+
+        Args:
+            name (str): The backend name, used in stats.
+            classifier (ErrorClassifier): Maps an exception to THROTTLED, TRANSIENT or None.
+            policy (RetryPolicy | None): The backoff policy.
+            limiter (AdaptiveConcurrencyLimiter | None): The concurrency limiter.
+            budget (RetryBudget | None): The retry budget.
+            sleep (Callable[[float], None]): The sleep function.
+
+        Returns:
+            None
+        """
+
+        self.name = name
+        self._classifier = classifier
+        self._policy = policy or RetryPolicy()
+        self._limiter = limiter or AdaptiveConcurrencyLimiter()
+        self._budget = budget or RetryBudget()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "throttled": 0,
+            "transient": 0,
+            "budget_exhausted": 0,
+            "failed": 0,
+        }
+
+
+    def call(
+        self,
+        fn: Callable[..., T],
+        *args,
+        **kwargs
+    ) -> T:
+        """
+        Call a backend function under admission control and retries.
+
+        Args:
+            fn (Callable[..., T]): The backend function.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            T: The result of the function.
+        """
+
+        return self._call(fn, args, kwargs, (THROTTLED, TRANSIENT))
+
+
+    def call_non_idempotent(
+        self,
+        fn: Callable[..., T],
+        *args,
+        **kwargs
+    ) -> T:
+        """
+        Call a backend write that must not run twice.
+
+        Only throttled calls are retried; transient errors are raised
+        unchanged because the write may already have been applied.
+
+        Args:
+            fn (Callable[..., T]): The backend function.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            T: The result of the function.
+        """
+
+        return self._call(fn, args, kwargs, (THROTTLED,))
+
+
+    def _call(
+        self,
+        fn: Callable[..., T],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        retryable: Tuple[str, ...]
+    ) -> T:
+        self._budget.record_request()
+        self._count("requests")
+        attempt = 0
+
+        while True:
+            self._limiter.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                kind = self._classifier(exc)
+                self._limiter.release(throttled=kind == THROTTLED)
+
+                if kind is None:
+                    raise
+
+                self._count(kind)
+                if kind not in retryable:
+                    raise
+
+                attempt += 1
+
+                if attempt >= self._policy.max_attempts:
+                    self._count("failed")
+                    raise RetriesExhaustedError(
+                        f"{self.name}: gave up after {attempt} attempts: {exc}"
+                    ) from exc
+
+                if not self._budget.try_spend():
+                    self._count("budget_exhausted")
+                    raise RetriesExhaustedError(
+                        f"{self.name}: retry budget exhausted: {exc}"
+                    ) from exc
+
+                self._count("retries")
+                self._sleep(self._policy.backoff(attempt))
+                continue
+
+            self._limiter.release()
+            return result
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counters and the current concurrency limit.
+
+        Returns:
+            Dict[str, Any]: The controller stats.
+        """
+
+        with self._lock:
+            data = dict(self._stats)
+        data["name"] = self.name
+        data["limit"] = self._limiter.limit
+        data["in_flight"] = self._limiter.in_flight
+        return data
+
+
+    def _count(
+        self,
+        key: str
+    ) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+
+class RetryingFileMetadataRepository(DelegatingFileMetadataRepository):
+    """
+    Repository wrapper that routes every call through a RetryController.
+
+    Methods listed as non-idempotent are only retried when throttled.
+    """
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository,
+        controller: RetryController,
+        *,
+        non_idempotent: FrozenSet[str] = NON_IDEMPOTENT_METHODS
+    ):
+        """
+        Initialize the RetryingFileMetadataRepository.
+
+        Args:
+            inner (FileMetadataRepository): The wrapped repository.
+            controller (RetryController): The retry controller for the metadata backend.
+            non_idempotent (FrozenSet[str]): Methods not retried after transient errors.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._controller = controller
+        self._non_idempotent = non_idempotent
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        if name in self._non_idempotent:
+            return self._controller.call_non_idempotent(getattr(self._inner, name), *args, **kwargs)
+        return self._controller.call(getattr(self._inner, name), *args, **kwargs)
+
+
+class RetryingFileStorage(DelegatingFileStorage):
+    """
+    Storage wrapper that routes every call through a RetryController.
+    """
+
+    def __init__(
+        self,
+        inner: FileStorage,
+        controller: RetryController
+    ):
+        """
+        Initialize the RetryingFileStorage.
+
+        Args:
+            inner (FileStorage): The wrapped storage.
+            controller (RetryController): The retry controller for the storage backend.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._controller = controller
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        return self._controller.call(getattr(self._inner, name), *args, **kwargs)
@@ -0,0 +1,543 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import dataclasses
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import DelegatingFileMetadataRepository
+from src.domain.entities import Page, VersionRecord
+from src.domain.repositories import FileMetadataRepository
+
+
+TVersion = TypeVar("TVersion")
+
+SHARD_SEPARATOR = "#s"
+POINTER_SUFFIX = "#shards"
+ACTIVE_FROM = "active_from"
+MAX_CACHED_LAYOUTS = 100000
+
+_SHARD_ID = re.compile(rf"^(.*){re.escape(SHARD_SEPARATOR)}(\d+)$")
+
+
+def shard_id(
+    id: str,
+    shard: int
+) -> str:
+    """
+    Get the physical ID holding one shard of a file's version rows.
+
+    Args:
+        id (str): The ID of the file.
+        shard (int): The shard number.
+
+    Returns:
+        str: The physical ID.
+    """
+
+    return f"{id}{SHARD_SEPARATOR}{shard}"
+
+
+def logical_id(id: str) -> str:
+    """
+    Get the file ID a physical ID belongs to.
+
+    Args:
+        id (str): A physical ID, sharded or not.
+
+    Returns:
+        str: The ID of the file.
+    """
+
+    match = _SHARD_ID.match(id)
+    return match.group(1) if match else id
+
+
+def is_pointer(id: str) -> bool:
+    return id.endswith(POINTER_SUFFIX)
+
+
+class ShardedFileMetadataRepository(DelegatingFileMetadataRepository):
+    """
+    Repository wrapper that spreads the version rows of hot files over several keys.
+
+    Once a file is sharded, version `v` is written under `{id}#s{v % shards}`
+    instead of `{id}`, so consecutive updates land on different DynamoDB
+    partitions or Firestore document ranges. Rows written before sharding
+    stay under the plain ID, and the first version of a file always does.
+    Reads fan out over the plain ID and every shard and merge the results,
+    so callers keep using the file ID.
+
+    The layout of a sharded file is a small pointer row `{id}#shards` whose
+    version number is the shard count. Layouts are cached for
+    `pointer_ttl` seconds, and the absence of a pointer for
+    `negative_ttl`, so a cold file costs one extra lookup per
+    `negative_ttl` rather than per read. A pointer only takes effect for
+    writes once both caches have expired everywhere, so every reader
+    covers a shard before the first row lands in it. Files can be sharded statically
+    (`shards`, which must match in every process), explicitly with
+    `shard`, or automatically when one file is written more than
+    `auto_threshold` times per second.
+
+    The version counter stays on the plain ID; it is one atomic increment
+    per update. Deactivating versions fans out over the shards and is not
+    atomic with a save on another shard, so writers must save a version
+    before deactivating the ones below it, as FileService does; reads
+    resolve any overlap to the highest active version. Scans return
+    sharded rows under the file ID, but the rows of one file may then span
+    several scan segments.
+    """
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository[TVersion],
+        *,
+        shards: Dict[str, int] | None = None,
+        default_shards: int = 8,
+        auto_threshold: float | None = None,
+        window: float = 60.0,
+        pointer_ttl: float = 5.0,
+        negative_ttl: float = 300.0,
+        workers: int = 16,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the ShardedFileMetadataRepository.
+
+        Args:
+            inner (FileMetadataRepository[TVersion]): The wrapped repository.
+            shards (Dict[str, int] | None): Files sharded from the start, with their shard counts.
+            default_shards (int): The shard count used by `shard` and automatic sharding.
+            auto_threshold (float | None): Shard a file written more often than this per second.
+            window (float): The number of seconds write rates are measured over.
+            pointer_ttl (float): How long layouts of sharded files are cached.
+            negative_ttl (float): How long a file is known to be unsharded; new layouts wait for it.
+            workers (int): The number of concurrent shard reads.
+            clock (Callable[[], float]): The wall clock, shared by all processes.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._static = dict(shards or {})
+        self._default_shards = default_shards
+        self._auto_threshold = auto_threshold
+        self._window = window
+        self._pointer_ttl = pointer_ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shard")
+        self._lock = threading.Lock()
+        self._layouts: Dict[str, Tuple[float, List[Tuple[int, float]]]] = {}
+        self._writes: Dict[str, int] = {}
+        self._window_start = clock()
+
+
+    def shard(
+        self,
+        id: str,
+        shards: int | None = None
+    ) -> None:
+        """
+        Shard a file, or raise its shard count.
+
+        Args:
+            id (str): The ID of the file.
+            shards (int | None): The shard count, `default_shards` if None.
+
+        Returns:
+            None
+        """
+
+        shards = shards or self._default_shards
+        if shards <= self._layout(id)[0]:
+            return
+
+        records = self.get_records(id)
+        if not records:
+            raise ValueError(f"Cannot shard unknown file: {id}")
+
+        pointer = dataclasses.replace(
+            records[0].version,
+            id=f"{id}{POINTER_SUFFIX}",
+            version=shards,
+            status="INACTIVE",
+        )
+        self._inner.save(
+            version=pointer,
+            path="",
+            attributes={ACTIVE_FROM: self._clock() + max(self._pointer_ttl, self._negative_ttl)},
+        )
+
+        with self._lock:
+            self._layouts.pop(id, None)
+
+
+    def shards(
+        self,
+        id: str
+    ) -> int:
+        """
+        Get the number of shards reads of a file cover.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            int: The shard count, 0 if the file is not sharded.
+        """
+
+        return self._layout(id)[0]
+
+
+    def close(self) -> None:
+        """
+        Release the worker threads.
+        """
+
+        self._pool.shutdown(wait=True)
+
+
+    def get_active(self, id: str) -> Optional[TVersion]:
+        physical = self._physical(id)
+        if len(physical) == 1:
+            return self._inner.get_active(id)
+
+        found = [version for version in self._fan("get_active", physical) if version is not None]
+        return self._rename(max(found, key=lambda version: version.version), id) if found else None
+
+
+    def get_versions(self, id: str) -> List[TVersion]:
+        physical = self._physical(id)
+        if len(physical) == 1:
+            return self._inner.get_versions(id)
+
+        merged = [version for versions in self._fan("get_versions", physical) for version in versions]
+        merged.sort(key=lambda version: version.version, reverse=True)
+        return [self._rename(version, id) for version in merged]
+
+
+    def save(self, version: TVersion, path: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self._record_write(version.id)
+        return self._inner.save(version=self._placed(version), path=path, attributes=attributes)
+
+
+    def save_many(self, items: Iterable[Tuple]) -> None:
+        items = list(items)
+        for id in dict.fromkeys(item[0].id for item in items):
+            self._record_write(id)
+        return self._inner.save_many([(self._placed(item[0]), *item[1:]) for item in items])
+
+
+    def deactivate_versions(self, id: str, below: Optional[int] = None) -> None:
+        self._fan("deactivate_versions", self._physical(id), below)
+
+
+    def delete_versions(self, id: str) -> None:
+        self._fan("delete_versions", self._physical(id))
+
+
+    def find(
+        self,
+        filters: Dict[str, Any],
+        *,
+        active_only: bool = True,
+        limit: int = 100,
+        page_token: Optional[str] = None
+    ) -> Page[TVersion]:
+        page = self._inner.find(filters, active_only=active_only, limit=limit, page_token=page_token)
+        return Page(
+            items=[
+                self._rename(version, logical_id(version.id))
+                for version in page.items if not is_pointer(version.id)
+            ],
+            next_token=page.next_token,
+        )
+
+
+    def get_record(self, id: str, version: Optional[int] = None) -> Optional[VersionRecord[TVersion]]:
+        physical = self._physical(id)
+        if len(physical) == 1:
+            return self._inner.get_record(id, version)
+
+        found = [record for record in self._fan("get_record", physical, version) if record is not None]
+        if not found:
+            return None
+        return self._rename_record(max(found, key=lambda record: record.version.version), id)
+
+
+    def get_records(self, id: str) -> List[VersionRecord[TVersion]]:
+        physical = self._physical(id)
+        if len(physical) == 1:
+            return self._inner.get_records(id)
+
+        merged = [record for records in self._fan("get_records", physical) for record in records]
+        merged.sort(key=lambda record: record.version.version, reverse=True)
+        return [self._rename_record(record, id) for record in merged]
+
+
+    def get_as_of(self, id: str, timestamp: datetime) -> Optional[TVersion]:
+        physical = self._physical(id)
+        if len(physical) == 1:
+            return self._inner.get_as_of(id, timestamp)
+
+        found = [version for version in self._fan("get_as_of", physical, timestamp) if version is not None]
+        return self._rename(max(found, key=lambda version: version.version), id) if found else None
+
+
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None
+    ) -> Page[VersionRecord[TVersion]]:
+        if isinstance(selection, str):
+            # Shard rows sort right after their file's own rows, and only one
+            # of them can be active at a given time.
+            page = self._inner.snapshot(selection, timestamp, limit=limit, page_token=page_token)
+            return Page(items=self._merge(page.items), next_token=page.next_token)
+
+        ids = list(selection)
+        offset = json.loads(page_token) if page_token else 0
+        chunk = ids[offset:offset + limit]
+        physical = [pid for id in chunk for pid in self._physical(id)]
+
+        records: List[VersionRecord[TVersion]] = []
+        token = None
+        while True:
+            page = self._inner.snapshot(physical, timestamp, limit=len(physical) or 1, page_token=token)
+            records.extend(page.items)
+            token = page.next_token
+            if not token:
+                break
+
+        by_id = {record.version.id: record for record in self._merge(records)}
+        return Page(
+            items=[by_id[id] for id in dict.fromkeys(chunk) if id in by_id],
+            next_token=json.dumps(offset + limit) if offset + limit < len(ids) else None,
+        )
+
+
+    def scan(
+        self,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None,
+        segment: int = 0,
+        total_segments: int = 1
+    ) -> Page[VersionRecord[TVersion]]:
+        page = self._inner.scan(
+            limit=limit,
+            page_token=page_token,
+            segment=segment,
+            total_segments=total_segments,
+        )
+        return Page(
+            items=[
+                self._rename_record(record, logical_id(record.version.id))
+                for record in page.items if not is_pointer(record.version.id)
+            ],
+            next_token=page.next_token,
+        )
+
+
+    def update_location(
+        self,
+        id: str,
+        version: int,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        return self._inner.update_location(self._holder(id, version), version, path, attributes)
+
+
+    def purge(self, versions: List[TVersion]) -> None:
+        return self._inner.purge([
+            self._rename(version, self._holder(version.id, version.version))
+            for version in versions
+        ])
+
+
+    def _layout(
+        self,
+        id: str
+    ) -> Tuple[int, int]:
+        """
+        Get the shard counts of a file.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            Tuple[int, int]: The shards reads must cover and the shards writes use now.
+        """
+
+        if id in self._static:
+            return self._static[id], self._static[id]
+
+        now = self._clock()
+        with self._lock:
+            cached = self._layouts.get(id)
+
+        if cached is None or cached[0] <= now:
+            pointers = [
+                (record.version.version, float(record.attributes.get(ACTIVE_FROM, 0.0)))
+                for record in self._inner.get_records(f"{id}{POINTER_SUFFIX}")
+            ]
+            ttl = self._pointer_ttl if pointers else self._negative_ttl
+            with self._lock:
+                if len(self._layouts) >= MAX_CACHED_LAYOUTS:
+                    self._layouts = {key: value for key, value in self._layouts.items() if value[0] > now}
+                # Dropping entries early only costs extra lookups.
+                if len(self._layouts) >= MAX_CACHED_LAYOUTS:
+                    self._layouts.clear()
+                self._layouts[id] = (now + ttl, pointers)
+        else:
+            pointers = cached[1]
+
+        read = max((count for count, _ in pointers), default=0)
+        write = max((count for count, active_from in pointers if active_from <= now), default=0)
+        return read, write
+
+
+    def _physical(
+        self,
+        id: str
+    ) -> List[str]:
+        return [id] + [shard_id(id, shard) for shard in range(self._layout(id)[0])]
+
+
+    def _placed(
+        self,
+        version: TVersion
+    ) -> TVersion:
+        shards = self._layout(version.id)[1]
+        if not shards or version.version <= 1:
+            return version
+        return self._rename(version, shard_id(version.id, version.version % shards))
+
+
+    def _holder(
+        self,
+        id: str,
+        version: int
+    ) -> str:
+        """
+        Find the physical ID holding one version of a file.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+
+        Returns:
+            str: The physical ID, or the file ID if no row was found.
+        """
+
+        physical = self._physical(id)
+        if len(physical) == 1:
+            return id
+
+        for pid, record in zip(physical, self._fan("get_record", physical, version)):
+            if record is not None:
+                return pid
+        return id
+
+
+    def _fan(
+        self,
+        name: str,
+        ids: List[str],
+        *args
+    ) -> List[Any]:
+        """
+        Call one inner method for several physical IDs in parallel.
+
+        Args:
+            name (str): The repository method.
+            ids (List[str]): The physical IDs.
+            *args: Arguments passed after the ID.
+
+        Returns:
+            List[Any]: The results, in the order of `ids`.
+        """
+
+        method = getattr(self._inner, name)
+        if len(ids) == 1:
+            return [method(ids[0], *args)]
+        return list(self._pool.map(lambda pid: method(pid, *args), ids))
+
+
+    def _merge(
+        self,
+        records: List[VersionRecord[TVersion]]
+    ) -> List[VersionRecord[TVersion]]:
+        """
+        Collapse records of the same file into its newest one, keeping order.
+
+        Args:
+            records (List[VersionRecord[TVersion]]): Records under physical IDs.
+
+        Returns:
+            List[VersionRecord[TVersion]]: One record per file, under the file ID.
+        """
+
+        merged: Dict[str, VersionRecord[TVersion]] = {}
+        for record in records:
+            if is_pointer(record.version.id):
+                continue
+            id = logical_id(record.version.id)
+            if id not in merged or record.version.version > merged[id].version.version:
+                merged[id] = self._rename_record(record, id)
+        return list(merged.values())
+
+
+    def _record_write(
+        self,
+        id: str
+    ) -> None:
+        if self._auto_threshold is None or id in self._static:
+            return
+
+        now = self._clock()
+        with self._lock:
+            if now - self._window_start >= self._window:
+                self._writes.clear()
+                self._window_start = now
+            count = self._writes.get(id, 0) + 1
+            self._writes[id] = count
+
+        # Only the write that crosses the threshold tries to shard the file.
+        if count == int(self._auto_threshold * self._window) + 1 and not self._layout(id)[0]:
+            try:
+                self.shard(id)
+            except Exception as exc:
+                print(f"Error sharding {id}: {exc}")
+
+
+    @staticmethod
+    def _rename(
+        version: TVersion,
+        id: str
+    ) -> TVersion:
+        return version if version.id == id else dataclasses.replace(version, id=id)
+
+
+    def _rename_record(
+        self,
+        record: VersionRecord[TVersion],
+        id: str
+    ) -> VersionRecord[TVersion]:
+        if record.version.id == id:
+            return record
+        return dataclasses.replace(record, version=self._rename(record.version, id))
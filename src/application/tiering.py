@@ -0,0 +1,282 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.packing import is_packed
+from src.application.retention import age_of
+from src.application.retry import RateLimiter
+from src.domain.entities import VersionRecord
+from src.domain.repositories import FileMetadataRepository, FileStorage
+from src.domain.tiers import TIER_ATTRIBUTE, TIERS, colder
+
+
+CURSOR_KEY = "tiering.cursor"
+
+
+@dataclass(slots=True)
+class TierRule:
+    """
+    Moves versions to `tier` once they are `min_age` old.
+
+    Inactive versions are aged from when they were superseded, active ones
+    from their creation. Only inactive versions are moved unless
+    `include_active` is set.
+    """
+
+    tier: str
+    min_age: timedelta
+    include_active: bool = False
+
+
+@dataclass(slots=True)
+class TieringStats:
+    pages: int = 0
+    files: int = 0
+    transitioned: int = 0
+    records_updated: int = 0
+    errors: int = 0
+
+
+class TieringJob:
+    """
+    Moves old versions to colder storage classes in bounded, resumable passes.
+
+    Metadata is scanned page by page like RetentionEngine does. For each
+    file the coldest matching rule is chosen per blob; a blob shared by
+    several versions (metadata-only updates) only moves as far as its
+    warmest version allows. Transitions run on a worker pool under a rate
+    limit, and the new tier is recorded on every record of the blob so the
+    read path knows what latency to expect. Packed versions are skipped
+    because their pack is shared with other files.
+    """
+
+    def __init__(
+        self,
+        repository: FileMetadataRepository,
+        storage: FileStorage,
+        rules: Sequence[TierRule],
+        *,
+        checkpoint: Any = None,
+        page_size: int = 1000,
+        workers: int = 8,
+        rate: float = 50.0,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        """
+        Initialize the TieringJob.
+
+        Args:
+            repository (FileMetadataRepository): The metadata repository.
+            storage (FileStorage): The storage holding version blobs.
+            rules (Sequence[TierRule]): The tier rules.
+            checkpoint (Any): Optional store with get_state/set_state, e.g. SqliteCheckpoint.
+            page_size (int): The number of records per scan page.
+            workers (int): The number of concurrent transitions.
+            rate (float): The maximum number of transitions per second.
+            clock (Callable[[], datetime]): The time source.
+
+        Returns:
+            None
+        """
+
+        for rule in rules:
+            if rule.tier not in TIERS:
+                raise ValueError(f"Unknown tier: {rule.tier}")
+
+        self._repository = repository
+        self._storage = storage
+        self._rules = sorted(rules, key=lambda rule: TIERS.index(rule.tier), reverse=True)
+        self._checkpoint = checkpoint
+        self._page_size = page_size
+        self._workers = workers
+        self._limiter = RateLimiter(rate)
+        self._clock = clock
+
+
+    def run(
+        self,
+        max_pages: int | None = None
+    ) -> TieringStats:
+        """
+        Run a tiering pass, resuming from the checkpointed cursor.
+
+        Args:
+            max_pages (int | None): Stop after this many pages, leaving the cursor for the next run.
+
+        Returns:
+            TieringStats: Counters for the pass.
+        """
+
+        stats = TieringStats()
+        token = self._load_cursor()
+        previous_id = None
+        now = self._clock()
+
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            while max_pages is None or stats.pages < max_pages:
+                page = self._repository.scan(limit=self._page_size, page_token=token)
+                stats.pages += 1
+
+                ids = []
+                for record in page.items:
+                    id = record.version.id
+                    if id != previous_id and (not ids or ids[-1] != id):
+                        ids.append(id)
+                if page.items:
+                    previous_id = page.items[-1].version.id
+
+                stats.files += len(ids)
+                moves = []
+                for plan in pool.map(lambda id: self._plan(id, now), ids):
+                    if plan is None:
+                        stats.errors += 1
+                    else:
+                        moves.extend(plan)
+
+                for moved in pool.map(lambda move: self._move(*move), moves):
+                    if moved:
+                        stats.transitioned += 1
+                        stats.records_updated += moved
+                    else:
+                        stats.errors += 1
+
+                token = page.next_token
+                self._save_cursor(token)
+
+                if not token:
+                    break
+
+        return stats
+
+
+    def _target(
+        self,
+        record: VersionRecord,
+        now: datetime
+    ) -> Optional[str]:
+        """
+        Choose the coldest tier a record is eligible for.
+
+        Args:
+            record (VersionRecord): The version record.
+            now (datetime): The reference time.
+
+        Returns:
+            Optional[str]: The tier, or None if the record stays where it is.
+        """
+
+        status = getattr(record.version, "status", "ACTIVE")
+        if status == "DELETED":
+            return None
+
+        created_at = getattr(record.version, "created_at", None)
+        since = created_at if status == "ACTIVE" else record.deactivated_at or created_at
+        age = age_of(since, now)
+        if age is None:
+            return None
+
+        for rule in self._rules:
+            if status == "ACTIVE" and not rule.include_active:
+                continue
+            if age >= rule.min_age:
+                return rule.tier
+
+        return None
+
+
+    def _plan(
+        self,
+        id: str,
+        now: datetime
+    ) -> List[Tuple[str, str, List[VersionRecord]]] | None:
+        """
+        Find the blobs of one file that should move to a colder tier.
+
+        Args:
+            id (str): The ID of the file.
+            now (datetime): The reference time.
+
+        Returns:
+            List[Tuple[str, str, List[VersionRecord]]] | None: (path, tier, records) per blob
+                to move, or None if the file could not be loaded.
+        """
+
+        try:
+            records = self._repository.get_records(id)
+        except Exception as exc:
+            print(f"Error loading versions of {id}: {exc}")
+            return None
+
+        by_path: Dict[str, List[VersionRecord]] = {}
+        for record in records:
+            if record.storage_path and not is_packed(record):
+                by_path.setdefault(record.storage_path, []).append(record)
+
+        moves = []
+        for path, shared in by_path.items():
+            targets = [self._target(record, now) for record in shared]
+            if None in targets:
+                continue
+
+            tier = min(targets, key=TIERS.index)
+            if colder(tier, shared[0].attributes.get(TIER_ATTRIBUTE)):
+                moves.append((path, tier, shared))
+
+        return moves
+
+
+    def _move(
+        self,
+        path: str,
+        tier: str,
+        records: List[VersionRecord]
+    ) -> int:
+        """
+        Transition one blob and record its new tier.
+
+        Args:
+            path (str): The storage path.
+            tier (str): The target tier.
+            records (List[VersionRecord]): The records pointing at the blob.
+
+        Returns:
+            int: The number of records updated, 0 if the move failed.
+        """
+
+        self._limiter.acquire()
+
+        try:
+            self._storage.transition(path, tier)
+            for record in records:
+                self._repository.update_location(
+                    record.version.id,
+                    record.version.version,
+                    path,
+                    {**record.attributes, TIER_ATTRIBUTE: tier},
+                )
+        except Exception as exc:
+            print(f"Error moving {path} to {tier}: {exc}")
+            return 0
+
+        return len(records)
+
+
+    def _load_cursor(self) -> Optional[str]:
+        if self._checkpoint is None:
+            return None
+        return self._checkpoint.get_state(CURSOR_KEY) or None
+
+
+    def _save_cursor(
+        self,
+        token: Optional[str]
+    ) -> None:
+        if self._checkpoint is not None:
+            self._checkpoint.set_state(CURSOR_KEY, token or "")
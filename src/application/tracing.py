@@ -0,0 +1,497 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.delegates import DelegatingFileMetadataRepository, DelegatingFileStorage
+from src.domain.repositories import FileMetadataRepository, FileStorage
+
+
+_current: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+
+
+@dataclass(slots=True)
+class Step:
+    call: str
+    seconds: float
+    items: int | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class Trace:
+    """
+    Timings of one operation and of the backend calls made on its behalf.
+    """
+
+    operation: str
+    id: str | None = None
+    size: int = 0
+    started: float = field(default_factory=time.monotonic)
+    round_trips: int = 0
+    steps: List[Step] = field(default_factory=list)
+    totals: Dict[str, List[float]] = field(default_factory=dict)
+
+
+def current_trace() -> Optional[Trace]:
+    """
+    Get the trace of the operation running in this context, if any.
+
+    Returns:
+        Optional[Trace]: The trace, or None outside a traced operation.
+    """
+
+    return _current.get()
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of threads running sampled operations.
+
+    A sampler thread wakes every `interval` seconds while at least one
+    sampled operation is running and counts the stack of each of their
+    threads. Stacks are written in the folded format ("a;b;c count") read
+    by flamegraph.pl, speedscope and inferno. Nothing runs between sampled
+    operations.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.01,
+        *,
+        interval: float = 0.005,
+        path: str = "profile.folded"
+    ):
+        """
+        Initialize the SamplingProfiler.
+
+        Args:
+            rate (float): The fraction of operations that are sampled.
+            interval (float): Seconds between stack samples.
+            path (str): The folded-stack output file.
+
+        Returns:
+            None
+        """
+
+        self._rate = rate
+        self._interval = interval
+        self._path = path
+        self._lock = threading.Lock()
+        self._threads: Dict[int, str] = {}
+        self._stacks: Counter = Counter()
+        self._wake = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+
+    def should_sample(self) -> bool:
+        return random.random() < self._rate
+
+
+    @contextlib.contextmanager
+    def sampling(
+        self,
+        operation: str
+    ) -> Iterator[None]:
+        """
+        Sample the current thread while the block runs.
+
+        Args:
+            operation (str): The operation name, used as the root frame.
+
+        Returns:
+            Iterator[None]: The sampling context.
+        """
+
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = operation
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._sampler.start()
+        self._wake.set()
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads.pop(ident, None)
+                if not self._threads:
+                    self._wake.clear()
+
+
+    def dump(self) -> int:
+        """
+        Write the collected stacks, replacing the output file.
+
+        Returns:
+            int: The number of distinct stacks written.
+        """
+
+        with self._lock:
+            stacks = dict(self._stacks)
+
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            for stack, count in sorted(stacks.items()):
+                file.write(f"{stack} {count}\n")
+        os.replace(tmp, self._path)
+        return len(stacks)
+
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            time.sleep(self._interval)
+
+            with self._lock:
+                threads = dict(self._threads)
+            frames = sys._current_frames()
+
+            samples = []
+            for ident, operation in threads.items():
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                samples.append(";".join([operation, *reversed(names)]))
+
+            with self._lock:
+                self._stacks.update(samples)
+
+
+class Tracer:
+    """
+    Times operations and logs the ones slower than a threshold.
+
+    An operation opens a trace in a context variable; tracing repository
+    and storage wrappers add one step per backend call to it, so a slow
+    record shows the file ID, payload size, round trips and which calls
+    took the time. Calls made from other threads (worker pools inside
+    replication or sharding wrappers) are not attributed to the trace.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.5,
+        path: str | None = None,
+        profiler: SamplingProfiler | None = None,
+        max_steps: int = 50,
+        keep: int = 100
+    ):
+        """
+        Initialize the Tracer.
+
+        Args:
+            threshold (float): Operations taking at least this many seconds are logged.
+            path (str | None): Append slow records to this JSONL file instead of printing them.
+            profiler (SamplingProfiler | None): Samples stacks of a fraction of operations.
+            max_steps (int): The number of individual steps kept per record; totals cover all.
+            keep (int): The number of recent slow records kept in memory.
+
+        Returns:
+            None
+        """
+
+        self._threshold = threshold
+        self._path = path
+        self._profiler = profiler
+        self._max_steps = max_steps
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=keep)
+        self.operations = 0
+        self.slow = 0
+
+
+    @contextlib.contextmanager
+    def operation(
+        self,
+        name: str,
+        id: str | None = None,
+        size: int = 0
+    ) -> Iterator[Trace]:
+        """
+        Trace an operation. Nested operations join the outer trace.
+
+        Args:
+            name (str): The operation name.
+            id (str | None): The ID of the file.
+            size (int): The payload size in bytes.
+
+        Returns:
+            Iterator[Trace]: The trace of the operation.
+        """
+
+        outer = _current.get()
+        if outer is not None:
+            yield outer
+            return
+
+        trace = Trace(operation=name, id=id, size=size)
+        token = _current.set(trace)
+        sampled = self._profiler is not None and self._profiler.should_sample()
+
+        try:
+            if sampled:
+                with self._profiler.sampling(name):
+                    yield trace
+            else:
+                yield trace
+        finally:
+            _current.reset(token)
+            self._finish(trace)
+
+
+    def record(
+        self,
+        call: str,
+        seconds: float,
+        result: Any = None,
+        error: BaseException | None = None
+    ) -> None:
+        """
+        Add a backend call to the current trace, if there is one.
+
+        Args:
+            call (str): The call name, e.g. "repository.get_records".
+            seconds (float): The duration of the call.
+            result (Any): The result, whose length is recorded for lists.
+            error (BaseException | None): The error the call raised.
+
+        Returns:
+            None
+        """
+
+        trace = _current.get()
+        if trace is None:
+            return
+
+        trace.round_trips += 1
+        total = trace.totals.setdefault(call, [0, 0.0])
+        total[0] += 1
+        total[1] += seconds
+
+        if len(trace.steps) < self._max_steps:
+            trace.steps.append(Step(
+                call=call,
+                seconds=seconds,
+                items=len(result) if isinstance(result, (list, tuple)) else None,
+                error=type(error).__name__ if error is not None else None,
+            ))
+
+
+    def slow_operations(self) -> List[Dict[str, Any]]:
+        """
+        Get the most recent slow records.
+
+        Returns:
+            List[Dict[str, Any]]: The records, oldest first.
+        """
+
+        with self._lock:
+            return list(self._recent)
+
+
+    def _finish(
+        self,
+        trace: Trace
+    ) -> None:
+        elapsed = time.monotonic() - trace.started
+        with self._lock:
+            self.operations += 1
+        if elapsed < self._threshold:
+            return
+
+        record = {
+            "at": datetime.now().isoformat(),
+            "operation": trace.operation,
+            "id": trace.id,
+            "size": trace.size,
+            "ms": round(elapsed * 1000, 3),
+            "round_trips": trace.round_trips,
+            "calls": {
+                call: {"count": count, "ms": round(seconds * 1000, 3)}
+                for call, (count, seconds) in trace.totals.items()
+            },
+            "steps": [
+                {
+                    "call": step.call,
+                    "ms": round(step.seconds * 1000, 3),
+                    **({"items": step.items} if step.items is not None else {}),
+                    **({"error": step.error} if step.error else {}),
+                }
+                for step in trace.steps
+            ],
+        }
+        line = json.dumps(record)
+
+        with self._lock:
+            self.slow += 1
+            self._recent.append(record)
+            if self._path:
+                with open(self._path, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+            else:
+                print(f"Slow operation: {line}")
+
+
+def traced(name: str) -> Callable:
+    """
+    Trace a FileService method when the service has a tracer.
+
+    The file ID is taken from an `id` or `version` argument and the payload
+    size from `content`, `size` or `source_path`. Without a tracer the
+    method is called directly.
+
+    Args:
+        name (str): The operation name.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = self._tracer
+            if tracer is None:
+                return method(self, *args, **kwargs)
+
+            version = kwargs.get("version")
+            id = kwargs.get("id") or getattr(version, "id", None)
+            if id is None and args:
+                id = args[0] if isinstance(args[0], str) else getattr(args[0], "id", None)
+            content = kwargs.get("content")
+            if content is not None:
+                size = len(content)
+            elif kwargs.get("source_path"):
+                size = os.path.getsize(kwargs["source_path"])
+            else:
+                size = kwargs.get("size") or 0
+
+            with tracer.operation(name, id=id, size=size):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _timed(
+    tracer: Tracer,
+    prefix: str,
+    invoke: Callable,
+    name: str,
+    args: tuple,
+    kwargs: Dict[str, Any]
+) -> Any:
+    """
+    Run one backend call and record it, as its own operation outside a trace.
+
+    Args:
+        tracer (Tracer): The tracer.
+        prefix (str): "repository" or "storage".
+        invoke (Callable): The inner `_invoke`.
+        name (str): The method name.
+        args (tuple): Positional arguments.
+        kwargs (Dict[str, Any]): Keyword arguments.
+
+    Returns:
+        Any: The result of the call.
+    """
+
+    if _current.get() is None:
+        first = args[0] if args else None
+        with tracer.operation(f"{prefix}.{name}", id=first if isinstance(first, str) else None):
+            return _timed(tracer, prefix, invoke, name, args, kwargs)
+
+    started = time.monotonic()
+    try:
+        result = invoke(name, *args, **kwargs)
+    except BaseException as exc:
+        tracer.record(f"{prefix}.{name}", time.monotonic() - started, error=exc)
+        raise
+    tracer.record(f"{prefix}.{name}", time.monotonic() - started, result)
+    return result
+
+
+class TracingFileMetadataRepository(DelegatingFileMetadataRepository):
+    """
+    Repository wrapper that records every call in the current trace.
+
+    Calls made outside a traced operation are traced on their own, so the
+    wrapper also works as a slow-call log for a bare repository.
+    """
+
+    def __init__(
+        self,
+        inner: FileMetadataRepository,
+        tracer: Tracer
+    ):
+        """
+        Initialize the TracingFileMetadataRepository.
+
+        Args:
+            inner (FileMetadataRepository): The wrapped repository.
+            tracer (Tracer): The tracer.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._tracer = tracer
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        return _timed(self._tracer, "repository", super()._invoke, name, args, kwargs)
+
+
+class TracingFileStorage(DelegatingFileStorage):
+    """
+    Storage wrapper that records every call in the current trace.
+    """
+
+    def __init__(
+        self,
+        inner: FileStorage,
+        tracer: Tracer
+    ):
+        """
+        Initialize the TracingFileStorage.
+
+        Args:
+            inner (FileStorage): The wrapped storage.
+            tracer (Tracer): The tracer.
+
+        Returns:
+            None
+        """
+
+        super().__init__(inner)
+        self._tracer = tracer
+
+
+    def _invoke(self, name: str, *args, **kwargs) -> Any:
+        return _timed(self._tracer, "storage", super()._invoke, name, args, kwargs)
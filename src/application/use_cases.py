@@ -1,14 +1,65 @@
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+import base64
+import contextlib
 import dataclasses
-from typing import Generic, TypeVar
-from src.domain.repositories import FileMetadataRepository, FileStorage
+import gzip
+import hashlib
+import mmap
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generic, Iterator, List, Sequence, TypeVar
+from src.domain.entities import Page, SignedRequest, UploadSession, VersionRecord
+from src.domain.repositories import FileMetadataRepository, FileStorage, ReclaimQueue
+from src.application.paths import PathStrategy, PlainPathStrategy
+from src.application.events import EventEmitter
+from src.application.packing import PackWriter, is_packed, read_packed
+from src.application.retry import RetriesExhaustedError
+from src.application.tracing import Tracer, TracingFileMetadataRepository, TracingFileStorage, traced
+from src.domain.checksums import CHECKSUM_KEYS, Checksums, checksum_attributes, compute_checksums
+from src.domain.events import FILE_CREATED, FILE_DELETED, FILE_UPDATED
+from src.domain.tiers import ARCHIVE, EXPECTED_LATENCY, HOT, TIER_ATTRIBUTE
 
 
 TVersion = TypeVar("TVersion")
 
 
+@contextlib.contextmanager
+def _mapped_file(path: str) -> Iterator[memoryview]:
+    """
+    Map a file read-only and expose it as a memoryview.
+
+    Slices of the view share the page cache instead of copying the file
+    into the heap, so a large file is never held twice in memory.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        Iterator[memoryview]: The content of the file.
+    """
+
+    with open(path, "rb") as file:
+        # mmap rejects empty files.
+        if not file.seek(0, 2):
+            yield memoryview(b"")
+            return
+
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # A slice is still referenced somewhere (e.g. an SDK retry
+                # buffer); the mapping is unmapped when it is collected.
+                pass
+
+
 class FileService(Generic[TVersion]):
     """
     Service for managing file versions.
@@ -20,6 +71,11 @@ class FileService(Generic[TVersion]):
         storage: FileStorage,
         *,
         base_path: str | None = None,
+        path_strategy: PathStrategy | None = None,
+        events: EventEmitter | None = None,
+        reclaim_queue: ReclaimQueue | None = None,
+        packer: PackWriter | None = None,
+        tracer: Tracer | None = None,
     ):
         """
         Initialize the FileService.
@@ -28,6 +84,11 @@ class FileService(Generic[TVersion]):
             repository (FileMetadataRepository[TVersion]): The file metadata repository.
             storage (FileStorage): The file storage.
             base_path (str | None): The base path for file storage.
+            path_strategy (PathStrategy | None): How file ids map to storage keys.
+            events (EventEmitter | None): Receives create/update/delete change events.
+            reclaim_queue (ReclaimQueue | None): When set, physical deletes are deferred to this queue.
+            packer (PackWriter | None): When set, small files are stored inside shared pack objects.
+            tracer (Tracer | None): When set, operations are timed and slow ones logged with their backend calls.
 
         Returns:
             None
@@ -36,6 +97,20 @@ class FileService(Generic[TVersion]):
         self._repository = repository
         self._storage = storage
         self._base_path = base_path.strip("/") if base_path else None
+        self._path_strategy = path_strategy or PlainPathStrategy()
+        self._events = events
+        self._reclaim_queue = reclaim_queue
+        self._packer = packer
+        self._tracer = tracer
+
+        if tracer is not None:
+            self._repository = TracingFileMetadataRepository(repository, tracer)
+            self._storage = TracingFileStorage(storage, tracer)
+
+
+    @property
+    def repository(self) -> FileMetadataRepository[TVersion]:
+        return self._repository
 
     # ------------------------------------------------------------------
     # Path handling (generic)
@@ -61,9 +136,7 @@ class FileService(Generic[TVersion]):
             parts = []
             if self._base_path:
                 parts.append(self._base_path)
-            parts.append(id)
-            if str(version):
-                parts.append(f"v{version}")
+            parts.append(self._path_strategy.build(id, version))
             return "/".join(parts)
         except Exception as exc:
             print(f"Error building path: {exc}")
@@ -97,13 +170,15 @@ class FileService(Generic[TVersion]):
     # Use cases
     # ------------------------------------------------------------------
 
+    @traced("create")
     def create(
         self,
         *,
         content: bytes,
         content_type: str,
         version: TVersion,
-    ) -> None:
+        checksums: Checksums | None = None,
+    ) -> TVersion | None:
         """
         Create a new file version.
 
@@ -111,22 +186,65 @@ class FileService(Generic[TVersion]):
             content (bytes): The content of the file.
             content_type (str): The MIME type of the file.
             version (TVersion): The version metadata.
+            checksums (Checksums | None): Checksums of the content, computed here if omitted.
 
         Returns:
-            None
+            TVersion | None: The saved version, or None if the file could not be created.
         """
 
         try:
-            self._validate(version)
+            return self._create(version, content, content_type, checksums)
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error creating file: {exc}")
+
+
+    @traced("create_from_path")
+    def create_from_path(
+        self,
+        *,
+        source_path: str,
+        content_type: str,
+        version: TVersion,
+        part_size: int | None = None,
+        concurrency: int = 8,
+    ) -> TVersion | None:
+        """
+        Create a new file version from a local file without reading it into memory.
+
+        The file is memory-mapped; checksums are computed over the mapping and
+        the storage uploads slices of it as parallel parts (S3 multipart, GCS
+        composed objects). Files small enough for the packer are packed as
+        usual.
+
+        Args:
+            source_path (str): The local file to upload.
+            content_type (str): The MIME type of the file.
+            version (TVersion): The version metadata.
+            part_size (int | None): The size of each uploaded part, a backend default if None.
+            concurrency (int): The number of parts uploaded at once.
 
-            path = self._build_path(version.id, version.version)
+        Returns:
+            TVersion | None: The saved version, or None if the file could not be created.
+        """
 
-            self._storage.upload(path, content, content_type)
-            self._repository.save(version=version, path=path)
+        try:
+            with _mapped_file(source_path) as content:
+                return self._create(
+                    version,
+                    content,
+                    content_type,
+                    None,
+                    multipart=(part_size, concurrency),
+                )
+        except RetriesExhaustedError:
+            raise
         except Exception as exc:
             print(f"Error creating file: {exc}")
 
 
+    @traced("get_active")
     def get_active(
         self,
         id: str
@@ -143,54 +261,481 @@ class FileService(Generic[TVersion]):
 
         try:
             return self._repository.get_active(id)
+        except RetriesExhaustedError:
+            raise
         except Exception as exc:
             print(f"Error getting active version: {exc}")
 
 
+    @traced("get_as_of")
+    def get_as_of(
+        self,
+        id: str,
+        timestamp: datetime
+    ) -> TVersion | None:
+        """
+        Get the version of a file that was active at a point in time.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+
+        Returns:
+            TVersion | None: The version, or None if the file had no active version then.
+        """
+
+        try:
+            return self._repository.get_as_of(id, timestamp)
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error getting version as of {timestamp}: {exc}")
+
+
+    @traced("snapshot")
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: str | None = None
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        List the versions that were active at a point in time, e.g. to pin a training set.
+
+        Pass each record's version number to `read` to fetch the content as it was.
+
+        Args:
+            selection (Sequence[str] | str): The file IDs, or an ID prefix.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+            limit (int): The maximum number of files per page.
+            page_token (str | None): The token returned with the previous page.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        try:
+            return self._repository.snapshot(
+                selection,
+                timestamp,
+                limit=limit,
+                page_token=page_token,
+            )
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error taking snapshot: {exc}")
+            return Page(items=[])
+
+
+    @traced("read")
+    def read(
+        self,
+        id: str,
+        version: int | None = None
+    ) -> bytes | None:
+        """
+        Read the content of a file version.
+
+        Reading an archived version starts a restore where the backend needs
+        one and returns None until it completes. Content stored gzipped by
+        the ingestion pipeline (`content_encoding` metadata) is decompressed.
+
+        Args:
+            id (str): The ID of the file.
+            version (int | None): The version to read, or None for the active version.
+
+        Returns:
+            bytes | None: The file content, or None if not found.
+        """
+
+        try:
+            record = self._repository.get_record(id, version)
+
+            if not record:
+                return None
+
+            if is_packed(record):
+                return self._decode(record, read_packed(self._storage, record))
+
+            path = self._record_path(record)
+
+            if record.attributes.get(TIER_ATTRIBUTE) == ARCHIVE and not self._storage.restore(path):
+                print(f"Version {record.version.version} of {id} is archived; restore in progress")
+                return None
+
+            return self._decode(record, self._storage.download(path))
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error reading file: {exc}")
+
+
+    def expected_latency(
+        self,
+        id: str,
+        version: int | None = None
+    ) -> timedelta | None:
+        """
+        Get the typical time to first byte of a file version from its storage tier.
+
+        Args:
+            id (str): The ID of the file.
+            version (int | None): The version, or None for the active version.
+
+        Returns:
+            timedelta | None: The expected latency, or None if not found.
+        """
+
+        try:
+            record = self._repository.get_record(id, version)
+
+            if not record:
+                return None
+
+            return EXPECTED_LATENCY[record.attributes.get(TIER_ATTRIBUTE, HOT)]
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error getting expected latency: {exc}")
+
+
+    @traced("find")
+    def find(
+        self,
+        filters: Dict[str, Any],
+        active_only: bool = True,
+        *,
+        limit: int = 100,
+        page_token: str | None = None
+    ) -> Page[TVersion]:
+        """
+        Find file versions by metadata fields.
+
+        Only fields declared as secondary indexes on the repository can be
+        filtered on, so a query never falls back to a collection scan.
+
+        Args:
+            filters (Dict[str, Any]): Field path to value, e.g. {"metadata.customer": "ACME"}.
+            active_only (bool): Whether to return only active versions.
+            limit (int): The maximum number of versions per page.
+            page_token (str | None): The token returned with the previous page.
+
+        Returns:
+            Page[TVersion]: The matching versions and the token of the next page.
+        """
+
+        try:
+            return self._repository.find(
+                filters,
+                active_only=active_only,
+                limit=limit,
+                page_token=page_token,
+            )
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error finding files: {exc}")
+            return Page(items=[])
+
+
+    @traced("update")
     def update(
         self,
         *,
-        content: bytes,
-        content_type: str,
         version: TVersion,
-    ) -> None:
+        content: bytes | None = None,
+        content_type: str | None = None,
+        reuse: str = "copy",
+        checksums: Checksums | None = None,
+    ) -> TVersion | None:
         """
         Update an existing file version.
 
+        Without content, only the metadata changes and the bytes of the active
+        version are reused: "copy" duplicates the object server-side under the
+        new version's path, "pointer" records the existing path on the new
+        version without touching storage at all.
+
         Args:
-            content (bytes): The new content of the file.
-            content_type (str): The new MIME type of the file.
             version (TVersion): The version metadata.
+            content (bytes | None): The new content of the file, or None to keep the current content.
+            content_type (str | None): The new MIME type of the file.
+            reuse (str): How unchanged content is reused, "copy" or "pointer".
+            checksums (Checksums | None): Checksums of the content, computed here if omitted.
 
         Returns:
-            None
+            TVersion | None: The new version, or None if there was nothing to update.
+        """
+
+        try:
+            return self._update(version, content, content_type, reuse, checksums)
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error updating file: {exc}")
+
+
+    @traced("update_from_path")
+    def update_from_path(
+        self,
+        *,
+        version: TVersion,
+        source_path: str,
+        content_type: str | None = None,
+        part_size: int | None = None,
+        concurrency: int = 8,
+    ) -> TVersion | None:
+        """
+        Update a file with the content of a local file, memory-mapped like create_from_path.
+
+        Args:
+            version (TVersion): The version metadata.
+            source_path (str): The local file to upload.
+            content_type (str | None): The new MIME type of the file.
+            part_size (int | None): The size of each uploaded part, a backend default if None.
+            concurrency (int): The number of parts uploaded at once.
+
+        Returns:
+            TVersion | None: The new version, or None if there was nothing to update.
+        """
+
+        try:
+            with _mapped_file(source_path) as content:
+                return self._update(
+                    version,
+                    content,
+                    content_type,
+                    "copy",
+                    None,
+                    multipart=(part_size, concurrency),
+                )
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error updating file: {exc}")
+
+
+    @traced("update_metadata")
+    def update_metadata(
+        self,
+        version: TVersion,
+        *,
+        reuse: str = "copy"
+    ) -> TVersion | None:
+        """
+        Create a new version with new metadata and the current content.
+
+        Args:
+            version (TVersion): The version metadata.
+            reuse (str): How the content is reused, "copy" or "pointer".
+
+        Returns:
+            TVersion | None: The new version, or None if there was nothing to update.
+        """
+
+        return self.update(version=version, reuse=reuse)
+
+
+    @traced("begin_upload")
+    def begin_upload(
+        self,
+        *,
+        version: TVersion,
+        content_type: str,
+        size: int,
+        md5: str | None = None,
+        expires: timedelta = timedelta(hours=1),
+        part_size: int | None = None,
+    ) -> UploadSession[TVersion] | None:
+        """
+        Start a direct upload that bypasses this process.
+
+        The client uploads to the returned URLs and then hands the session
+        back to complete_upload, which commits the version. If the file
+        already has an active version, the upload becomes its next version.
+        Every session uploads to its own staging key next to the version
+        path, so concurrent or rejected sessions never touch each other's
+        objects.
+
+        Args:
+            version (TVersion): The version metadata.
+            content_type (str): The MIME type of the file.
+            size (int): The size of the file in bytes.
+            md5 (str | None): The base64 MD5 of the content, verified on completion.
+            expires (timedelta): How long the upload URLs stay valid.
+            part_size (int | None): Upload in parts of this size.
+
+        Returns:
+            UploadSession[TVersion] | None: The session to upload against, or None on error.
         """
 
         try:
             self._validate(version)
 
             active = self._repository.get_active(version.id)
+            base_version = active.version if active else None
 
-            if not active:
-                return
+            if active:
+                version = self._clone_version(
+                    version,
+                    version=self._next_version(version.id, active.version),
+                    status="ACTIVE",
+                )
+
+            path = self._new_path(version.id, version.version)
+            staging = self._build_path(version.id, f"{version.version}.upload-{uuid.uuid4().hex}")
+            target = self._storage.signed_upload(
+                staging,
+                content_type,
+                size,
+                md5=md5,
+                expires=expires,
+                part_size=part_size,
+            )
+
+            return UploadSession(
+                version=version,
+                target=target,
+                content_type=content_type,
+                size=size,
+                md5=md5,
+                base_version=base_version,
+                path=path,
+            )
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error starting upload: {exc}")
+
+
+    @traced("complete_upload")
+    def complete_upload(
+        self,
+        session: UploadSession[TVersion],
+        parts: List[str] | None = None,
+        *,
+        verify_content: bool = False
+    ) -> TVersion | None:
+        """
+        Verify a direct upload and commit its version.
+
+        The stored size must match the declared size, and the declared MD5
+        must match the one the backend reports. Backends that report no MD5
+        for an object (multipart S3, composite GCS) are only size-checked
+        unless `verify_content` downloads and hashes the object. A failed
+        check deletes the staged object. The commit is refused if another
+        version became active since the upload began; otherwise the staged
+        object is copied to the version path and removed.
+
+        Args:
+            session (UploadSession[TVersion]): The session returned by begin_upload.
+            parts (List[str] | None): The ETags of the uploaded parts, for multipart uploads.
+            verify_content (bool): Hash the stored object when the backend reports no MD5.
+
+        Returns:
+            TVersion | None: The committed version, or None if the upload was rejected.
+        """
+
+        try:
+            target = session.target
+            self._storage.complete_upload(target, parts)
+
+            info = self._storage.stat(target.path)
+            if info is None:
+                raise ValueError(f"Upload not found at {target.path}")
+
+            if info.size != session.size:
+                self._discard(session)
+                raise ValueError(f"Size mismatch: expected {session.size}, stored {info.size}")
+
+            stored_md5 = info.md5
+            if session.md5 and stored_md5 is None and verify_content:
+                stored_md5 = self._md5(target.path)
+
+            if session.md5 and stored_md5 is not None and stored_md5 != session.md5:
+                self._discard(session)
+                raise ValueError("Checksum mismatch")
+
+            version = session.version
+            active = self._repository.get_active(version.id)
+
+            if (active.version if active else None) != session.base_version:
+                self._discard(session)
+                raise ValueError(f"File {version.id} changed during upload")
 
-            next_version = active.version + 1 if active else 1
+            # Sessions started before staging keys upload to the version path.
+            path = session.path or target.path
+            if path != target.path:
+                self._storage.copy(target.path, path)
 
-            new_version = self._clone_version(
-                version,
-                version=next_version,
-                status="ACTIVE",
+            self._repository.save(
+                version=version,
+                path=path,
+                attributes={"md5": info.md5} if info.md5 else None,
             )
 
-            path = self._build_path(version.id, next_version)
+            if active:
+                self._supersede(version.id, version.version)
+            self._emit(
+                FILE_UPDATED if active else FILE_CREATED,
+                version.id,
+                version=version.version,
+                path=path,
+            )
 
-            self._repository.deactivate_versions(version.id)
-            self._storage.upload(path, content, content_type)
-            self._repository.save(version=new_version, path=path)
+            if path != target.path:
+                self._discard(session)
+            return version
+        except RetriesExhaustedError:
+            raise
         except Exception as exc:
-            print(f"Error updating file: {exc}")
+            print(f"Error completing upload: {exc}")
+
+
+    @traced("download_url")
+    def download_url(
+        self,
+        id: str,
+        version: int | None = None,
+        *,
+        expires: timedelta = timedelta(hours=1)
+    ) -> SignedRequest | None:
+        """
+        Issue a signed URL a client can download a file version from directly.
+
+        Args:
+            id (str): The ID of the file.
+            version (int | None): The version, or None for the active version.
+            expires (timedelta): How long the URL stays valid.
+
+        Returns:
+            SignedRequest | None: The download request, or None if not found.
+        """
+
+        try:
+            record = self._repository.get_record(id, version)
 
+            if not record:
+                return None
 
+            request = self._storage.signed_download(self._record_path(record), expires=expires)
+
+            if is_packed(record):
+                offset = record.attributes["offset"]
+                end = offset + record.attributes["length"] - 1
+                request.headers["Range"] = f"bytes={offset}-{end}"
+
+            return request
+        except RetriesExhaustedError:
+            raise
+        except Exception as exc:
+            print(f"Error signing download: {exc}")
+
+
+    @traced("delete")
     def delete(
         self,
         id: str, *,
@@ -199,6 +744,16 @@ class FileService(Generic[TVersion]):
         """
         Delete a file version.
 
+        With a reclaim queue configured, a physical delete enqueues the
+        objects of the deleted versions and then marks the metadata DELETED;
+        a ReclaimWorker removes the objects later, so latency does not grow
+        with the number of versions. Only those exact paths are queued, and
+        every stored object has a path of its own, so a file re-created
+        under the same ID and version number before the worker runs is
+        kept. The queue is written first so a failure never leaves objects
+        without a record pointing at them. Packed versions are left to the
+        pack compactor.
+
         Args:
             id (str): The ID of the file.
             physical (bool): Whether to delete the file physically from storage.
@@ -213,10 +768,30 @@ class FileService(Generic[TVersion]):
             if not active:
                 return
 
+            deferred = physical and self._reclaim_queue is not None
+
+            if deferred:
+                paths = dict.fromkeys(
+                    self._record_path(record)
+                    for record in self._repository.get_records(id)
+                    if not is_packed(record)
+                )
+                for path in paths:
+                    self._reclaim_queue.enqueue(path)
+
             self._repository.delete_versions(id)
 
-            if physical:
+            if physical and not deferred:
                 self._storage.delete(self._build_path(id, ""))
+
+            self._emit(
+                FILE_DELETED,
+                id,
+                version=active.version,
+                attributes={"physical": physical, "deferred": deferred},
+            )
+        except RetriesExhaustedError:
+            raise
         except Exception as exc:
             print(f"Error deleting file: {exc}")
 
@@ -224,6 +799,351 @@ class FileService(Generic[TVersion]):
     # Helpers
     # ------------------------------------------------------------------
 
+    def _emit(
+        self,
+        type: str,
+        id: str,
+        **kwargs
+    ) -> None:
+        """
+        Record a change event if an emitter is configured.
+
+        The change is already committed when this runs, so a failure to
+        record the event is logged rather than raised; otherwise callers
+        would see a successful write as failed and retry it. The event is
+        not written atomically with the metadata, so a crash or outbox error
+        between the two loses it.
+
+        Args:
+            type (str): The event type.
+            id (str): The ID of the file.
+            **kwargs: Extra event fields passed to EventEmitter.emit.
+
+        Returns:
+            None
+        """
+
+        if self._events is None:
+            return
+
+        try:
+            self._events.emit(type, id, **kwargs)
+        except Exception as exc:
+            print(f"Error recording {type} event for {id}: {exc}")
+
+    def _next_version(
+        self,
+        id: str,
+        active: int
+    ) -> int:
+        """
+        Reserve the next version number of an existing file.
+
+        Falls back to the number after the active version for repositories
+        without an atomic counter.
+
+        Args:
+            id (str): The ID of the file.
+            active (int): The active version number.
+
+        Returns:
+            int: The version number.
+        """
+
+        try:
+            return self._repository.allocate_version(id)
+        except NotImplementedError:
+            return active + 1
+
+    def _supersede(
+        self,
+        id: str,
+        version: int
+    ) -> None:
+        """
+        Deactivate the versions replaced by a newly saved version.
+
+        Only lower versions are deactivated, so concurrent updates never
+        deactivate each other's newer rows. A writer whose version was
+        overtaken while it saved then deactivates itself in favour of the
+        newest active one, which leaves exactly one active version.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number that was just saved.
+
+        Returns:
+            None
+        """
+
+        self._repository.deactivate_versions(id, below=version)
+
+        newest = max(
+            (item.version for item in self._repository.get_versions(id) if item.status == "ACTIVE"),
+            default=version,
+        )
+        if newest > version:
+            self._repository.deactivate_versions(id, below=newest)
+
+    def _create(
+        self,
+        version: TVersion,
+        content: bytes | memoryview,
+        content_type: str,
+        checksums: Checksums | None,
+        *,
+        multipart: tuple[int | None, int] | None = None
+    ) -> TVersion:
+        """
+        Store and record a new file version.
+
+        Args:
+            version (TVersion): The version metadata.
+            content (bytes | memoryview): The content of the file.
+            content_type (str): The MIME type of the file.
+            checksums (Checksums | None): Checksums of the content, computed if omitted.
+            multipart (tuple[int | None, int] | None): (part size, concurrency) for a parallel upload.
+
+        Returns:
+            TVersion: The saved version.
+        """
+
+        self._validate(version)
+
+        path, attributes = self._store(
+            version.id,
+            version.version,
+            content,
+            content_type,
+            checksums,
+            multipart=multipart,
+        )
+
+        self._repository.save(version=version, path=path, attributes=attributes)
+        self._emit(FILE_CREATED, version.id, version=version.version, path=path)
+        return version
+
+    def _update(
+        self,
+        version: TVersion,
+        content: bytes | memoryview | None,
+        content_type: str | None,
+        reuse: str,
+        checksums: Checksums | None,
+        *,
+        multipart: tuple[int | None, int] | None = None
+    ) -> TVersion | None:
+        """
+        Store and record the next version of a file.
+
+        Args:
+            version (TVersion): The version metadata.
+            content (bytes | memoryview | None): The new content, or None to keep the current content.
+            content_type (str | None): The new MIME type of the file.
+            reuse (str): How unchanged content is reused, "copy" or "pointer".
+            checksums (Checksums | None): Checksums of the content, computed if omitted.
+            multipart (tuple[int | None, int] | None): (part size, concurrency) for a parallel upload.
+
+        Returns:
+            TVersion | None: The new version, or None if there was nothing to update.
+        """
+
+        self._validate(version)
+
+        if content is None and reuse not in ("copy", "pointer"):
+            raise ValueError(f"Unknown reuse mode: {reuse}")
+
+        # Unknown and deleted files have no active record; they are created,
+        # not updated. The number is reserved only once the file is known.
+        active = self._repository.get_record(version.id)
+
+        if not active:
+            return
+
+        next_version = self._next_version(version.id, active.version.version)
+
+        new_version = self._clone_version(
+            version,
+            version=next_version,
+            status="ACTIVE",
+        )
+
+        path = self._new_path(version.id, next_version)
+        attributes = None
+
+        if content is not None:
+            path, attributes = self._store(
+                version.id,
+                next_version,
+                content,
+                content_type,
+                checksums,
+                multipart=multipart,
+            )
+        elif reuse == "copy" and not is_packed(active):
+            self._storage.copy(self._record_path(active), path)
+            attributes = {
+                key: active.attributes[key]
+                for key in CHECKSUM_KEYS if key in active.attributes
+            }
+        else:
+            # Pack entries are immutable, so a packed version is always
+            # shared rather than copied out of its pack.
+            path = self._record_path(active)
+            attributes = active.attributes
+
+        self._repository.save(version=new_version, path=path, attributes=attributes)
+        self._supersede(version.id, next_version)
+        self._emit(FILE_UPDATED, version.id, version=next_version, path=path)
+        return new_version
+
+    def _new_path(
+        self,
+        id: str,
+        version: int
+    ) -> str:
+        """
+        Build a storage path no other object has used for a file version.
+
+        The version path gets a random suffix, so a re-created file never
+        writes to a path that a deferred delete has queued for reclaim.
+        Records keep the path they were stored under.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+
+        Returns:
+            str: The unique storage path.
+        """
+
+        return self._build_path(id, f"{version}.{uuid.uuid4().hex}")
+
+    def _store(
+        self,
+        id: str,
+        version: int,
+        content: bytes | memoryview,
+        content_type: str,
+        checksums: Checksums | None = None,
+        *,
+        multipart: tuple[int | None, int] | None = None
+    ) -> tuple[str, Dict[str, Any]]:
+        """
+        Store the content of a new version, packing it if it is small.
+
+        The checksums are sent with the upload for server-side validation
+        and returned as record attributes.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+            content (bytes | memoryview): The content of the file.
+            content_type (str): The MIME type of the file.
+            checksums (Checksums | None): Checksums of the content, computed if omitted.
+            multipart (tuple[int | None, int] | None): (part size, concurrency) for a parallel upload.
+
+        Returns:
+            tuple[str, Dict[str, Any]]: The storage path and the record attributes.
+        """
+
+        checksums = checksums or compute_checksums(content)
+
+        if self._packer is not None and self._packer.accepts(len(content)):
+            path, attributes = self._packer.put(id, version, bytes(content))
+            return path, {**attributes, **checksum_attributes(checksums)}
+
+        path = self._new_path(id, version)
+        if multipart is None:
+            self._storage.upload(path, content, content_type, checksums)
+        else:
+            part_size, concurrency = multipart
+            self._storage.upload_multipart(
+                path,
+                content,
+                content_type,
+                checksums,
+                part_size=part_size,
+                concurrency=concurrency,
+            )
+        return path, checksum_attributes(checksums)
+
+    def _discard(
+        self,
+        session: UploadSession[TVersion]
+    ) -> None:
+        """
+        Remove the staged object of a finished or rejected direct upload.
+
+        Args:
+            session (UploadSession[TVersion]): The rejected session.
+
+        Returns:
+            None
+        """
+
+        try:
+            self._storage.abort_upload(session.target)
+        except Exception as exc:
+            print(f"Error discarding upload: {exc}")
+
+    def _md5(
+        self,
+        path: str
+    ) -> str:
+        """
+        Compute the base64 MD5 of a stored object by downloading it.
+
+        Args:
+            path (str): The storage path.
+
+        Returns:
+            str: The base64-encoded digest.
+        """
+
+        digest = hashlib.md5(self._storage.download(path)).digest()
+        return base64.b64encode(digest).decode("ascii")
+
+    def _decode(
+        self,
+        record: VersionRecord[TVersion],
+        content: bytes
+    ) -> bytes:
+        """
+        Undo the content encoding recorded in a version's metadata.
+
+        Metadata is carried over by updates, so the gzip header is checked
+        too and content stored raw is returned unchanged.
+
+        Args:
+            record (VersionRecord[TVersion]): The version record.
+            content (bytes): The stored content.
+
+        Returns:
+            bytes: The original content.
+        """
+
+        metadata = getattr(record.version, "metadata", None) or {}
+        if metadata.get("content_encoding") == "gzip" and content[:2] == b"\x1f\x8b":
+            return gzip.decompress(content)
+        return content
+
+    def _record_path(
+        self,
+        record: VersionRecord[TVersion]
+    ) -> str:
+        """
+        Get the storage path of a version record.
+
+        Args:
+            record (VersionRecord[TVersion]): The version record.
+
+        Returns:
+            str: The recorded path, or the path derived from the id and version.
+        """
+
+        return record.storage_path or self._build_path(record.version.id, record.version.version)
+
     def _clone_version(
         self,
         obj: TVersion,
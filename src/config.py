@@ -0,0 +1,45 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import os
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Settings:
+    """
+    Runtime configuration read from environment variables.
+    """
+
+    storage_provider: str = "gcs"
+    nosql_provider: str = "firestore"
+    bucket_name: str = ""
+    project_id: str = ""
+    folder: str = ""
+    collection_name: str = "files"
+    table_name: str = "files"
+    local_root: str = "storage"
+    sqlite_database: str = "metadata.sqlite"
+    storage_endpoint_url: str = ""
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from the process environment.
+
+        Returns:
+            Settings: The configured settings.
+        """
+
+        return cls(
+            storage_provider=os.getenv("STORAGE_PROVIDER", "gcs"),
+            nosql_provider=os.getenv("NOSQL_PROVIDER", "firestore"),
+            bucket_name=os.getenv("BUCKET_NAME", ""),
+            project_id=os.getenv("PROJECT_ID", ""),
+            folder=os.getenv("FOLDER", ""),
+            collection_name=os.getenv("COLLECTION_NAME", "files"),
+            table_name=os.getenv("TABLE_NAME", "files"),
+            local_root=os.getenv("LOCAL_ROOT", "storage"),
+            sqlite_database=os.getenv("SQLITE_DATABASE", "metadata.sqlite"),
+            storage_endpoint_url=os.getenv("STORAGE_ENDPOINT_URL", ""),
+        )
@@ -0,0 +1,142 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import base64
+import hashlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+# ---------------------------------------------------------------------
+# Third-party libraries
+# ---------------------------------------------------------------------
+try:
+    import google_crc32c
+except ImportError:  # pragma: no cover - exercised only without the wheel
+    google_crc32c = None
+
+
+CHUNK_SIZE = 1024 * 1024
+CHECKSUM_KEYS = ("crc32c", "md5", "sha256")
+
+
+def _crc32c_table() -> list:
+    table = []
+    for n in range(256):
+        crc = n
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_TABLE = _crc32c_table() if google_crc32c is None else None
+
+
+class _Crc32c:
+    """
+    CRC32C accumulator using google_crc32c when installed and a table-driven
+    fallback otherwise.
+    """
+
+    def __init__(self):
+        self._checksum = google_crc32c.Checksum() if google_crc32c is not None else None
+        self._crc = 0xFFFFFFFF
+
+    def update(self, chunk) -> None:
+        if self._checksum is not None:
+            self._checksum.update(chunk)
+            return
+
+        crc = self._crc
+        for byte in bytes(chunk):
+            crc = _TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        self._crc = crc
+
+    def digest(self) -> bytes:
+        if self._checksum is not None:
+            return self._checksum.digest()
+        return (self._crc ^ 0xFFFFFFFF).to_bytes(4, "big")
+
+
+@dataclass(slots=True)
+class Checksums:
+    """
+    Content checksums in the encodings the backends expect: base64 for
+    CRC32C and MD5 (S3 and GCS headers), hex for SHA-256.
+    """
+
+    crc32c: str
+    md5: str
+    sha256: str
+
+
+def compute_checksums(
+    content: bytes,
+    chunk_size: int = CHUNK_SIZE
+) -> Checksums:
+    """
+    Compute CRC32C, MD5 and SHA-256 in a single pass over the content.
+
+    Each chunk is fed to all three digests while it is still in cache, so
+    large payloads are read from memory once instead of three times.
+
+    Args:
+        content (bytes): The content to hash.
+        chunk_size (int): The number of bytes hashed per step.
+
+    Returns:
+        Checksums: The checksums of the content.
+    """
+
+    crc = _Crc32c()
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        chunk = view[start:start + chunk_size]
+        crc.update(chunk)
+        md5.update(chunk)
+        sha256.update(chunk)
+
+    return Checksums(
+        crc32c=base64.b64encode(crc.digest()).decode("ascii"),
+        md5=base64.b64encode(md5.digest()).decode("ascii"),
+        sha256=sha256.hexdigest(),
+    )
+
+
+def crc32c(
+    content: bytes,
+    chunk_size: int = CHUNK_SIZE
+) -> str:
+    """
+    Compute the base64 CRC32C of the content alone.
+
+    Args:
+        content (bytes): The content to hash.
+        chunk_size (int): The number of bytes hashed per step.
+
+    Returns:
+        str: The base64 CRC32C.
+    """
+
+    crc = _Crc32c()
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        crc.update(view[start:start + chunk_size])
+    return base64.b64encode(crc.digest()).decode("ascii")
+
+
+def checksum_attributes(checksums: Optional[Checksums]) -> Dict[str, Any]:
+    """
+    Convert checksums into version record attributes.
+
+    Args:
+        checksums (Optional[Checksums]): The checksums, if computed.
+
+    Returns:
+        Dict[str, Any]: The attributes, empty when there are no checksums.
+    """
+
+    return asdict(checksums) if checksums is not None else {}
@@ -1,9 +1,12 @@
 # ---------------------------------------------------------------------
 # Standard library
 # ---------------------------------------------------------------------
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Protocol, runtime_checkable
+from typing import Any, Dict, Generic, List, Optional, Protocol, TypeVar, runtime_checkable
+
+
+T = TypeVar("T")
 
 
 @runtime_checkable
@@ -26,4 +29,69 @@ class FileVersion:
     created_at: datetime
     metadata: Dict[str, str]
     status: str = "ACTIVE"
-    version: int = 1
\ No newline at end of file
+    version: int = 1
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    items: List[T]
+    next_token: Optional[str] = None
+
+
+@dataclass(slots=True)
+class VersionRecord(Generic[T]):
+    version: T
+    storage_path: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    deactivated_at: Optional[datetime] = None
+    deleted_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class ReclaimTask:
+    task_id: int
+    prefix: str
+    attempts: int = 0
+
+
+@dataclass(slots=True)
+class RepairTask:
+    task_id: int
+    replica: str
+    op: str
+    path: str
+    attempts: int = 0
+
+
+@dataclass(slots=True)
+class ObjectInfo:
+    size: int
+    md5: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+@dataclass(slots=True)
+class SignedRequest:
+    url: str
+    method: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    expires_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class UploadTarget:
+    path: str
+    requests: List[SignedRequest]
+    upload_id: Optional[str] = None
+    part_size: Optional[int] = None
+
+
+@dataclass(slots=True)
+class UploadSession(Generic[T]):
+    version: T
+    target: UploadTarget
+    content_type: str
+    size: int
+    md5: Optional[str] = None
+    base_version: Optional[int] = None
+    path: Optional[str] = None
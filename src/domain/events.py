@@ -0,0 +1,105 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+FILE_CREATED = "file.created"
+FILE_UPDATED = "file.updated"
+FILE_DELETED = "file.deleted"
+
+
+@dataclass(slots=True)
+class FileEvent:
+    event_id: str
+    type: str
+    id: str
+    occurred_at: datetime
+    version: Optional[int] = None
+    path: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+def event_to_dict(event: FileEvent) -> Dict[str, Any]:
+    """
+    Serialize an event into JSON-compatible primitives.
+
+    Args:
+        event (FileEvent): The event to serialize.
+
+    Returns:
+        Dict[str, Any]: The serialized event.
+    """
+
+    data = asdict(event)
+    data["occurred_at"] = event.occurred_at.isoformat()
+    return data
+
+
+def event_from_dict(data: Dict[str, Any]) -> FileEvent:
+    """
+    Deserialize an event produced by event_to_dict.
+
+    Args:
+        data (Dict[str, Any]): The serialized event.
+
+    Returns:
+        FileEvent: The event.
+    """
+
+    return FileEvent(**{**data, "occurred_at": datetime.fromisoformat(data["occurred_at"])})
+
+
+class EventSink(ABC):
+    """
+    Destination for batches of file lifecycle events.
+    """
+
+    @abstractmethod
+    def publish(self, events: List[FileEvent]) -> None:
+        """
+        Deliver a batch of events. Raising leaves the batch in the outbox for redelivery.
+
+        Args:
+            events (List[FileEvent]): The events, in emission order.
+        """
+        raise NotImplementedError
+
+
+class EventOutbox(ABC):
+    """
+    Store of emitted events that have not been delivered yet.
+    """
+
+    @abstractmethod
+    def append(self, event: FileEvent) -> None:
+        """
+        Record an event before it is delivered.
+
+        Args:
+            event (FileEvent): The event to record.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def pending(self, limit: int) -> List[FileEvent]:
+        """
+        Get the oldest undelivered events.
+
+        Args:
+            limit (int): The maximum number of events.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def acknowledge(self, event_ids: List[str]) -> None:
+        """
+        Remove delivered events from the outbox.
+
+        Args:
+            event_ids (List[str]): The IDs of the delivered events.
+        """
+        raise NotImplementedError
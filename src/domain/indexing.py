@@ -0,0 +1,99 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+ARRAY_SUFFIX = "[]"
+
+
+def parse_index(field: str) -> Tuple[str, bool]:
+    """
+    Split a declared index into its field path and array flag.
+
+    `metadata.customer` indexes a scalar field, while `segmentation_groups[]`
+    indexes every element of a list field.
+
+    Args:
+        field (str): The declared index.
+
+    Returns:
+        Tuple[str, bool]: The dotted field path and whether it is an array index.
+    """
+
+    if field.endswith(ARRAY_SUFFIX):
+        return field[:-len(ARRAY_SUFFIX)], True
+    return field, False
+
+
+def extract(data: Dict[str, Any], path: str) -> Any:
+    """
+    Read a dotted field path from a nested dict.
+
+    Args:
+        data (Dict[str, Any]): The serialized version.
+        path (str): The dotted field path.
+
+    Returns:
+        Any: The field value, or None if any segment is missing.
+    """
+
+    value: Any = data
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def index_values(data: Dict[str, Any], field: str) -> List[str]:
+    """
+    Get the values a version contributes to a declared index.
+
+    Args:
+        data (Dict[str, Any]): The serialized version.
+        field (str): The declared index.
+
+    Returns:
+        List[str]: The normalized index values, empty if the field is unset.
+    """
+
+    path, is_array = parse_index(field)
+    value = extract(data, path)
+
+    if value is None:
+        return []
+    if is_array:
+        return [str(item) for item in value if item is not None]
+    return [str(value)]
+
+
+def resolve_filters(filters: Dict[str, Any], indexed_fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Map requested equality filters onto declared indexes.
+
+    A filter on `segmentation_groups` matches the `segmentation_groups[]`
+    array index. Filters on undeclared fields are rejected rather than
+    silently served by a scan.
+
+    Args:
+        filters (Dict[str, Any]): The requested equality filters by field path.
+        indexed_fields (Sequence[str]): The declared indexes.
+
+    Returns:
+        Dict[str, Any]: Filter values keyed by declared index.
+    """
+
+    if not filters:
+        raise ValueError("At least one filter is required")
+
+    resolved = {}
+    for path, value in filters.items():
+        if path in indexed_fields:
+            resolved[path] = value
+        elif path + ARRAY_SUFFIX in indexed_fields:
+            resolved[path + ARRAY_SUFFIX] = value
+        else:
+            raise ValueError(f"No secondary index declared for: {path}")
+
+    return resolved
@@ -2,12 +2,23 @@
 # Standard library
 # ---------------------------------------------------------------------
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Generic
 
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
-from src.domain.entities import FileVersion
+from src.domain.checksums import Checksums
+from src.domain.entities import (
+    FileVersion,
+    ObjectInfo,
+    Page,
+    ReclaimTask,
+    RepairTask,
+    SignedRequest,
+    UploadTarget,
+    VersionRecord,
+)
 
 TVersion = TypeVar("TVersion", bound=FileVersion)
 
@@ -37,22 +48,36 @@ class FileMetadataRepository(Generic[TVersion]):
         raise NotImplementedError
 
     @abstractmethod
-    def save(self, version: TVersion) -> None:
+    def save(self, version: TVersion, path: str, attributes: Optional[Dict[str, Any]] = None) -> None:
         """
         Save a file version.
 
         Args:
             version (TVersion): The file version to save.
+            path (str): The storage path of the file version.
+            attributes (Optional[Dict[str, Any]]): Storage-level attributes kept with the record.
         """
         raise NotImplementedError
 
+    def save_many(self, items: Iterable[Tuple]) -> None:
+        """
+        Save many file versions. Backends override this with a batched write.
+
+        Args:
+            items (Iterable[Tuple]): (version, storage path) pairs, optionally
+                followed by the record attributes.
+        """
+        for version, path, *attributes in items:
+            self.save(version=version, path=path, attributes=attributes[0] if attributes else None)
+
     @abstractmethod
-    def deactivate_versions(self, id: str) -> None:
+    def deactivate_versions(self, id: str, below: Optional[int] = None) -> None:
         """
         Deactivate all versions of a file by its ID.
 
         Args:
             id (str): The ID of the file to deactivate versions for.
+            below (Optional[int]): Only deactivate versions numbered below this one.
         """
         raise NotImplementedError
 
@@ -66,11 +91,148 @@ class FileMetadataRepository(Generic[TVersion]):
         """
         raise NotImplementedError
 
+    def find(
+        self,
+        filters: Dict[str, Any],
+        *,
+        active_only: bool = True,
+        limit: int = 100,
+        page_token: Optional[str] = None
+    ) -> Page[TVersion]:
+        """
+        Find versions by equality filters on declared secondary indexes.
+
+        Args:
+            filters (Dict[str, Any]): Field path to value, e.g. {"metadata.customer": "ACME"}.
+            active_only (bool): Whether to return only active versions.
+            limit (int): The maximum number of versions per page.
+            page_token (Optional[str]): The token of the page to fetch.
+        """
+        raise NotImplementedError
+
+    def get_record(self, id: str, version: Optional[int] = None) -> Optional[VersionRecord[TVersion]]:
+        """
+        Get one version of a file together with its storage path.
+
+        Args:
+            id (str): The ID of the file.
+            version (Optional[int]): The version number, or None for the active version.
+        """
+        raise NotImplementedError
+
+    def get_records(self, id: str) -> List[VersionRecord[TVersion]]:
+        """
+        Get all versions of a file together with their storage paths, newest first.
+
+        Args:
+            id (str): The ID of the file.
+        """
+        raise NotImplementedError
+
+    def get_as_of(self, id: str, timestamp: datetime) -> Optional[TVersion]:
+        """
+        Get the version of a file that was active at a point in time.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+        """
+        raise NotImplementedError
+
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through the records that were active at a point in time.
+
+        Files without an active version at `timestamp` are left out.
+
+        Args:
+            selection (Sequence[str] | str): The file IDs, or an ID prefix.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+            limit (int): The maximum number of files per page.
+            page_token (Optional[str]): The token of the page to fetch.
+        """
+        raise NotImplementedError
+
+    def scan(
+        self,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None,
+        segment: int = 0,
+        total_segments: int = 1
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through every stored version, in a stable order where the backend has one.
+
+        With `total_segments` > 1 only one disjoint segment is scanned, so
+        segments can be scanned in parallel; all versions of a file fall
+        into the same segment.
+
+        Args:
+            limit (int): The maximum number of records per page.
+            page_token (Optional[str]): The token of the page to fetch.
+            segment (int): The segment to scan, from 0 to `total_segments` - 1.
+            total_segments (int): The number of segments the table is split into.
+        """
+        raise NotImplementedError
+
+    def allocate_version(self, id: str) -> int:
+        """
+        Atomically reserve the next version number of a file.
+
+        Concurrent callers always receive distinct numbers. A result of 1
+        means the file had no versions.
+
+        Args:
+            id (str): The ID of the file.
+        """
+        raise NotImplementedError
+
+    def update_location(
+        self,
+        id: str,
+        version: int,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Change where a stored version's content lives without touching the version itself.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+            path (str): The new storage path.
+            attributes (Optional[Dict[str, Any]]): The new storage-level attributes.
+        """
+        raise NotImplementedError
+
+    def purge(self, versions: List[TVersion]) -> None:
+        """
+        Permanently remove specific version rows.
+
+        Args:
+            versions (List[TVersion]): The versions to remove.
+        """
+        raise NotImplementedError
+
 
 class FileStorage(ABC):
 
     @abstractmethod
-    def upload(self, path: str, content: bytes, content_type: str) -> None:
+    def upload(
+        self,
+        path: str,
+        content: bytes,
+        content_type: str,
+        checksums: Optional[Checksums] = None
+    ) -> None:
         """
         Upload a file to the storage.
 
@@ -78,6 +240,17 @@ class FileStorage(ABC):
             path (str): The path to the file to upload.
             content (bytes): The content of the file to upload.
             content_type (str): The content type of the file to upload.
+            checksums (Optional[Checksums]): Checksums the backend validates the upload against.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def download(self, path: str) -> bytes:
+        """
+        Download a file from the storage.
+
+        Args:
+            path (str): The path to the file to download.
         """
         raise NotImplementedError
 
@@ -90,3 +263,275 @@ class FileStorage(ABC):
             path (str): The path to the file to delete.
         """
         raise NotImplementedError
+
+    def upload_multipart(
+        self,
+        path: str,
+        content: memoryview,
+        content_type: str,
+        checksums: Optional[Checksums] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: int = 8
+    ) -> None:
+        """
+        Upload a large object as parts sent in parallel.
+
+        `content` is typically a view of a memory-mapped file; backends send
+        slices of it without copying the whole object. Backends without a
+        parallel transfer fall back to a single upload.
+
+        Args:
+            path (str): The path of the object.
+            content (memoryview): The content of the object.
+            content_type (str): The MIME type of the object.
+            checksums (Optional[Checksums]): Checksums of the whole content.
+            part_size (Optional[int]): The size of each part, a backend default if None.
+            concurrency (int): The number of parts in flight.
+        """
+        self.upload(path, content, content_type, checksums)
+
+    def copy(self, source: str, destination: str) -> None:
+        """
+        Copy an object inside the storage without transferring its bytes through the caller.
+
+        Args:
+            source (str): The path of the object to copy.
+            destination (str): The path of the new object.
+        """
+        raise NotImplementedError
+
+    def delete_objects(self, paths: List[str]) -> None:
+        """
+        Delete specific objects, batching requests where the backend allows.
+
+        Args:
+            paths (List[str]): The exact object paths to delete.
+        """
+        raise NotImplementedError
+
+    def download_range(self, path: str, offset: int, length: int) -> bytes:
+        """
+        Download a byte range of an object.
+
+        Args:
+            path (str): The path of the object.
+            offset (int): The first byte to read.
+            length (int): The number of bytes to read.
+        """
+        raise NotImplementedError
+
+    def list_objects(self, prefix: str) -> List[str]:
+        """
+        List the paths of all objects under a prefix.
+
+        Args:
+            prefix (str): The path prefix.
+        """
+        raise NotImplementedError
+
+    def transition(self, path: str, tier: str) -> None:
+        """
+        Move an object to the storage class of a tier, in place.
+
+        Args:
+            path (str): The path of the object.
+            tier (str): The target tier, one of src.domain.tiers.TIERS.
+        """
+        raise NotImplementedError
+
+    def restore(self, path: str, days: int = 1) -> bool:
+        """
+        Make an archived object readable, starting a restore if needed.
+
+        Args:
+            path (str): The path of the object.
+            days (int): How long a restored copy stays available.
+
+        Returns:
+            bool: True if the object can be read now.
+        """
+        return True
+
+    def stat(self, path: str) -> Optional[ObjectInfo]:
+        """
+        Get the size, checksum and content type of an object without downloading it.
+
+        Args:
+            path (str): The path of the object.
+        """
+        raise NotImplementedError
+
+    def signed_upload(
+        self,
+        path: str,
+        content_type: str,
+        size: int,
+        *,
+        md5: Optional[str] = None,
+        expires: timedelta = timedelta(hours=1),
+        part_size: Optional[int] = None
+    ) -> UploadTarget:
+        """
+        Issue URLs a client can upload an object to directly.
+
+        Args:
+            path (str): The path of the object.
+            content_type (str): The content type the client must send.
+            size (int): The size of the object in bytes.
+            md5 (Optional[str]): The base64 MD5 the client must send, if known.
+            expires (timedelta): How long the URLs stay valid.
+            part_size (Optional[int]): Split the upload into parts of this size.
+        """
+        raise NotImplementedError
+
+    def complete_upload(self, target: UploadTarget, parts: Optional[List[str]] = None) -> None:
+        """
+        Finish a direct upload, assembling parts where the backend needs it.
+
+        Args:
+            target (UploadTarget): The target returned by signed_upload.
+            parts (Optional[List[str]]): The ETags of the uploaded parts, in order.
+        """
+        raise NotImplementedError
+
+    def abort_upload(self, target: UploadTarget) -> None:
+        """
+        Discard a direct upload and any parts already stored.
+
+        Args:
+            target (UploadTarget): The target returned by signed_upload.
+        """
+        raise NotImplementedError
+
+    def signed_download(self, path: str, *, expires: timedelta = timedelta(hours=1)) -> SignedRequest:
+        """
+        Issue a URL a client can download an object from directly.
+
+        Args:
+            path (str): The path of the object.
+            expires (timedelta): How long the URL stays valid.
+        """
+        raise NotImplementedError
+
+
+class ReclaimQueue(ABC):
+    """
+    Durable queue of storage paths waiting for physical deletion.
+    """
+
+    @abstractmethod
+    def enqueue(self, prefix: str) -> None:
+        """
+        Add a storage path to reclaim.
+
+        Args:
+            prefix (str): The object path, or a prefix ending in "/" to delete everything under it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def lease(self, limit: int, lease_seconds: float) -> List[ReclaimTask]:
+        """
+        Take due tasks, hiding them from other workers until the lease expires.
+
+        Args:
+            limit (int): The maximum number of tasks.
+            lease_seconds (float): How long the tasks stay hidden.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, task: ReclaimTask) -> None:
+        """
+        Remove a finished task.
+
+        Args:
+            task (ReclaimTask): The finished task.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def retry(self, task: ReclaimTask, delay: float, error: str) -> None:
+        """
+        Make a failed task due again after a delay.
+
+        Args:
+            task (ReclaimTask): The failed task.
+            delay (float): Seconds until the task is due again.
+            error (str): The failure reason.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, task: ReclaimTask, error: str) -> None:
+        """
+        Park a task that exhausted its attempts.
+
+        Args:
+            task (ReclaimTask): The failed task.
+            error (str): The failure reason.
+        """
+        raise NotImplementedError
+
+
+class RepairQueue(ABC):
+    """
+    Durable queue of replica operations that still have to be applied.
+    """
+
+    @abstractmethod
+    def enqueue(self, replica: str, op: str, path: str) -> None:
+        """
+        Record an operation a replica missed.
+
+        Args:
+            replica (str): The name of the lagging replica.
+            op (str): The operation, e.g. "put" or "delete_prefix".
+            path (str): The object path or prefix.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def lease(self, limit: int, lease_seconds: float) -> List[RepairTask]:
+        """
+        Take due tasks, hiding them from other workers until the lease expires.
+
+        Args:
+            limit (int): The maximum number of tasks.
+            lease_seconds (float): How long the tasks stay hidden.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, task: RepairTask) -> None:
+        """
+        Remove a finished task.
+
+        Args:
+            task (RepairTask): The finished task.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def retry(self, task: RepairTask, delay: float, error: str) -> None:
+        """
+        Make a failed task due again after a delay.
+
+        Args:
+            task (RepairTask): The failed task.
+            delay (float): Seconds until the task is due again.
+            error (str): The failure reason.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, task: RepairTask, error: str) -> None:
+        """
+        Park a task that exhausted its attempts.
+
+        Args:
+            task (RepairTask): The failed task.
+            error (str): The failure reason.
+        """
+        raise NotImplementedError
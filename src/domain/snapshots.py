@@ -0,0 +1,81 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+DEACTIVATED_AT = "deactivated_at"
+
+
+def normalize_timestamp(value: datetime) -> datetime:
+    """
+    Bring a timestamp into the naive form versions are stamped with.
+
+    Versions carry naive `created_at` values and the repositories stamp
+    deactivations with naive `datetime.now()`. Aware values, including the
+    UTC datetimes Firestore returns for naive writes, are converted to UTC
+    and stripped so both kinds compare.
+
+    Args:
+        value (datetime): The timestamp.
+
+    Returns:
+        datetime: The naive timestamp.
+    """
+
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def active_at(
+    created_at: Any,
+    deactivated_at: Any,
+    status: str,
+    timestamp: datetime
+) -> bool:
+    """
+    Decide whether a version was the active one at a point in time.
+
+    A version is active from its creation until it is deactivated. Versions
+    written before deactivations were recorded have no stamp; they count as
+    active unless they were deleted.
+
+    Args:
+        created_at (Any): The creation time of the version.
+        deactivated_at (Any): When the version stopped being active, if known.
+        status (str): The current status of the version.
+        timestamp (datetime): The point in time.
+
+    Returns:
+        bool: True if the version was active at `timestamp`.
+    """
+
+    timestamp = normalize_timestamp(timestamp)
+
+    if not isinstance(created_at, datetime) or normalize_timestamp(created_at) > timestamp:
+        return False
+
+    if isinstance(deactivated_at, datetime):
+        return normalize_timestamp(deactivated_at) > timestamp
+
+    return status != "DELETED"
+
+
+def prefix_end(prefix: str) -> Optional[str]:
+    """
+    Get the smallest string greater than every string starting with a prefix.
+
+    Args:
+        prefix (str): The prefix.
+
+    Returns:
+        Optional[str]: The exclusive upper bound, or None if there is none.
+    """
+
+    while prefix and prefix[-1] == chr(0x10FFFF):
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -0,0 +1,42 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from datetime import timedelta
+from typing import Optional
+
+
+TIER_ATTRIBUTE = "tier"
+
+HOT = "hot"
+WARM = "warm"
+COLD = "cold"
+ARCHIVE = "archive"
+
+TIERS = (HOT, WARM, COLD, ARCHIVE)
+
+# Typical time to first byte per tier. Archive objects may first need a
+# restore, which takes hours on S3.
+EXPECTED_LATENCY = {
+    HOT: timedelta(milliseconds=50),
+    WARM: timedelta(milliseconds=100),
+    COLD: timedelta(milliseconds=200),
+    ARCHIVE: timedelta(hours=12),
+}
+
+
+def colder(
+    tier: str,
+    than: Optional[str]
+) -> bool:
+    """
+    Check whether a tier is colder than another.
+
+    Args:
+        tier (str): The candidate tier.
+        than (Optional[str]): The current tier, None meaning hot.
+
+    Returns:
+        bool: True if `tier` is strictly colder.
+    """
+
+    return TIERS.index(tier) > TIERS.index(than or HOT)
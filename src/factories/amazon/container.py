@@ -1,17 +1,45 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from typing import Sequence, Type
+
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+from src.application.hedging import HedgedFileMetadataRepository
+from src.application.journal import WriteBehindFileMetadataRepository
+from src.application.sharding import ShardedFileMetadataRepository
+from src.application.tracing import Tracer
 from src.application.use_cases import FileService
+from src.application.paths import PathStrategy
+from src.application.retry import (
+    RetryController,
+    RetryingFileMetadataRepository,
+    RetryingFileStorage,
+)
 
+from src.domain.entities import FileVersion
 from src.infrastructure.amazon.s3 import S3Storage
 from src.infrastructure.amazon.dynamodb import DynamoFileMetadataRepository
-from src.infrastructure.amazon.clients import dynamo_client, s3_client
+from src.infrastructure.amazon.clients import dynamo_resource, s3_client
+from src.infrastructure.amazon.errors import classify_error
 
 
 def file_service(
     bucket_name: str,
     folder: str,
-    table_name: str
+    table_name: str,
+    *,
+    version_cls: Type = FileVersion,
+    retry: bool = True,
+    hedge: bool = False,
+    hot_key_threshold: float | None = None,
+    journal_dir: str | None = None,
+    slow_threshold: float | None = None,
+    path_strategy: PathStrategy | None = None,
+    indexed_fields: Sequence[str] = (),
+    index_table_name: str | None = None,
+    endpoint_url: str | None = None
 ):
     """
     Create a FileService instance for Amazon S3 and DynamoDB.
@@ -20,16 +48,57 @@ def file_service(
         bucket_name (str): The name of the S3 bucket.
         folder (str): The folder within the bucket.
         table_name (str): The DynamoDB table name.
+        version_cls (Type): The version class used for deserialization.
+        retry (bool): Whether to wrap both backends in adaptive retry controllers.
+        hedge (bool): Whether to hedge slow metadata reads.
+        hot_key_threshold (float | None): Shard the version rows of files written more often than this per second.
+        journal_dir (str | None): Acknowledge metadata writes from a local journal and flush them in the background.
+        slow_threshold (float | None): Log operations taking at least this many seconds, with their backend calls.
+        path_strategy (PathStrategy | None): How file ids map to storage keys.
+        indexed_fields (Sequence[str]): Metadata fields to maintain secondary indexes for.
+        index_table_name (str | None): The DynamoDB table holding index items.
+        endpoint_url (str | None): The S3 endpoint, e.g. a local emulator.
 
     Returns:
         FileService: The configured FileService instance.
     """
 
-    s3 = s3_client()
-    dynamodb = dynamo_client()
+    s3 = s3_client(endpoint_url)
+    dynamodb = dynamo_resource()
+    table = dynamodb.Table(table_name)
+    index_table = dynamodb.Table(index_table_name) if index_table_name else None
+
+    repository = DynamoFileMetadataRepository(
+        table,
+        version_cls,
+        indexed_fields=indexed_fields,
+        index_table=index_table
+    )
+    storage = S3Storage(bucket_name, s3)
+
+    if retry:
+        repository = RetryingFileMetadataRepository(
+            repository,
+            RetryController("dynamodb", classify_error)
+        )
+        storage = RetryingFileStorage(
+            storage,
+            RetryController("s3", classify_error)
+        )
+
+    if hedge:
+        repository = HedgedFileMetadataRepository(repository)
+
+    if journal_dir:
+        repository = WriteBehindFileMetadataRepository(repository, journal_dir)
+
+    if hot_key_threshold is not None:
+        repository = ShardedFileMetadataRepository(repository, auto_threshold=hot_key_threshold)
 
     return FileService(
-        repository=DynamoFileMetadataRepository(dynamodb, table_name),
-        storage=S3Storage(s3, bucket_name, folder),
-        folder=folder
+        repository=repository,
+        storage=storage,
+        base_path=folder,
+        path_strategy=path_strategy,
+        tracer=Tracer(threshold=slow_threshold) if slow_threshold is not None else None
     )
@@ -1,17 +1,44 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from typing import Sequence, Type
+
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+from src.application.hedging import HedgedFileMetadataRepository
+from src.application.journal import WriteBehindFileMetadataRepository
+from src.application.sharding import ShardedFileMetadataRepository
+from src.application.tracing import Tracer
 from src.application.use_cases import FileService
+from src.application.paths import PathStrategy
+from src.application.retry import (
+    RetryController,
+    RetryingFileMetadataRepository,
+    RetryingFileStorage,
+)
 
+from src.domain.entities import FileVersion
 from src.infrastructure.google.gcs import GCSStorage
 from src.infrastructure.google.firestore import FirestoreFileMetadataRepository
 from src.infrastructure.google.clients import firestore_client, gcs_client
+from src.infrastructure.google.errors import classify_error
 
 
 def file_service(
     bucket_name: str,
     folder: str,
-    collection_name: str
+    collection_name: str,
+    *,
+    version_cls: Type = FileVersion,
+    retry: bool = True,
+    hedge: bool = False,
+    hot_key_threshold: float | None = None,
+    journal_dir: str | None = None,
+    slow_threshold: float | None = None,
+    path_strategy: PathStrategy | None = None,
+    indexed_fields: Sequence[str] = (),
+    endpoint_url: str | None = None
 ):
     """
     Create a FileService instance for Google Cloud Storage and Firestore.
@@ -20,19 +47,56 @@ def file_service(
         bucket_name (str): The name of the GCS bucket.
         folder (str): The folder within the bucket.
         collection_name (str): The Firestore collection name.
+        version_cls (Type): The version class used for deserialization.
+        retry (bool): Whether to wrap both backends in adaptive retry controllers.
+        hedge (bool): Whether to hedge slow metadata reads.
+        hot_key_threshold (float | None): Shard the version rows of files written more often than this per second.
+        journal_dir (str | None): Acknowledge metadata writes from a local journal and flush them in the background.
+        slow_threshold (float | None): Log operations taking at least this many seconds, with their backend calls.
+        path_strategy (PathStrategy | None): How file ids map to storage keys.
+        indexed_fields (Sequence[str]): Metadata fields to maintain secondary indexes for.
+        endpoint_url (str | None): The Cloud Storage endpoint, e.g. a local emulator.
 
     Returns:
         FileService: The configured FileService instance.
     """
 
     fs = firestore_client()
-    gcs = gcs_client()
+    gcs = gcs_client(endpoint_url)
 
     bucket = gcs.bucket(bucket_name)
     collection = fs.collection(collection_name)
 
+    repository = FirestoreFileMetadataRepository(
+        collection,
+        version_cls,
+        indexed_fields=indexed_fields
+    )
+    storage = GCSStorage(bucket, url_endpoint=endpoint_url)
+
+    if retry:
+        repository = RetryingFileMetadataRepository(
+            repository,
+            RetryController("firestore", classify_error)
+        )
+        storage = RetryingFileStorage(
+            storage,
+            RetryController("gcs", classify_error)
+        )
+
+    if hedge:
+        repository = HedgedFileMetadataRepository(repository)
+
+    if journal_dir:
+        repository = WriteBehindFileMetadataRepository(repository, journal_dir)
+
+    if hot_key_threshold is not None:
+        repository = ShardedFileMetadataRepository(repository, auto_threshold=hot_key_threshold)
+
     return FileService(
-        repository=FirestoreFileMetadataRepository(collection),
-        storage=GCSStorage(bucket),
-        folder=folder
+        repository=repository,
+        storage=storage,
+        base_path=folder,
+        path_strategy=path_strategy,
+        tracer=Tracer(threshold=slow_threshold) if slow_threshold is not None else None
     )
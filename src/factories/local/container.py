@@ -0,0 +1,50 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from typing import Sequence, Type
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.use_cases import FileService
+from src.application.paths import PathStrategy
+
+from src.domain.entities import FileVersion
+from src.infrastructure.local.filesystem import LocalFileStorage
+from src.infrastructure.local.sqlite import SqliteFileMetadataRepository
+
+
+def file_service(
+    root: str,
+    folder: str,
+    database: str,
+    *,
+    version_cls: Type = FileVersion,
+    path_strategy: PathStrategy | None = None,
+    indexed_fields: Sequence[str] = ()
+):
+    """
+    Create a FileService instance for local disk storage and SQLite metadata.
+
+    Args:
+        root (str): The directory objects are stored under.
+        folder (str): The folder within the root directory.
+        database (str): The path to the SQLite database file.
+        version_cls (Type): The version class used for deserialization.
+        path_strategy (PathStrategy | None): How file ids map to storage keys.
+        indexed_fields (Sequence[str]): Metadata fields to maintain secondary indexes for.
+
+    Returns:
+        FileService: The configured FileService instance.
+    """
+
+    return FileService(
+        repository=SqliteFileMetadataRepository(
+            database,
+            version_cls,
+            indexed_fields=indexed_fields
+        ),
+        storage=LocalFileStorage(root),
+        base_path=folder,
+        path_strategy=path_strategy
+    )
@@ -11,8 +11,15 @@ def dynamo_client():
     return boto3.client("dynamodb")
 
 
-def s3_client():
+def s3_client(endpoint_url: str | None = None):
     """
-    Create an S3 client.
+    Create an S3 client, optionally against an emulator such as MinIO or LocalStack.
     """
-    return boto3.client("s3")
+    return boto3.client("s3", endpoint_url=endpoint_url)
+
+
+def dynamo_resource():
+    """
+    Create a DynamoDB service resource.
+    """
+    return boto3.resource("dynamodb")
@@ -1,8 +1,11 @@
 # ---------------------------------------------------------------------
 # Standard library
 # ---------------------------------------------------------------------
-from typing import List, Optional, Type, TypeVar
-from dataclasses import asdict
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+from dataclasses import asdict, fields
 
 # ---------------------------------------------------------------------
 # Third-party library imports
@@ -12,21 +15,72 @@ from boto3.dynamodb.conditions import Key, Attr
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+from src.domain.entities import Page, VersionRecord
+from src.domain.indexing import index_values, resolve_filters
 from src.domain.repositories import FileMetadataRepository
+from src.domain.snapshots import active_at, normalize_timestamp
 
 
 TVersion = TypeVar("TVersion")
 
+COUNTER_VERSION = 0
+
+
+def _to_item(value: Any) -> Any:
+    """
+    Convert values DynamoDB cannot store (datetimes, floats) recursively.
+    """
+
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_item(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_item(v) for v in value]
+    return value
+
+
+def _from_item(value: Any) -> Any:
+    """
+    Convert DynamoDB Decimals back to ints or floats recursively.
+    """
+
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {k: _from_item(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_from_item(v) for v in value]
+    return value
+
 
 class DynamoFileMetadataRepository(FileMetadataRepository):
     """
     DynamoDB implementation of the FileMetadataRepository interface.
+
+    Declared `indexed_fields` are kept as index items in a separate table
+    keyed by `key` = "{field}#{value}" and `ref` = "{id}#{version}". Unlike a
+    GSI, index items can cover every element of a list field.
+
+    The version counter of each file is kept in the same partition under
+    version 0, which every query excludes with its key condition.
+
+    Deactivations are stamped as `deactivated_at`. Point-in-time reads use
+    `as_of_index`, a local secondary index with `created_at` as sort key and
+    all attributes projected, when the table has one; otherwise they page
+    backwards through the file's versions.
     """
 
     def __init__(
         self,
         table,
-        version_cls: Type[TVersion]
+        version_cls: Type[TVersion],
+        *,
+        indexed_fields: Sequence[str] = (),
+        index_table=None,
+        as_of_index: str | None = None
     ):
         """
         Initialize the DynamoFileMetadataRepository with a DynamoDB table and a version class.
@@ -34,13 +88,26 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
         Args:
             table: The DynamoDB table to use.
             version_cls (Type[TVersion]): The version class to use for deserialization.
+            indexed_fields (Sequence[str]): Secondary indexes, e.g. "metadata.customer"
+                or "segmentation_groups[]" for list fields.
+            index_table: The DynamoDB table holding index items, required with indexed_fields.
+            as_of_index (str | None): The local secondary index sorted by created_at.
 
         Returns:
             None
         """
 
+        if indexed_fields and index_table is None:
+            raise ValueError("indexed_fields require an index_table")
+
         self._table = table
         self._version_cls = version_cls
+        self._indexed_fields = tuple(indexed_fields)
+        self._index_table = index_table
+        self._as_of_index = as_of_index
+        self._datetime_fields = {
+            f.name for f in fields(version_cls) if f.type in (datetime, "datetime")
+        }
 
 
     def get_active(
@@ -57,8 +124,32 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
             Optional[TVersion]: The active version of the file, or None if not found.
         """
 
+        record = self.get_record(id)
+        return record.version if record else None
+
+
+    def get_record(
+        self,
+        id: str,
+        version: Optional[int] = None
+    ) -> Optional[VersionRecord[TVersion]]:
+        """
+        Get one version of a file together with its storage path.
+
+        Args:
+            id (str): The ID of the file.
+            version (Optional[int]): The version number, or None for the active version.
+
+        Returns:
+            Optional[VersionRecord[TVersion]]: The version record, or None if not found.
+        """
+
+        if version is not None:
+            item = self._table.get_item(Key={"id": id, "version": version}).get("Item")
+            return self._record(item) if item else None
+
         response = self._table.query(
-            KeyConditionExpression=Key("id").eq(id),
+            KeyConditionExpression=Key("id").eq(id) & Key("version").gt(COUNTER_VERSION),
             FilterExpression=Attr("status").eq("ACTIVE"),
             Limit=1,
             ScanIndexForward=False
@@ -69,7 +160,7 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
         if not items:
             return None
 
-        return self._deserialize(items[0])
+        return self._record(items[0])
 
 
     def get_versions(
@@ -86,41 +177,45 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
             List[TVersion]: A list of all versions of the file.
         """
 
-        response = self._table.query(
-            KeyConditionExpression=Key("id").eq(id),
+        items = self._query_all(
+            KeyConditionExpression=Key("id").eq(id) & Key("version").gt(COUNTER_VERSION),
             ScanIndexForward=False
         )
 
-        items = response.get("Items", [])
         return [self._deserialize(item) for item in items]
 
 
     def deactivate_versions(
         self,
-        id: str
+        id: str,
+        below: Optional[int] = None
     ) -> None:
         """
         Deactivate all versions of a file by its ID.
 
         Args:
             id (str): The ID of the file to deactivate.
+            below (Optional[int]): Only deactivate versions numbered below this one.
 
         Returns:
             None
         """
 
-        active = self.get_active(id)
-
-        if not active:
+        if below is None:
+            versions = Key("version").gt(COUNTER_VERSION)
+        elif below <= COUNTER_VERSION + 1:
             return
+        else:
+            versions = Key("version").between(COUNTER_VERSION + 1, below - 1)
 
-        self._table.update_item(
-            Key={"id": id},
-            UpdateExpression="SET #status = :inactive",
-            ExpressionAttributeNames={"#status": "status"},
-            ExpressionAttributeValues={":inactive": "INACTIVE"}
+        items = self._query_all(
+            KeyConditionExpression=Key("id").eq(id) & versions,
+            FilterExpression=Attr("status").eq("ACTIVE")
         )
 
+        for item in items:
+            self._set_status(item, "INACTIVE")
+
     def delete_versions(
         self,
         id: str
@@ -135,24 +230,19 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
             None
         """
 
-        versions = self.get_versions(id)
+        items = self._query_all(
+            KeyConditionExpression=Key("id").eq(id) & Key("version").gt(COUNTER_VERSION)
+        )
 
-        for version in versions:
-            self._table.update_item(
-                Key={
-                    "id": version.id,
-                    "version": version.version
-                },
-                UpdateExpression="SET #s = :deleted",
-                ExpressionAttributeNames={"#s": "status"},
-                ExpressionAttributeValues={":deleted": "DELETED"}
-            )
+        for item in items:
+            self._set_status(item, "DELETED")
 
 
     def save(
         self,
         version: TVersion,
-        path: str
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
     ) -> None:
         """
         Save a file version to the DynamoDB table.
@@ -160,15 +250,568 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
         Args:
             version (TVersion): The file version to save.
             path (str): The storage path of the file.
+            attributes (Optional[Dict[str, Any]]): Storage-level attributes kept with the record.
 
         Returns:
             None
         """
 
-        data = asdict(version)
+        data = _to_item(asdict(version))
         data["storage_path"] = path
+        if attributes:
+            data["record_attributes"] = _to_item(attributes)
 
         self._table.put_item(Item=data)
+        self._write_index(data)
+
+
+    def save_many(
+        self,
+        items: Iterable[Tuple]
+    ) -> None:
+        """
+        Save many file versions with batched writes of 25 items.
+
+        Args:
+            items (Iterable[Tuple]): (version, storage path) pairs, optionally
+                followed by the record attributes.
+
+        Returns:
+            None
+        """
+
+        saved = []
+
+        with self._table.batch_writer() as batch:
+            for version, path, *attributes in items:
+                data = _to_item(asdict(version))
+                data["storage_path"] = path
+                if attributes and attributes[0]:
+                    data["record_attributes"] = _to_item(attributes[0])
+                batch.put_item(Item=data)
+                saved.append(data)
+
+        for data in saved:
+            self._write_index(data)
+
+
+    def find(
+        self,
+        filters: Dict[str, Any],
+        *,
+        active_only: bool = True,
+        limit: int = 100,
+        page_token: Optional[str] = None
+    ) -> Page[TVersion]:
+        """
+        Find versions by equality filters on declared secondary indexes.
+
+        The first filter is served by the index table; further filters are
+        checked against the fetched versions, so a page can hold fewer than
+        `limit` items while more pages remain.
+
+        Args:
+            filters (Dict[str, Any]): Field path to value, e.g. {"metadata.customer": "ACME"}.
+            active_only (bool): Whether to return only active versions.
+            limit (int): The maximum number of versions per page.
+            page_token (Optional[str]): The token of the page to fetch.
+
+        Returns:
+            Page[TVersion]: The matching versions and the token of the next page.
+        """
+
+        resolved = list(resolve_filters(filters, self._indexed_fields).items())
+        field, value = resolved[0]
+
+        status = Attr("status").eq("ACTIVE") if active_only else Attr("status").ne("DELETED")
+        params = {
+            "KeyConditionExpression": Key("key").eq(f"{field}#{value}"),
+            "FilterExpression": status,
+            "Limit": limit,
+        }
+        if page_token:
+            params["ExclusiveStartKey"] = json.loads(page_token)
+
+        response = self._index_table.query(**params)
+        refs = [
+            {"id": item["id"], "version": item["version"]}
+            for item in response.get("Items", [])
+        ]
+
+        items = [
+            item for item in self._batch_get(refs)
+            if all(str(v) in index_values(item, f) for f, v in resolved[1:])
+        ]
+
+        last_key = response.get("LastEvaluatedKey")
+        return Page(
+            items=[self._deserialize(item) for item in items],
+            next_token=json.dumps(last_key) if last_key else None,
+        )
+
+
+    def get_records(
+        self,
+        id: str
+    ) -> List[VersionRecord[TVersion]]:
+        """
+        Get all versions of a file together with their storage paths.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            List[VersionRecord[TVersion]]: The version records, newest first.
+        """
+
+        items = self._query_all(
+            KeyConditionExpression=Key("id").eq(id) & Key("version").gt(COUNTER_VERSION),
+            ScanIndexForward=False
+        )
+
+        return [self._record(item) for item in items]
+
+
+    def get_as_of(
+        self,
+        id: str,
+        timestamp: datetime
+    ) -> Optional[TVersion]:
+        """
+        Get the version of a file that was active at a point in time.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+
+        Returns:
+            Optional[TVersion]: The version, or None if the file had no active version then.
+        """
+
+        record = self._record_as_of(id, timestamp)
+        return record.version if record else None
+
+
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through the records that were active at a point in time.
+
+        Explicit IDs cost one point-in-time query each. A prefix is resolved
+        with a keys-only scan page, since DynamoDB cannot range over
+        partition keys; items of one file are contiguous in a scan, so the
+        token carries the last ID to skip its remainder on the next page.
+
+        Args:
+            selection (Sequence[str] | str): The file IDs, or an ID prefix.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+            limit (int): The maximum number of items scanned, or files for explicit IDs.
+            page_token (Optional[str]): The token of the page to fetch.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        if not isinstance(selection, str):
+            ids = list(selection)
+            offset = json.loads(page_token) if page_token else 0
+            records = [self._record_as_of(id, timestamp) for id in ids[offset:offset + limit]]
+            return Page(
+                items=[record for record in records if record is not None],
+                next_token=json.dumps(offset + limit) if offset + limit < len(ids) else None,
+            )
+
+        token = json.loads(page_token) if page_token else {}
+        params: Dict[str, Any] = {
+            "Limit": limit,
+            "ProjectionExpression": "id",
+            "FilterExpression": Attr("version").gt(COUNTER_VERSION) & Attr("id").begins_with(selection),
+        }
+        if token.get("key"):
+            params["ExclusiveStartKey"] = token["key"]
+
+        response = self._table.scan(**params)
+        last_key = response.get("LastEvaluatedKey")
+
+        ids = [
+            id for id in dict.fromkeys(item["id"] for item in response.get("Items", []))
+            if id != token.get("last")
+        ]
+        records = [self._record_as_of(id, timestamp) for id in ids]
+
+        next_token = None
+        if last_key:
+            next_token = json.dumps({"key": _from_item(last_key), "last": ids[-1] if ids else token.get("last")})
+
+        return Page(items=[record for record in records if record is not None], next_token=next_token)
+
+
+    def scan(
+        self,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None,
+        segment: int = 0,
+        total_segments: int = 1
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through every stored version with a table scan.
+
+        Segments map onto DynamoDB parallel scan segments.
+
+        Args:
+            limit (int): The maximum number of records per page.
+            page_token (Optional[str]): The token of the page to fetch.
+            segment (int): The segment to scan, from 0 to `total_segments` - 1.
+            total_segments (int): The number of segments the table is split into.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        params: Dict[str, Any] = {
+            "Limit": limit,
+            "FilterExpression": Attr("version").gt(COUNTER_VERSION),
+        }
+        if total_segments > 1:
+            params["Segment"] = segment
+            params["TotalSegments"] = total_segments
+        if page_token:
+            params["ExclusiveStartKey"] = json.loads(page_token)
+
+        response = self._table.scan(**params)
+        last_key = response.get("LastEvaluatedKey")
+
+        return Page(
+            items=[self._record(item) for item in response.get("Items", [])],
+            next_token=json.dumps(_from_item(last_key)) if last_key else None,
+        )
+
+
+    def allocate_version(
+        self,
+        id: str
+    ) -> int:
+        """
+        Atomically reserve the next version number of a file.
+
+        Normally a single ADD on the counter item. The first allocation for
+        a file seeds the counter from its highest stored version with
+        if_not_exists, so concurrent seeders still agree.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            int: The reserved version number.
+        """
+
+        key = {"id": id, "version": COUNTER_VERSION}
+
+        try:
+            response = self._table.update_item(
+                Key=key,
+                UpdateExpression="ADD next_version :one",
+                ConditionExpression=Attr("next_version").exists(),
+                ExpressionAttributeValues={":one": 1},
+                ReturnValues="UPDATED_NEW"
+            )
+        except self._table.meta.client.exceptions.ConditionalCheckFailedException:
+            latest = self._table.query(
+                KeyConditionExpression=Key("id").eq(id) & Key("version").gt(COUNTER_VERSION),
+                ProjectionExpression="version",
+                ScanIndexForward=False,
+                Limit=1
+            ).get("Items", [])
+
+            response = self._table.update_item(
+                Key=key,
+                UpdateExpression="SET next_version = if_not_exists(next_version, :seed) + :one",
+                ExpressionAttributeValues={
+                    ":seed": latest[0]["version"] if latest else 0,
+                    ":one": 1,
+                },
+                ReturnValues="UPDATED_NEW"
+            )
+
+        return int(response["Attributes"]["next_version"])
+
+
+    def update_location(
+        self,
+        id: str,
+        version: int,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Change the storage path and attributes of one version.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+            path (str): The new storage path.
+            attributes (Optional[Dict[str, Any]]): The new storage-level attributes.
+
+        Returns:
+            None
+        """
+
+        self._table.update_item(
+            Key={"id": id, "version": version},
+            UpdateExpression="SET storage_path = :path, record_attributes = :attributes",
+            ExpressionAttributeValues={
+                ":path": path,
+                ":attributes": _to_item(attributes or {}),
+            },
+            ConditionExpression=Attr("id").exists()
+        )
+
+
+    def purge(
+        self,
+        versions: List[TVersion]
+    ) -> None:
+        """
+        Permanently remove specific versions and their index items with batched deletes.
+
+        Args:
+            versions (List[TVersion]): The versions to remove.
+
+        Returns:
+            None
+        """
+
+        with self._table.batch_writer() as batch:
+            for version in versions:
+                batch.delete_item(Key={"id": version.id, "version": version.version})
+
+        if not self._indexed_fields:
+            return
+
+        with self._index_table.batch_writer() as batch:
+            for version in versions:
+                for key in self._index_keys(_to_item(asdict(version))):
+                    batch.delete_item(Key=key)
+
+
+    def _query_all(
+        self,
+        **params
+    ) -> List[dict]:
+        """
+        Run a query and follow `LastEvaluatedKey` until every page is read.
+
+        A query page stops at 1 MB, so long version histories span pages.
+
+        Args:
+            **params: The query parameters.
+
+        Returns:
+            List[dict]: The items of all pages, in query order.
+        """
+
+        items = []
+
+        while True:
+            response = self._table.query(**params)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+    def _batch_get(
+        self,
+        keys: List[dict]
+    ) -> List[dict]:
+        """
+        Fetch version items by primary key, 100 keys per request.
+
+        Args:
+            keys (List[dict]): The primary keys to fetch.
+
+        Returns:
+            List[dict]: The items, in the order of the keys.
+        """
+
+        client = self._table.meta.client
+        found = {}
+
+        for start in range(0, len(keys), 100):
+            request = {self._table.name: {"Keys": keys[start:start + 100]}}
+
+            while request:
+                response = client.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self._table.name, []):
+                    found[(item["id"], item["version"])] = item
+                request = response.get("UnprocessedKeys") or None
+
+        return [found[k] for k in ((key["id"], key["version"]) for key in keys) if k in found]
+
+
+    def _record_as_of(
+        self,
+        id: str,
+        timestamp: datetime
+    ) -> Optional[VersionRecord[TVersion]]:
+        """
+        Find the record of a file that was active at a point in time.
+
+        The newest version created at or before `timestamp` is the only
+        candidate: if it was already deactivated then, so were all older ones.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time.
+
+        Returns:
+            Optional[VersionRecord[TVersion]]: The record, or None.
+        """
+
+        at = normalize_timestamp(timestamp).isoformat()
+
+        if self._as_of_index:
+            items = self._table.query(
+                IndexName=self._as_of_index,
+                KeyConditionExpression=Key("id").eq(id) & Key("created_at").lte(at),
+                ScanIndexForward=False,
+                Limit=1
+            ).get("Items", [])
+        else:
+            params: Dict[str, Any] = {
+                "KeyConditionExpression": Key("id").eq(id) & Key("version").gt(COUNTER_VERSION),
+                "FilterExpression": Attr("created_at").lte(at),
+                "ScanIndexForward": False,
+            }
+            while True:
+                response = self._table.query(**params)
+                items = response.get("Items", [])
+                if items or "LastEvaluatedKey" not in response:
+                    break
+                params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        if not items:
+            return None
+
+        item = items[0]
+        deactivated_at = item.get("deactivated_at")
+        if not active_at(
+            datetime.fromisoformat(item["created_at"]),
+            datetime.fromisoformat(deactivated_at) if deactivated_at else None,
+            item["status"],
+            timestamp,
+        ):
+            return None
+
+        return self._record(item)
+
+
+    def _set_status(
+        self,
+        item: dict,
+        status: str
+    ) -> None:
+        """
+        Update the status of one version and of its index items.
+
+        Leaving ACTIVE stamps `deactivated_at` for point-in-time reads, and
+        becoming DELETED stamps `deleted_at` for retention.
+
+        Args:
+            item (dict): The raw version item.
+            status (str): The new status.
+
+        Returns:
+            None
+        """
+
+        stamps = []
+        if item.get("status") == "ACTIVE":
+            stamps.append("deactivated_at = :now")
+        if status == "DELETED" and item.get("status") != "DELETED":
+            stamps.append("deleted_at = :now")
+
+        self._table.update_item(
+            Key={"id": item["id"], "version": item["version"]},
+            UpdateExpression=", ".join(["SET #s = :status", *stamps]),
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={
+                ":status": status,
+                **({":now": datetime.now().isoformat()} if stamps else {}),
+            }
+        )
+
+        for key in self._index_keys(item):
+            self._index_table.update_item(
+                Key=key,
+                UpdateExpression="SET #s = :status",
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={":status": status}
+            )
+
+
+    def _write_index(
+        self,
+        item: dict
+    ) -> None:
+        """
+        Write the index items of one version.
+
+        Args:
+            item (dict): The raw version item.
+
+        Returns:
+            None
+        """
+
+        keys = self._index_keys(item)
+        if not keys:
+            return
+
+        with self._index_table.batch_writer() as batch:
+            for key in keys:
+                batch.put_item(
+                    Item={
+                        **key,
+                        "id": item["id"],
+                        "version": item["version"],
+                        "status": item["status"],
+                    }
+                )
+
+
+    def _record(
+        self,
+        item: dict
+    ) -> VersionRecord[TVersion]:
+        deactivated_at = item.get("deactivated_at")
+        deleted_at = item.get("deleted_at")
+        return VersionRecord(
+            version=self._deserialize(item),
+            storage_path=item.get("storage_path"),
+            attributes=_from_item(item.get("record_attributes", {})),
+            deactivated_at=datetime.fromisoformat(deactivated_at) if deactivated_at else None,
+            deleted_at=datetime.fromisoformat(deleted_at) if deleted_at else None,
+        )
+
+
+    def _index_keys(
+        self,
+        item: dict
+    ) -> List[dict]:
+        ref = f"{item['id']}#{int(item['version']):010d}"
+        return [
+            {"key": f"{field}#{value}", "ref": ref}
+            for field in self._indexed_fields
+            for value in index_values(item, field)
+        ]
 
 
     def _deserialize(
@@ -186,5 +829,10 @@ class DynamoFileMetadataRepository(FileMetadataRepository):
         """
 
         allowed_fields = self._version_cls.__dataclass_fields__.keys()
-        filtered = {k: v for k, v in item.items() if k in allowed_fields}
+        filtered = {k: _from_item(v) for k, v in item.items() if k in allowed_fields}
+
+        for name in self._datetime_fields:
+            if isinstance(filtered.get(name), str):
+                filtered[name] = datetime.fromisoformat(filtered[name])
+
         return self._version_cls(**filtered)
\ No newline at end of file
@@ -0,0 +1,67 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from typing import Optional
+
+# ---------------------------------------------------------------------
+# Third-party libraries
+# ---------------------------------------------------------------------
+from botocore.exceptions import (
+    ClientError,
+    ConnectionClosedError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.retry import THROTTLED, TRANSIENT
+
+
+THROTTLING_CODES = {
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+
+TRANSIENT_CODES = {
+    "InternalError",
+    "InternalServerError",
+    "RequestTimeout",
+    "RequestTimeoutException",
+    "ServiceUnavailable",
+    "TransactionInProgressException",
+}
+
+
+def classify_error(exc: BaseException) -> Optional[str]:
+    """
+    Classify a boto3 error for the retry controller.
+
+    Args:
+        exc (BaseException): The raised exception.
+
+    Returns:
+        Optional[str]: THROTTLED, TRANSIENT, or None if the error is permanent.
+    """
+
+    if isinstance(exc, (ConnectionClosedError, EndpointConnectionError, ReadTimeoutError)):
+        return TRANSIENT
+
+    if not isinstance(exc, ClientError):
+        return None
+
+    code = exc.response.get("Error", {}).get("Code", "")
+    status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+
+    if code in THROTTLING_CODES or status == 429:
+        return THROTTLED
+    if code in TRANSIENT_CODES or status in (500, 502, 503, 504):
+        return TRANSIENT
+    return None
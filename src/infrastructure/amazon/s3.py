@@ -1,12 +1,40 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import base64
+import hashlib
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 # ---------------------------------------------------------------------
 # Third-party libraries
 # ---------------------------------------------------------------------
+from botocore.exceptions import ClientError
 from types_boto3_s3.client import S3Client
 
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+from src.domain import tiers
+from src.domain.checksums import Checksums, crc32c
+from src.domain.entities import ObjectInfo, SignedRequest, UploadTarget
 from src.domain.repositories import FileStorage
+from src.infrastructure.streams import ViewReader
+
+
+STORAGE_CLASSES = {
+    tiers.HOT: "STANDARD",
+    tiers.WARM: "STANDARD_IA",
+    tiers.COLD: "GLACIER_IR",
+    tiers.ARCHIVE: "DEEP_ARCHIVE",
+}
+RESTORE_CLASSES = ("GLACIER", "DEEP_ARCHIVE")
+
+MAX_SINGLE_PUT = 5 * 1024 ** 3
+MIN_PART_SIZE = 5 * 1024 ** 2
+DEFAULT_PART_SIZE = 64 * 1024 ** 2
+MAX_PARTS = 10000
 
 
 class S3Storage(FileStorage):
@@ -38,28 +66,225 @@ class S3Storage(FileStorage):
         self,
         path: str,
         content: bytes,
-        content_type: str
+        content_type: str,
+        checksums: Checksums | None = None
     ) -> None:
         """
         Upload a file to S3.
 
+        With checksums, S3 validates the body against both the Content-MD5
+        and the CRC32C and rejects the request on a mismatch, so no read-back
+        is needed to confirm the object is intact.
+
         Args:
             path (str): The S3 object key (file path).
             content (bytes): The content of the file to upload.
             content_type (str): The MIME type of the file.
+            checksums (Checksums | None): Precomputed checksums of the content.
 
         Returns:
             None
         """
 
+        params = {}
+        if checksums is not None:
+            params["ContentMD5"] = checksums.md5
+            params["ChecksumCRC32C"] = checksums.crc32c
+
         self._client.put_object(
             Bucket=self._bucket,
             Key=path,
             Body=content,
-            ContentType=content_type
+            ContentType=content_type,
+            **params
+        )
+
+
+    def upload_multipart(
+        self,
+        path: str,
+        content: memoryview,
+        content_type: str,
+        checksums: Checksums | None = None,
+        *,
+        part_size: int | None = None,
+        concurrency: int = 8
+    ) -> None:
+        """
+        Upload a large file as a multipart upload with parts sent in parallel.
+
+        Parts are slices of `content`, streamed without copying. Every part
+        carries its own Content-MD5 so a corrupted part fails (and is retried)
+        on its own. With checksums, the object is completed with a full-object
+        CRC32C, which S3 checks against the assembled content. The upload is
+        aborted if any part fails.
+
+        Args:
+            path (str): The S3 object key (file path).
+            content (memoryview): The content of the file to upload.
+            content_type (str): The MIME type of the file.
+            checksums (Checksums | None): Precomputed checksums of the content.
+            part_size (int | None): The size of each part, 64 MiB if None.
+            concurrency (int): The number of parts uploaded at once.
+
+        Returns:
+            None
+        """
+
+        view = memoryview(content).cast("B")
+        size = len(view)
+        part_size = max(part_size or DEFAULT_PART_SIZE, MIN_PART_SIZE, math.ceil(size / MAX_PARTS))
+
+        if size <= part_size:
+            # A single part: the copy is bounded by the part size.
+            self.upload(path, bytes(view), content_type, checksums)
+            return
+
+        params = {}
+        if checksums is not None:
+            params = {"ChecksumAlgorithm": "CRC32C", "ChecksumType": "FULL_OBJECT"}
+
+        upload_id = self._client.create_multipart_upload(
+            Bucket=self._bucket,
+            Key=path,
+            ContentType=content_type,
+            **params
+        )["UploadId"]
+
+        def send(number: int) -> dict:
+            part = view[(number - 1) * part_size:number * part_size]
+            extra = {"ChecksumCRC32C": crc32c(part)} if checksums is not None else {}
+            response = self._client.upload_part(
+                Bucket=self._bucket,
+                Key=path,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=ViewReader(part),
+                ContentLength=len(part),
+                ContentMD5=base64.b64encode(hashlib.md5(part).digest()).decode("ascii"),
+                **extra
+            )
+            return {"ETag": response["ETag"], "PartNumber": number, **extra}
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                parts = list(pool.map(send, range(1, math.ceil(size / part_size) + 1)))
+
+            completion = {}
+            if checksums is not None:
+                completion = {"ChecksumCRC32C": checksums.crc32c, "ChecksumType": "FULL_OBJECT"}
+
+            self._client.complete_multipart_upload(
+                Bucket=self._bucket,
+                Key=path,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+                **completion
+            )
+        except Exception:
+            self._client.abort_multipart_upload(
+                Bucket=self._bucket,
+                Key=path,
+                UploadId=upload_id
+            )
+            raise
+
+
+    def download(
+        self,
+        path: str
+    ) -> bytes:
+        """
+        Download a file from S3.
+
+        Args:
+            path (str): The S3 object key (file path).
+
+        Returns:
+            bytes: The content of the file.
+        """
+
+        response = self._client.get_object(
+            Bucket=self._bucket,
+            Key=path
+        )
+        return response["Body"].read()
+
+
+    def copy(
+        self,
+        source: str,
+        destination: str
+    ) -> None:
+        """
+        Copy an object inside the bucket without downloading it.
+
+        Uses the managed copy, which switches to a multipart UploadPartCopy
+        for objects above the single-request CopyObject limit.
+
+        Args:
+            source (str): The S3 object key to copy.
+            destination (str): The S3 object key of the copy.
+
+        Returns:
+            None
+        """
+
+        self._client.copy(
+            {"Bucket": self._bucket, "Key": source},
+            self._bucket,
+            destination
         )
 
 
+    def download_range(
+        self,
+        path: str,
+        offset: int,
+        length: int
+    ) -> bytes:
+        """
+        Download a byte range of an object with a ranged GET.
+
+        Args:
+            path (str): The S3 object key.
+            offset (int): The first byte to read.
+            length (int): The number of bytes to read.
+
+        Returns:
+            bytes: The requested bytes.
+        """
+
+        response = self._client.get_object(
+            Bucket=self._bucket,
+            Key=path,
+            Range=f"bytes={offset}-{offset + length - 1}"
+        )
+        return response["Body"].read()
+
+
+    def list_objects(
+        self,
+        prefix: str
+    ) -> list[str]:
+        """
+        List the keys of all objects under a prefix.
+
+        Args:
+            prefix (str): The key prefix.
+
+        Returns:
+            list[str]: The object keys.
+        """
+
+        paginator = self._client.get_paginator("list_objects_v2")
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+
     def delete(
         self,
         path: str
@@ -91,6 +316,300 @@ class S3Storage(FileStorage):
             self._delete_batch(batch)
 
 
+    def delete_objects(
+        self,
+        paths: list[str]
+    ) -> None:
+        """
+        Delete specific objects from S3, 1000 keys per request.
+
+        Args:
+            paths (list[str]): The S3 object keys to delete.
+
+        Returns:
+            None
+        """
+
+        for start in range(0, len(paths), 1000):
+            self._delete_batch([{"Key": path} for path in paths[start:start + 1000]])
+
+
+    def transition(
+        self,
+        path: str,
+        tier: str
+    ) -> None:
+        """
+        Change the storage class of an object by copying it onto itself.
+
+        The managed copy keeps metadata and handles objects above the 5 GB
+        single-request copy limit.
+
+        Args:
+            path (str): The S3 object key.
+            tier (str): The target tier.
+
+        Returns:
+            None
+        """
+
+        self._client.copy(
+            {"Bucket": self._bucket, "Key": path},
+            self._bucket,
+            path,
+            ExtraArgs={
+                "StorageClass": STORAGE_CLASSES[tier],
+                "MetadataDirective": "COPY",
+            }
+        )
+
+
+    def restore(
+        self,
+        path: str,
+        days: int = 1
+    ) -> bool:
+        """
+        Start a restore of an archived object unless it is readable already.
+
+        Args:
+            path (str): The S3 object key.
+            days (int): How long the restored copy stays available.
+
+        Returns:
+            bool: True if the object can be read now.
+        """
+
+        head = self._client.head_object(Bucket=self._bucket, Key=path)
+
+        if head.get("StorageClass") not in RESTORE_CLASSES:
+            return True
+
+        status = head.get("Restore")
+        if status is None:
+            self._client.restore_object(
+                Bucket=self._bucket,
+                Key=path,
+                RestoreRequest={"Days": days, "GlacierJobParameters": {"Tier": "Standard"}}
+            )
+            return False
+
+        return 'ongoing-request="false"' in status
+
+
+    def stat(
+        self,
+        path: str
+    ) -> ObjectInfo | None:
+        """
+        Get the size, MD5 and content type of an object from its headers.
+
+        The ETag of a multipart object is not the MD5 of its content, so
+        `md5` is None for those.
+
+        Args:
+            path (str): The S3 object key.
+
+        Returns:
+            ObjectInfo | None: The object info, or None if the object does not exist.
+        """
+
+        try:
+            response = self._client.head_object(Bucket=self._bucket, Key=path)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+        etag = response.get("ETag", "").strip('"')
+        md5 = None
+        if etag and "-" not in etag:
+            md5 = base64.b64encode(bytes.fromhex(etag)).decode("ascii")
+
+        return ObjectInfo(
+            size=response["ContentLength"],
+            md5=md5,
+            content_type=response.get("ContentType"),
+        )
+
+
+    def signed_upload(
+        self,
+        path: str,
+        content_type: str,
+        size: int,
+        *,
+        md5: str | None = None,
+        expires: timedelta = timedelta(hours=1),
+        part_size: int | None = None
+    ) -> UploadTarget:
+        """
+        Issue a presigned PUT, or presigned part URLs of a multipart upload.
+
+        A single PUT is signed with the content type and, when given, the
+        Content-MD5, so S3 rejects a body that does not match. Objects above
+        the single PUT limit always use multipart.
+
+        Args:
+            path (str): The S3 object key.
+            content_type (str): The content type the client must send.
+            size (int): The size of the object in bytes.
+            md5 (str | None): The base64 MD5 the client must send, if known.
+            expires (timedelta): How long the URLs stay valid.
+            part_size (int | None): Split the upload into parts of this size.
+
+        Returns:
+            UploadTarget: The URLs to upload to.
+        """
+
+        seconds = int(expires.total_seconds())
+        expires_at = datetime.now(timezone.utc) + expires
+
+        if part_size is None and size > MAX_SINGLE_PUT:
+            part_size = DEFAULT_PART_SIZE
+
+        if part_size is None or size <= part_size:
+            params = {"Bucket": self._bucket, "Key": path, "ContentType": content_type}
+            headers = {"Content-Type": content_type}
+            if md5:
+                params["ContentMD5"] = md5
+                headers["Content-MD5"] = md5
+
+            url = self._client.generate_presigned_url(
+                "put_object",
+                Params=params,
+                ExpiresIn=seconds
+            )
+            return UploadTarget(
+                path=path,
+                requests=[SignedRequest(url=url, method="PUT", headers=headers, expires_at=expires_at)],
+            )
+
+        part_size = max(part_size, MIN_PART_SIZE, math.ceil(size / MAX_PARTS))
+        count = math.ceil(size / part_size)
+
+        upload_id = self._client.create_multipart_upload(
+            Bucket=self._bucket,
+            Key=path,
+            ContentType=content_type
+        )["UploadId"]
+
+        requests = [
+            SignedRequest(
+                url=self._client.generate_presigned_url(
+                    "upload_part",
+                    Params={
+                        "Bucket": self._bucket,
+                        "Key": path,
+                        "UploadId": upload_id,
+                        "PartNumber": number,
+                    },
+                    ExpiresIn=seconds
+                ),
+                method="PUT",
+                expires_at=expires_at,
+            )
+            for number in range(1, count + 1)
+        ]
+
+        return UploadTarget(path=path, requests=requests, upload_id=upload_id, part_size=part_size)
+
+
+    def complete_upload(
+        self,
+        target: UploadTarget,
+        parts: list[str] | None = None
+    ) -> None:
+        """
+        Assemble the parts of a multipart upload.
+
+        Args:
+            target (UploadTarget): The target returned by signed_upload.
+            parts (list[str] | None): The ETags returned for each part, in order.
+
+        Returns:
+            None
+        """
+
+        if target.upload_id is None:
+            return
+
+        if not parts or len(parts) != len(target.requests):
+            raise ValueError(
+                f"Expected {len(target.requests)} part ETags, got {len(parts or [])}"
+            )
+
+        self._client.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=target.path,
+            UploadId=target.upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": etag, "PartNumber": number}
+                    for number, etag in enumerate(parts, start=1)
+                ]
+            }
+        )
+
+
+    def abort_upload(
+        self,
+        target: UploadTarget
+    ) -> None:
+        """
+        Abort a multipart upload and delete any object already assembled.
+
+        Args:
+            target (UploadTarget): The target returned by signed_upload.
+
+        Returns:
+            None
+        """
+
+        if target.upload_id is not None:
+            try:
+                self._client.abort_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=target.path,
+                    UploadId=target.upload_id
+                )
+            except ClientError as exc:
+                # Already completed: the assembled object is removed below.
+                if exc.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                    raise
+
+        self._client.delete_object(Bucket=self._bucket, Key=target.path)
+
+
+    def signed_download(
+        self,
+        path: str,
+        *,
+        expires: timedelta = timedelta(hours=1)
+    ) -> SignedRequest:
+        """
+        Issue a presigned GET for an object.
+
+        Args:
+            path (str): The S3 object key.
+            expires (timedelta): How long the URL stays valid.
+
+        Returns:
+            SignedRequest: The download request.
+        """
+
+        url = self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self._bucket, "Key": path},
+            ExpiresIn=int(expires.total_seconds())
+        )
+        return SignedRequest(
+            url=url,
+            method="GET",
+            expires_at=datetime.now(timezone.utc) + expires,
+        )
+
+
     def _delete_batch(
         self,
         objects: list[dict]
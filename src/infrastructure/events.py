@@ -0,0 +1,115 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import json
+import os
+import queue
+import threading
+from abc import abstractmethod
+from typing import List
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.events import EventSink, FileEvent, event_to_dict
+
+
+class QueueEventSink(EventSink):
+    """
+    In-process sink that puts every event on a queue for local consumers.
+    """
+
+    def __init__(
+        self,
+        events: "queue.Queue[FileEvent] | None" = None
+    ):
+        """
+        Initialize the QueueEventSink.
+
+        Args:
+            events (queue.Queue[FileEvent] | None): The queue to publish to.
+
+        Returns:
+            None
+        """
+
+        self.events = events if events is not None else queue.Queue()
+
+
+    def publish(self, events: List[FileEvent]) -> None:
+        for event in events:
+            self.events.put(event)
+
+
+class JsonlEventSink(EventSink):
+    """
+    Appends events to a local JSON Lines log, one event per line.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        fsync: bool = True
+    ):
+        """
+        Initialize the JsonlEventSink.
+
+        Args:
+            path (str): The log file to append to.
+            fsync (bool): Whether to fsync after every batch.
+
+        Returns:
+            None
+        """
+
+        self._path = path
+        self._fsync = fsync
+        self._lock = threading.Lock()
+
+
+    def publish(self, events: List[FileEvent]) -> None:
+        lines = "".join(json.dumps(event_to_dict(event)) + "\n" for event in events)
+
+        with self._lock, open(self._path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            if self._fsync:
+                os.fsync(handle.fileno())
+
+
+class BrokerEventSink(EventSink):
+    """
+    Adapter base for message brokers (Pub/Sub, SNS/SQS, Kafka, ...).
+
+    Subclasses only implement `send` for one batch of encoded messages; a
+    raised exception leaves the batch in the outbox for redelivery.
+    """
+
+    def publish(self, events: List[FileEvent]) -> None:
+        self.send([self.encode(event) for event in events])
+
+
+    def encode(self, event: FileEvent) -> bytes:
+        """
+        Encode an event as a broker message body.
+
+        Args:
+            event (FileEvent): The event to encode.
+
+        Returns:
+            bytes: The message body.
+        """
+
+        return json.dumps(event_to_dict(event)).encode("utf-8")
+
+
+    @abstractmethod
+    def send(self, messages: List[bytes]) -> None:
+        """
+        Send a batch of encoded messages to the broker.
+
+        Args:
+            messages (List[bytes]): The message bodies, in emission order.
+        """
+        raise NotImplementedError
@@ -16,12 +16,15 @@ def firestore_client():
     )
 
 
-def gcs_client():
+def gcs_client(endpoint_url: str | None = None):
     """
-    Create a Google Cloud Storage client with default credentials.
+    Create a Google Cloud Storage client with default credentials, optionally
+    against an emulator such as fake-gcs-server.
     """
     credentials, project = default()
+    client_options = {"api_endpoint": endpoint_url} if endpoint_url else None
     return storage.Client(
         credentials=credentials,
-        project=project
+        project=project,
+        client_options=client_options
     )
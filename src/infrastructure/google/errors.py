@@ -0,0 +1,50 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+from typing import Optional
+
+# ---------------------------------------------------------------------
+# Third-party libraries
+# ---------------------------------------------------------------------
+from google.api_core import exceptions
+from requests.exceptions import ConnectionError, Timeout
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.application.retry import THROTTLED, TRANSIENT
+
+
+THROTTLING_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.ResourceExhausted,
+)
+
+TRANSIENT_ERRORS = (
+    exceptions.Aborted,
+    exceptions.BadGateway,
+    exceptions.DeadlineExceeded,
+    exceptions.GatewayTimeout,
+    exceptions.InternalServerError,
+    exceptions.ServiceUnavailable,
+    ConnectionError,
+    Timeout,
+)
+
+
+def classify_error(exc: BaseException) -> Optional[str]:
+    """
+    Classify a Google Cloud error for the retry controller.
+
+    Args:
+        exc (BaseException): The raised exception.
+
+    Returns:
+        Optional[str]: THROTTLED, TRANSIENT, or None if the error is permanent.
+    """
+
+    if isinstance(exc, THROTTLING_ERRORS):
+        return THROTTLED
+    if isinstance(exc, TRANSIENT_ERRORS):
+        return TRANSIENT
+    return None
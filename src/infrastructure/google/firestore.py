@@ -1,32 +1,110 @@
 # ---------------------------------------------------------------------
 # Standard library
 # ---------------------------------------------------------------------
-from typing import List, Optional, Type, TypeVar
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
 from dataclasses import asdict
 
 # ---------------------------------------------------------------------
 # Third-party library imports
 # ---------------------------------------------------------------------
-from google.cloud.firestore_v1 import FieldFilter, And
+from google.cloud.firestore_v1 import FieldFilter, And, transactional
 
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+from src.domain.entities import Page, VersionRecord
+from src.domain.indexing import parse_index, resolve_filters
 from src.domain.repositories import FileMetadataRepository
+from src.domain.snapshots import active_at, normalize_timestamp, prefix_end
 
 
 TVersion = TypeVar("TVersion")
 
+# The characters of auto-generated document IDs, in sort order.
+AUTO_ID_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def _id_range(
+    segment: int,
+    total_segments: int
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the document ID range of one scan segment.
+
+    Args:
+        segment (int): The segment, from 0 to `total_segments` - 1.
+        total_segments (int): The number of segments.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The inclusive lower and exclusive
+            upper bound; None where the segment is open-ended.
+    """
+
+    size = len(AUTO_ID_ALPHABET)
+    if not 0 < total_segments <= size:
+        raise ValueError(f"total_segments must be between 1 and {size}")
+
+    start = segment * size // total_segments
+    end = (segment + 1) * size // total_segments
+    lower = AUTO_ID_ALPHABET[start] if segment > 0 else None
+    upper = AUTO_ID_ALPHABET[end] if segment < total_segments - 1 else None
+    return lower, upper
+
+
+def _document_id(
+    id: str,
+    version: int
+) -> str:
+    """
+    Get the document ID of one version of a file.
+
+    The ID is a hash of the file ID and version spelled in the alphabet of
+    auto-generated IDs, so saving the same version again overwrites its
+    document, file IDs may contain "/", and scan segments stay balanced.
+
+    Args:
+        id (str): The ID of the file.
+        version (int): The version number.
+
+    Returns:
+        str: The 20-character document ID.
+    """
+
+    value = int.from_bytes(hashlib.sha256(f"{id}#{version}".encode("utf-8")).digest(), "big")
+    size = len(AUTO_ID_ALPHABET)
+    chars = []
+    for _ in range(20):
+        value, index = divmod(value, size)
+        chars.append(AUTO_ID_ALPHABET[index])
+    return "".join(chars)
+
 
 class FirestoreFileMetadataRepository(FileMetadataRepository):
     """
     Firestore implementation of the FileMetadataRepository interface.
+
+    Firestore indexes every field, nested map keys and array elements
+    included, so declared `indexed_fields` need no extra writes; they only
+    restrict `find` to fields whose single-field indexes are kept (not
+    exempted) in the collection's index configuration.
+
+    Deactivations are stamped as `deactivated_at`. Point-in-time reads need
+    a composite index on (id ASC, created_at DESC).
+
+    Each version is stored under a document ID derived from its file ID and
+    version number, so saves are idempotent: a replayed or retried save
+    overwrites the document instead of adding a duplicate.
     """
 
     def __init__(
         self,
         collection,
-        version_cls: Type[TVersion]
+        version_cls: Type[TVersion],
+        *,
+        indexed_fields: Sequence[str] = (),
+        counters=None
     ):
         """
         Initialize the FirestoreFileMetadataRepository with a Firestore collection and a version class.
@@ -34,6 +112,10 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
         Args:
             collection: The Firestore collection to use.
             version_cls (Type[TVersion]): The version class to use for deserialization.
+            indexed_fields (Sequence[str]): Secondary indexes, e.g. "metadata.customer"
+                or "segmentation_groups[]" for list fields.
+            counters: The collection holding per-file version counters,
+                defaulting to "<collection>_counters".
 
         Returns:
             None
@@ -41,6 +123,8 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
 
         self._collection = collection
         self._version_cls = version_cls
+        self._indexed_fields = tuple(indexed_fields)
+        self._counters = counters or collection._client.collection(f"{collection.id}_counters")
 
 
     def get_active(
@@ -57,13 +141,38 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
             Optional[TVersion]: The active version of the file, or None if not found.
         """
 
+        record = self.get_record(id)
+        return record.version if record else None
+
+
+    def get_record(
+        self,
+        id: str,
+        version: Optional[int] = None
+    ) -> Optional[VersionRecord[TVersion]]:
+        """
+        Get one version of a file together with its storage path.
+
+        Args:
+            id (str): The ID of the file.
+            version (Optional[int]): The version number, or None for the active version.
+
+        Returns:
+            Optional[VersionRecord[TVersion]]: The version record, or None if not found.
+        """
+
+        if version is None:
+            condition = FieldFilter("status", "==", "ACTIVE")
+        else:
+            condition = FieldFilter("version", "==", version)
+
         docs = list(
             self._collection
             .where(
                 filter=And(
                     [
                         FieldFilter("id", "==", id),
-                        FieldFilter("status", "==", "ACTIVE"),
+                        condition,
                     ]
                 )
             )
@@ -74,8 +183,7 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
         if not docs:
             return None
 
-        doc_dict = docs[0].to_dict()
-        return self._deserialize(doc_dict)
+        return self._record(docs[0].to_dict())
 
 
     def get_versions(
@@ -96,18 +204,20 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
             filter=FieldFilter("id", "==", id)
         ).stream()
 
-        return [self._version_cls(**doc.to_dict()) for doc in docs]
+        return [self._deserialize(doc.to_dict()) for doc in docs]
 
 
     def deactivate_versions(
         self,
-        id: str
+        id: str,
+        below: Optional[int] = None
     ) -> None:
         """
         Deactivate all versions of a file by its ID.
 
         Args:
             id (str): The ID of the file to deactivate.
+            below (Optional[int]): Only deactivate versions numbered below this one.
 
         Returns:
             None
@@ -122,8 +232,13 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
             )
         ).stream()
 
+        now = datetime.now()
         for doc in docs:
-            doc.reference.update({"status": "INACTIVE"})
+            # Filtered here rather than in the query, which would need a
+            # composite index with a range on version.
+            if below is not None and doc.get("version") >= below:
+                continue
+            doc.reference.update({"status": "INACTIVE", "deactivated_at": now})
 
 
     def delete_versions(
@@ -144,21 +259,377 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
             filter=FieldFilter("id", "==", id)
         ).stream()
 
+        now = datetime.now()
+        for doc in docs:
+            if doc.get("status") == "ACTIVE":
+                doc.reference.update({"status": "DELETED", "deactivated_at": now, "deleted_at": now})
+            elif doc.get("status") != "DELETED":
+                doc.reference.update({"status": "DELETED", "deleted_at": now})
+
+
+    def find(
+        self,
+        filters: Dict[str, Any],
+        *,
+        active_only: bool = True,
+        limit: int = 100,
+        page_token: Optional[str] = None
+    ) -> Page[TVersion]:
+        """
+        Find versions by equality filters on declared secondary indexes.
+
+        Args:
+            filters (Dict[str, Any]): Field path to value, e.g. {"metadata.customer": "ACME"}.
+            active_only (bool): Whether to return only active versions.
+            limit (int): The maximum number of versions per page.
+            page_token (Optional[str]): The document ID the previous page ended at.
+
+        Returns:
+            Page[TVersion]: The matching versions and the token of the next page.
+        """
+
+        resolved = resolve_filters(filters, self._indexed_fields)
+
+        conditions = []
+        for field, value in resolved.items():
+            path, is_array = parse_index(field)
+            conditions.append(FieldFilter(path, "array_contains" if is_array else "==", value))
+
+        if active_only:
+            conditions.append(FieldFilter("status", "==", "ACTIVE"))
+        else:
+            conditions.append(FieldFilter("status", "in", ["ACTIVE", "INACTIVE"]))
+
+        query = self._collection.where(filter=And(conditions)).limit(limit)
+
+        if page_token:
+            query = query.start_after(self._collection.document(page_token).get())
+
+        docs = list(query.stream())
+        next_token = docs[-1].id if len(docs) == limit else None
+
+        return Page(
+            items=[self._deserialize(doc.to_dict()) for doc in docs],
+            next_token=next_token,
+        )
+
+
+    def get_records(
+        self,
+        id: str
+    ) -> List[VersionRecord[TVersion]]:
+        """
+        Get all versions of a file together with their storage paths.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            List[VersionRecord[TVersion]]: The version records, newest first.
+        """
+
+        docs = self._collection.where(
+            filter=FieldFilter("id", "==", id)
+        ).stream()
+
+        records = [self._record(doc.to_dict()) for doc in docs]
+        return sorted(records, key=lambda r: r.version.version, reverse=True)
+
+
+    def get_as_of(
+        self,
+        id: str,
+        timestamp: datetime
+    ) -> Optional[TVersion]:
+        """
+        Get the version of a file that was active at a point in time.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+
+        Returns:
+            Optional[TVersion]: The version, or None if the file had no active version then.
+        """
+
+        record = self._record_as_of(id, timestamp)
+        return record.version if record else None
+
+
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through the records that were active at a point in time.
+
+        Every file costs one indexed query. A prefix is first resolved to a
+        page of file IDs with a range query on `id`.
+
+        Args:
+            selection (Sequence[str] | str): The file IDs, or an ID prefix.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+            limit (int): The maximum number of files per page.
+            page_token (Optional[str]): The token of the page to fetch.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        if not isinstance(selection, str):
+            ids = list(selection)
+            offset = int(page_token) if page_token else 0
+            chunk = ids[offset:offset + limit]
+            next_token = str(offset + limit) if offset + limit < len(ids) else None
+        else:
+            conditions = [FieldFilter("id", ">", page_token)] if page_token else []
+            conditions.append(FieldFilter("id", ">=", selection))
+            end = prefix_end(selection)
+            if end is not None:
+                conditions.append(FieldFilter("id", "<", end))
+
+            chunk = []
+            cursor = None
+            # Versions of one file share its ID, so pages are read until
+            # `limit` distinct IDs are collected.
+            while len(chunk) < limit:
+                query = self._collection.where(filter=And(conditions)).order_by("id").limit(limit)
+                if cursor is not None:
+                    query = query.start_after(cursor)
+                docs = list(query.stream())
+                for doc in docs:
+                    if not chunk or chunk[-1] != doc.get("id"):
+                        chunk.append(doc.get("id"))
+                if len(docs) < limit:
+                    break
+                cursor = docs[-1]
+
+            chunk = chunk[:limit]
+            next_token = chunk[-1] if len(chunk) == limit else None
+
+        records = [self._record_as_of(id, timestamp) for id in chunk]
+        return Page(items=[record for record in records if record], next_token=next_token)
+
+
+    def scan(
+        self,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None,
+        segment: int = 0,
+        total_segments: int = 1
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through every stored version in document ID order.
+
+        Segments are ranges of the document IDs, which are hashes spelled in
+        the auto-generated ID alphabet, split on their first character. Versions of one file have unrelated document
+        IDs, so unlike the other backends a file may span segments.
+
+        Args:
+            limit (int): The maximum number of records per page.
+            page_token (Optional[str]): The document ID the previous page ended at.
+            segment (int): The segment to scan, from 0 to `total_segments` - 1.
+            total_segments (int): The number of segments the collection is split into.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        query = self._collection.order_by("__name__").limit(limit)
+
+        if total_segments > 1:
+            lower, upper = _id_range(segment, total_segments)
+            if lower is not None:
+                query = query.where(filter=FieldFilter("__name__", ">=", self._collection.document(lower)))
+            if upper is not None:
+                query = query.where(filter=FieldFilter("__name__", "<", self._collection.document(upper)))
+
+        if page_token:
+            query = query.start_after(self._collection.document(page_token).get())
+
+        docs = list(query.stream())
+        next_token = docs[-1].id if len(docs) == limit else None
+
+        return Page(items=[self._record(doc.to_dict()) for doc in docs], next_token=next_token)
+
+
+    def allocate_version(
+        self,
+        id: str
+    ) -> int:
+        """
+        Atomically reserve the next version number of a file.
+
+        The counter document is read and incremented in one transaction,
+        which Firestore retries on contention. Its first use seeds it from
+        the highest stored version, read inside the same transaction. File
+        IDs may contain "/", so the counter is keyed by a hash of the ID.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            int: The reserved version number.
+        """
+
+        ref = self._counters.document(hashlib.sha256(id.encode("utf-8")).hexdigest())
+        versions = self._collection.where(filter=FieldFilter("id", "==", id))
+
+        @transactional
+        def allocate(transaction) -> int:
+            snapshot = ref.get(transaction=transaction)
+
+            if snapshot.exists:
+                value = snapshot.get("value") + 1
+            else:
+                value = max(
+                    (doc.get("version") for doc in transaction.get(versions)),
+                    default=0,
+                ) + 1
+
+            transaction.set(ref, {"id": id, "value": value})
+            return value
+
+        return allocate(self._collection._client.transaction())
+
+
+    def update_location(
+        self,
+        id: str,
+        version: int,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Change the storage path and attributes of one version.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+            path (str): The new storage path.
+            attributes (Optional[Dict[str, Any]]): The new storage-level attributes.
+
+        Returns:
+            None
+        """
+
+        docs = (
+            self._collection
+            .where(
+                filter=And(
+                    [
+                        FieldFilter("id", "==", id),
+                        FieldFilter("version", "==", version),
+                    ]
+                )
+            )
+            .stream()
+        )
+
         for doc in docs:
-            doc.reference.update({"status": "DELETED"})
+            doc.reference.update({"storage_path": path, "record_attributes": attributes or {}})
+
+
+    def purge(
+        self,
+        versions: List[TVersion]
+    ) -> None:
+        """
+        Permanently remove specific versions with batched deletes.
+
+        Args:
+            versions (List[TVersion]): The versions to remove.
+
+        Returns:
+            None
+        """
+
+        by_id: Dict[str, List[int]] = {}
+        for version in versions:
+            by_id.setdefault(version.id, []).append(version.version)
+
+        batch = self._collection._client.batch()
+        pending = 0
+
+        for id, numbers in by_id.items():
+            # Firestore "in" filters accept at most 30 values.
+            for start in range(0, len(numbers), 30):
+                docs = self._collection.where(
+                    filter=And(
+                        [
+                            FieldFilter("id", "==", id),
+                            FieldFilter("version", "in", numbers[start:start + 30]),
+                        ]
+                    )
+                ).stream()
+
+                for doc in docs:
+                    batch.delete(doc.reference)
+                    pending += 1
+
+                    if pending == 500:
+                        batch.commit()
+                        batch = self._collection._client.batch()
+                        pending = 0
+
+        if pending:
+            batch.commit()
+
+
+    def save_many(
+        self,
+        items: Iterable[Tuple]
+    ) -> None:
+        """
+        Save many file versions with batched writes of up to 500 documents.
+
+        Args:
+            items (Iterable[Tuple]): (version, storage path) pairs, optionally
+                followed by the record attributes.
+
+        Returns:
+            None
+        """
+
+        batch = self._collection._client.batch()
+        pending = 0
+
+        for version, path, *attributes in items:
+            data = asdict(version)
+            data["storage_path"] = path
+            if attributes and attributes[0]:
+                data["record_attributes"] = attributes[0]
+
+            batch.set(self._collection.document(_document_id(version.id, version.version)), data)
+            pending += 1
+
+            if pending == 500:
+                batch.commit()
+                batch = self._collection._client.batch()
+                pending = 0
+
+        if pending:
+            batch.commit()
 
 
     def save(
         self,
         version: TVersion,
-        path: str
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
     ) -> None:
         """
-        Save a file version to Firestore.
+        Save a file version to Firestore, replacing an earlier save of it.
 
         Args:
             version (TVersion): The file version to save.
             path (str): The storage path of the file.
+            attributes (Optional[Dict[str, Any]]): Storage-level attributes kept with the record.
 
         Returns:
             None
@@ -166,7 +637,53 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
 
         data = asdict(version)
         data["storage_path"] = path
-        self._collection.add(data)
+        if attributes:
+            data["record_attributes"] = attributes
+        self._collection.document(_document_id(version.id, version.version)).set(data)
+
+
+    def _record_as_of(
+        self,
+        id: str,
+        timestamp: datetime
+    ) -> Optional[VersionRecord[TVersion]]:
+        """
+        Find the record of a file that was active at a point in time.
+
+        The newest version created at or before `timestamp` is the only
+        candidate: if it was already deactivated then, so were all older ones.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time.
+
+        Returns:
+            Optional[VersionRecord[TVersion]]: The record, or None.
+        """
+
+        docs = list(
+            self._collection
+            .where(
+                filter=And(
+                    [
+                        FieldFilter("id", "==", id),
+                        FieldFilter("created_at", "<=", normalize_timestamp(timestamp)),
+                    ]
+                )
+            )
+            .order_by("created_at", direction="DESCENDING")
+            .limit(1)
+            .stream()
+        )
+
+        if not docs:
+            return None
+
+        item = docs[0].to_dict()
+        if not active_at(item.get("created_at"), item.get("deactivated_at"), item["status"], timestamp):
+            return None
+
+        return self._record(item)
 
 
     def _deserialize(
@@ -186,3 +703,26 @@ class FirestoreFileMetadataRepository(FileMetadataRepository):
         allowed_fields = self._version_cls.__dataclass_fields__.keys()
         filtered = {k: v for k, v in item.items() if k in allowed_fields}
         return self._version_cls(**filtered)
+
+
+    def _record(
+        self,
+        item: dict
+    ) -> VersionRecord[TVersion]:
+        """
+        Build a version record from a Firestore document.
+
+        Args:
+            item (dict): The Firestore document data.
+
+        Returns:
+            VersionRecord[TVersion]: The version record.
+        """
+
+        return VersionRecord(
+            version=self._deserialize(item),
+            storage_path=item.get("storage_path"),
+            attributes=item.get("record_attributes", {}),
+            deactivated_at=item.get("deactivated_at"),
+            deleted_at=item.get("deleted_at"),
+        )
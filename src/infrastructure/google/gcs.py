@@ -1,13 +1,52 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 # ---------------------------------------------------------------------
 # Third-party libraries
 # ---------------------------------------------------------------------
 from google.cloud.storage import Bucket
-from google.api_core.exceptions import Forbidden
+from google.cloud.storage.batch import Batch
+from google.api_core.exceptions import Forbidden, NotFound, from_http_response
 
 # ---------------------------------------------------------------------
 # Internal application imports
 # ---------------------------------------------------------------------
+from src.domain import tiers
+from src.domain.checksums import Checksums
+from src.domain.entities import ObjectInfo, SignedRequest, UploadTarget
 from src.domain.repositories import FileStorage
+from src.infrastructure.streams import ViewReader
+
+
+STORAGE_CLASSES = {
+    tiers.HOT: "STANDARD",
+    tiers.WARM: "NEARLINE",
+    tiers.COLD: "COLDLINE",
+    tiers.ARCHIVE: "ARCHIVE",
+}
+
+RESUMABLE_CHUNK = 256 * 1024
+DEFAULT_PART_SIZE = 64 * 1024 ** 2
+MAX_COMPOSE_SOURCES = 32
+MAX_BATCH_SIZE = 100
+
+
+class _ResponseBatch(Batch):
+    """
+    Batch that keeps the sub-responses instead of raising on the first error.
+    """
+
+    def finish(
+        self,
+        raise_exception: bool = True
+    ) -> list:
+        self.responses = super().finish(raise_exception=False)
+        return self.responses
 
 
 class GCSStorage(FileStorage):
@@ -17,43 +56,221 @@ class GCSStorage(FileStorage):
 
     def __init__(
         self,
-        bucket: Bucket
+        bucket: Bucket,
+        *,
+        url_endpoint: str | None = None
     ):
         """
         Initialize the GCSStorage with a Google Cloud Storage bucket.
 
         Args:
             bucket (Bucket): The Google Cloud Storage bucket to use.
+            url_endpoint (str | None): The host signed URLs point at, e.g. an emulator.
 
         Returns:
             None
         """
         self._bucket = bucket
+        self._url_endpoint = url_endpoint
 
 
     def upload(
         self,
         path: str,
         content: bytes,
-        content_type: str
+        content_type: str,
+        checksums: Checksums | None = None
     ) -> None:
         """
         Upload a file to Google Cloud Storage.
 
+        With checksums, the CRC32C and MD5 are sent in the object resource and
+        Cloud Storage rejects the upload if the stored bytes do not match.
+
         Args:
             path (str): The path to the file in Google Cloud Storage.
             content (bytes): The content of the file to upload.
             content_type (str): The MIME type of the file.
+            checksums (Checksums | None): Precomputed checksums of the content.
 
         Returns:
             None
         """
 
         blob = self._bucket.blob(path)
+        if checksums is not None:
+            blob.crc32c = checksums.crc32c
+            blob.md5_hash = checksums.md5
         blob.upload_from_string(content, content_type=content_type)
         print(f"Uploaded to {path} in bucket {self._bucket.name}")
 
 
+    def upload_multipart(
+        self,
+        path: str,
+        content: memoryview,
+        content_type: str,
+        checksums: Checksums | None = None,
+        *,
+        part_size: int | None = None,
+        concurrency: int = 8
+    ) -> None:
+        """
+        Upload a large file as parallel part objects composed into one.
+
+        Parts are slices of `content`, streamed without copying, and are
+        uploaded as temporary objects next to the target, each with its own
+        MD5. They are composed at most 32 at a time, in rounds when there are
+        more, and deleted afterwards. A composite object has no MD5, so with
+        checksums its CRC32C is compared with the expected one and the object
+        is deleted on a mismatch.
+
+        Args:
+            path (str): The path to the file in Google Cloud Storage.
+            content (memoryview): The content of the file to upload.
+            content_type (str): The MIME type of the file.
+            checksums (Checksums | None): Precomputed checksums of the content.
+            part_size (int | None): The size of each part, 64 MiB if None.
+            concurrency (int): The number of parts uploaded at once.
+
+        Returns:
+            None
+        """
+
+        view = memoryview(content).cast("B")
+        size = len(view)
+        part_size = part_size or DEFAULT_PART_SIZE
+
+        if size <= part_size:
+            # A single part: the copy is bounded by the part size.
+            self.upload(path, bytes(view), content_type, checksums)
+            return
+
+        prefix = f"{path}.parts/{uuid.uuid4().hex}"
+        temporary: list[str] = []
+
+        def send(index: int) -> str:
+            name = f"{prefix}/{index:05d}"
+            part = view[index * part_size:(index + 1) * part_size]
+            blob = self._bucket.blob(name)
+            blob.upload_from_file(ViewReader(part), size=len(part), content_type=content_type, checksum="md5")
+            return name
+
+        def compose(item: tuple) -> str:
+            name, sources = item
+            blob = self._bucket.blob(name)
+            blob.content_type = content_type
+            blob.compose([self._bucket.blob(source) for source in sources])
+            return name
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                names = list(pool.map(send, range(math.ceil(size / part_size))))
+                temporary.extend(names)
+
+                level = 0
+                while len(names) > MAX_COMPOSE_SOURCES:
+                    groups = [
+                        (f"{prefix}/compose-{level}-{index:05d}", names[start:start + MAX_COMPOSE_SOURCES])
+                        for index, start in enumerate(range(0, len(names), MAX_COMPOSE_SOURCES))
+                    ]
+                    names = list(pool.map(compose, groups))
+                    temporary.extend(names)
+                    level += 1
+
+            compose((path, names))
+
+            if checksums is not None:
+                blob = self._bucket.get_blob(path)
+                if blob is None or blob.crc32c != checksums.crc32c:
+                    self._bucket.blob(path).delete()
+                    raise ValueError(f"CRC32C mismatch after composing {path}")
+        finally:
+            self.delete_objects(temporary)
+
+
+    def download(
+        self,
+        path: str
+    ) -> bytes:
+        """
+        Download a file from Google Cloud Storage.
+
+        Args:
+            path (str): The path to the file in Google Cloud Storage.
+
+        Returns:
+            bytes: The content of the file.
+        """
+
+        return self._bucket.blob(path).download_as_bytes()
+
+
+    def copy(
+        self,
+        source: str,
+        destination: str
+    ) -> None:
+        """
+        Copy an object inside the bucket without downloading it.
+
+        Uses the rewrite API, which may need several calls for large objects
+        or copies across locations and storage classes.
+
+        Args:
+            source (str): The path of the object to copy.
+            destination (str): The path of the copy.
+
+        Returns:
+            None
+        """
+
+        source_blob = self._bucket.blob(source)
+        destination_blob = self._bucket.blob(destination)
+
+        token, _, _ = destination_blob.rewrite(source_blob)
+        while token is not None:
+            token, _, _ = destination_blob.rewrite(source_blob, token=token)
+
+
+    def download_range(
+        self,
+        path: str,
+        offset: int,
+        length: int
+    ) -> bytes:
+        """
+        Download a byte range of an object.
+
+        Args:
+            path (str): The path to the file in Google Cloud Storage.
+            offset (int): The first byte to read.
+            length (int): The number of bytes to read.
+
+        Returns:
+            bytes: The requested bytes.
+        """
+
+        return self._bucket.blob(path).download_as_bytes(start=offset, end=offset + length - 1)
+
+
+    def list_objects(
+        self,
+        prefix: str
+    ) -> list[str]:
+        """
+        List the paths of all objects under a prefix.
+
+        Args:
+            prefix (str): The path prefix.
+
+        Returns:
+            list[str]: The object paths.
+        """
+
+        return [blob.name for blob in self._bucket.list_blobs(prefix=prefix)]
+
+
     def delete(
         self,
         path: str
@@ -84,4 +301,222 @@ class GCSStorage(FileStorage):
         except Forbidden as exc:
             raise PermissionError(
                 f"Missing permission to delete objects under: {prefix}"
-            ) from exc
\ No newline at end of file
+            ) from exc
+
+
+    def delete_objects(
+        self,
+        paths: list[str]
+    ) -> None:
+        """
+        Delete specific objects from Google Cloud Storage in batch requests.
+
+        Every batch is sent in full; objects that are already gone are
+        ignored, and the first other failure is raised once its batch is
+        done.
+
+        Args:
+            paths (list[str]): The paths of the objects to delete.
+
+        Returns:
+            None
+        """
+
+        try:
+            for start in range(0, len(paths), MAX_BATCH_SIZE):
+                with _ResponseBatch(self._bucket.client) as batch:
+                    for path in paths[start:start + MAX_BATCH_SIZE]:
+                        self._bucket.blob(path).delete()
+
+                for response in batch.responses:
+                    if response.status_code != 404 and not 200 <= response.status_code < 300:
+                        raise from_http_response(response)
+        except Forbidden as exc:
+            raise PermissionError(
+                f"Missing permission to delete objects in bucket: {self._bucket.name}"
+            ) from exc
+
+
+    def transition(
+        self,
+        path: str,
+        tier: str
+    ) -> None:
+        """
+        Change the storage class of an object with a server-side rewrite.
+
+        Every Cloud Storage class serves reads directly, so no restore is
+        ever needed afterwards.
+
+        Args:
+            path (str): The path of the object.
+            tier (str): The target tier.
+
+        Returns:
+            None
+        """
+
+        self._bucket.blob(path).update_storage_class(STORAGE_CLASSES[tier])
+
+
+    def stat(
+        self,
+        path: str
+    ) -> ObjectInfo | None:
+        """
+        Get the size, MD5 and content type of an object from its metadata.
+
+        Composite objects have no MD5, so `md5` is None for those.
+
+        Args:
+            path (str): The path of the object.
+
+        Returns:
+            ObjectInfo | None: The object info, or None if the object does not exist.
+        """
+
+        blob = self._bucket.get_blob(path)
+
+        if blob is None:
+            return None
+
+        return ObjectInfo(size=blob.size, md5=blob.md5_hash, content_type=blob.content_type)
+
+
+    def signed_upload(
+        self,
+        path: str,
+        content_type: str,
+        size: int,
+        *,
+        md5: str | None = None,
+        expires: timedelta = timedelta(hours=1),
+        part_size: int | None = None
+    ) -> UploadTarget:
+        """
+        Issue a V4 signed PUT, or a resumable upload session for large objects.
+
+        The signed PUT binds the content type and, when given, the Content-MD5.
+        A resumable session URL needs no signature; the client sends chunks
+        that are multiples of 256 KiB with Content-Range headers.
+
+        Args:
+            path (str): The path of the object.
+            content_type (str): The content type the client must send.
+            size (int): The size of the object in bytes.
+            md5 (str | None): The base64 MD5 the client must send, if known.
+            expires (timedelta): How long the URLs stay valid.
+            part_size (int | None): Use a resumable session with chunks of this size.
+
+        Returns:
+            UploadTarget: The URLs to upload to.
+        """
+
+        blob = self._bucket.blob(path)
+        expires_at = datetime.now(timezone.utc) + expires
+
+        if part_size is None or size <= part_size:
+            headers = {"Content-Type": content_type}
+            if md5:
+                headers["Content-MD5"] = md5
+
+            url = blob.generate_signed_url(
+                version="v4",
+                expiration=expires,
+                method="PUT",
+                content_type=content_type,
+                content_md5=md5,
+                api_access_endpoint=self._url_endpoint
+            )
+            return UploadTarget(
+                path=path,
+                requests=[SignedRequest(url=url, method="PUT", headers=headers, expires_at=expires_at)],
+            )
+
+        chunk = max(RESUMABLE_CHUNK, part_size - part_size % RESUMABLE_CHUNK)
+        url = blob.create_resumable_upload_session(content_type=content_type, size=size)
+
+        return UploadTarget(
+            path=path,
+            requests=[
+                SignedRequest(
+                    url=url,
+                    method="PUT",
+                    headers={"Content-Type": content_type},
+                    expires_at=expires_at,
+                )
+            ],
+            part_size=chunk,
+        )
+
+
+    def complete_upload(
+        self,
+        target: UploadTarget,
+        parts: list[str] | None = None
+    ) -> None:
+        """
+        Finish a direct upload.
+
+        Both signed PUTs and resumable sessions finalize the object when the
+        last byte arrives, so there is nothing to assemble.
+
+        Args:
+            target (UploadTarget): The target returned by signed_upload.
+            parts (list[str] | None): Unused.
+
+        Returns:
+            None
+        """
+
+
+    def abort_upload(
+        self,
+        target: UploadTarget
+    ) -> None:
+        """
+        Delete an object uploaded directly.
+
+        Unfinished resumable sessions expire on their own after a week.
+
+        Args:
+            target (UploadTarget): The target returned by signed_upload.
+
+        Returns:
+            None
+        """
+
+        try:
+            self._bucket.blob(target.path).delete()
+        except NotFound:
+            pass
+
+
+    def signed_download(
+        self,
+        path: str,
+        *,
+        expires: timedelta = timedelta(hours=1)
+    ) -> SignedRequest:
+        """
+        Issue a V4 signed GET for an object.
+
+        Args:
+            path (str): The path of the object.
+            expires (timedelta): How long the URL stays valid.
+
+        Returns:
+            SignedRequest: The download request.
+        """
+
+        url = self._bucket.blob(path).generate_signed_url(
+            version="v4",
+            expiration=expires,
+            method="GET",
+            api_access_endpoint=self._url_endpoint
+        )
+        return SignedRequest(
+            url=url,
+            method="GET",
+            expires_at=datetime.now(timezone.utc) + expires,
+        )
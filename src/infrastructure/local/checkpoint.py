@@ -0,0 +1,174 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+
+class SqliteCheckpoint:
+    """
+    Local SQLite record of completed work items.
+
+    Each completed item is committed on its own so that an interrupted run
+    loses at most the items that were in flight when it stopped.
+    """
+
+    def __init__(
+        self,
+        path: str
+    ):
+        """
+        Initialize the SqliteCheckpoint, creating the database if needed.
+
+        Args:
+            path (str): The path to the SQLite database file.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completed (
+                item_key TEXT PRIMARY KEY,
+                file_id TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                completed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """
+        )
+
+
+    def pending(
+        self,
+        keys: Iterable[str]
+    ) -> List[str]:
+        """
+        Filter a batch of item keys down to those not yet completed.
+
+        Args:
+            keys (Iterable[str]): The item keys to check.
+
+        Returns:
+            List[str]: The keys that still need processing, in input order.
+        """
+
+        keys = list(keys)
+        if not keys:
+            return []
+
+        done = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT item_key FROM completed WHERE item_key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+            done.update(row[0] for row in rows)
+
+        return [key for key in keys if key not in done]
+
+
+    def mark_done(
+        self,
+        key: str,
+        file_id: str,
+        size_bytes: int
+    ) -> None:
+        """
+        Record an item as completed.
+
+        Args:
+            key (str): The item key.
+            file_id (str): The ID the item was stored under.
+            size_bytes (int): The size of the item.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completed VALUES (?, ?, ?, ?)",
+                (key, file_id, size_bytes, time.time())
+            )
+
+
+    def count(self) -> int:
+        """
+        Count completed items.
+
+        Returns:
+            int: The number of completed items.
+        """
+
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completed").fetchone()[0]
+
+
+    def get_state(
+        self,
+        key: str
+    ) -> Optional[str]:
+        """
+        Read a value from the checkpoint state table.
+
+        Args:
+            key (str): The state key.
+
+        Returns:
+            Optional[str]: The stored value, or None if missing.
+        """
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+
+    def set_state(
+        self,
+        key: str,
+        value: str
+    ) -> None:
+        """
+        Write a value to the checkpoint state table.
+
+        Args:
+            key (str): The state key.
+            value (str): The value to store.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state VALUES (?, ?)", (key, value)
+            )
+
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+
+        with self._lock:
+            self._conn.close()
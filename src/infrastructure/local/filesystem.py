@@ -0,0 +1,269 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.checksums import Checksums
+from src.domain.entities import ObjectInfo
+from src.domain.repositories import FileStorage
+
+
+class LocalFileStorage(FileStorage):
+    """
+    Local filesystem implementation of FileStorage for self-hosted nodes.
+    """
+
+    def __init__(
+        self,
+        root: str
+    ):
+        """
+        Initialize the LocalFileStorage with a root directory.
+
+        Args:
+            root (str): The directory objects are stored under.
+
+        Returns:
+            None
+        """
+
+        self._root = Path(root).resolve()
+        self._root.mkdir(parents=True, exist_ok=True)
+
+
+    def upload(
+        self,
+        path: str,
+        content: bytes,
+        content_type: str,
+        checksums: Checksums | None = None
+    ) -> None:
+        """
+        Write a file atomically under the root directory.
+
+        Args:
+            path (str): The relative path of the file.
+            content (bytes): The content of the file to upload.
+            content_type (str): The MIME type of the file (unused on disk).
+            checksums (Checksums | None): Unused; the bytes never leave the process.
+
+        Returns:
+            None
+        """
+
+        target = self._resolve(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+    def download(
+        self,
+        path: str
+    ) -> bytes:
+        """
+        Read a file from under the root directory.
+
+        Args:
+            path (str): The relative path of the file.
+
+        Returns:
+            bytes: The content of the file.
+        """
+
+        return self._resolve(path).read_bytes()
+
+
+    def copy(
+        self,
+        source: str,
+        destination: str
+    ) -> None:
+        """
+        Copy a file under the root directory.
+
+        Args:
+            source (str): The relative path of the file to copy.
+            destination (str): The relative path of the copy.
+
+        Returns:
+            None
+        """
+
+        target = self._resolve(destination)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".upload-")
+        os.close(fd)
+        try:
+            shutil.copyfile(self._resolve(source), tmp)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+    def download_range(
+        self,
+        path: str,
+        offset: int,
+        length: int
+    ) -> bytes:
+        """
+        Read a byte range of a file under the root directory.
+
+        Args:
+            path (str): The relative path of the file.
+            offset (int): The first byte to read.
+            length (int): The number of bytes to read.
+
+        Returns:
+            bytes: The requested bytes.
+        """
+
+        with open(self._resolve(path), "rb") as handle:
+            handle.seek(offset)
+            return handle.read(length)
+
+
+    def list_objects(
+        self,
+        prefix: str
+    ) -> list[str]:
+        """
+        List the relative paths of all files under a prefix.
+
+        Args:
+            prefix (str): The relative path prefix.
+
+        Returns:
+            list[str]: The file paths.
+        """
+
+        base = self._resolve(prefix.rstrip("/")) if prefix.strip("/") else self._root
+        directory = base if base.is_dir() else base.parent
+
+        return sorted(
+            path.relative_to(self._root).as_posix()
+            for path in directory.rglob("*")
+            if path.is_file()
+            and not path.name.startswith(".upload-")
+            and path.relative_to(self._root).as_posix().startswith(prefix)
+        )
+
+
+    def delete(
+        self,
+        path: str
+    ) -> None:
+        """
+        Delete every file under a prefix directory.
+
+        Args:
+            path (str): The relative prefix to delete.
+
+        Returns:
+            None
+        """
+
+        target = self._resolve(path.rstrip("/"))
+
+        if target.is_dir():
+            shutil.rmtree(target)
+
+
+    def delete_objects(
+        self,
+        paths: list[str]
+    ) -> None:
+        """
+        Delete specific files under the root directory.
+
+        Args:
+            paths (list[str]): The relative paths of the files.
+
+        Returns:
+            None
+        """
+
+        for path in paths:
+            self._resolve(path).unlink(missing_ok=True)
+
+
+    def transition(
+        self,
+        path: str,
+        tier: str
+    ) -> None:
+        """
+        Accept a tier change; a local disk has a single storage class.
+
+        Args:
+            path (str): The relative path of the file.
+            tier (str): The target tier.
+
+        Returns:
+            None
+        """
+
+        if not self._resolve(path).is_file():
+            raise FileNotFoundError(path)
+
+
+    def stat(
+        self,
+        path: str
+    ) -> ObjectInfo | None:
+        """
+        Get the size and MD5 of a file under the root directory.
+
+        Args:
+            path (str): The relative path of the file.
+
+        Returns:
+            ObjectInfo | None: The file info, or None if the file does not exist.
+        """
+
+        target = self._resolve(path)
+
+        if not target.is_file():
+            return None
+
+        digest = hashlib.md5()
+        with open(target, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return ObjectInfo(
+            size=target.stat().st_size,
+            md5=base64.b64encode(digest.digest()).decode("ascii"),
+        )
+
+
+    def _resolve(
+        self,
+        path: str
+    ) -> Path:
+        target = (self._root / path).resolve()
+
+        if target != self._root and self._root not in target.parents:
+            raise PermissionError(f"Path escapes storage root: {path}")
+
+        return target
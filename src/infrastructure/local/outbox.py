@@ -0,0 +1,84 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import json
+import sqlite3
+import threading
+from typing import List
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.events import EventOutbox, FileEvent, event_from_dict, event_to_dict
+
+
+class SqliteEventOutbox(EventOutbox):
+    """
+    Durable outbox in a local SQLite database.
+
+    Events survive a crash between emission and delivery, and are read back
+    in insertion order.
+    """
+
+    def __init__(
+        self,
+        path: str
+    ):
+        """
+        Initialize the SqliteEventOutbox, creating the database if needed.
+
+        Args:
+            path (str): The path to the SQLite database file.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id TEXT NOT NULL UNIQUE,
+                body TEXT NOT NULL
+            )
+            """
+        )
+
+
+    def append(self, event: FileEvent) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (event_id, body) VALUES (?, ?)",
+                (event.event_id, json.dumps(event_to_dict(event)))
+            )
+
+
+    def pending(self, limit: int) -> List[FileEvent]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM outbox ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [event_from_dict(json.loads(row[0])) for row in rows]
+
+
+    def acknowledge(self, event_ids: List[str]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM outbox WHERE event_id = ?",
+                ((event_id,) for event_id in event_ids)
+            )
+            self._conn.execute("COMMIT")
+
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,132 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import sqlite3
+import threading
+import time
+from typing import List
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.entities import ReclaimTask
+from src.domain.repositories import ReclaimQueue
+
+
+class SqliteReclaimQueue(ReclaimQueue):
+    """
+    Durable reclaim queue in a local SQLite database.
+
+    Leased tasks are hidden until their lease expires, so a worker that dies
+    mid-delete simply lets the task become due again.
+    """
+
+    def __init__(
+        self,
+        path: str
+    ):
+        """
+        Initialize the SqliteReclaimQueue, creating the database if needed.
+
+        Args:
+            path (str): The path to the SQLite database file.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reclaim (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                prefix TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                due_at REAL NOT NULL,
+                state TEXT NOT NULL DEFAULT 'PENDING',
+                error TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS reclaim_due ON reclaim (due_at) WHERE state = 'PENDING'"
+        )
+
+
+    def enqueue(self, prefix: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO reclaim (prefix, due_at) VALUES (?, ?)",
+                (prefix, time.time())
+            )
+
+
+    def lease(self, limit: int, lease_seconds: float) -> List[ReclaimTask]:
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT task_id, prefix, attempts FROM reclaim "
+                    "WHERE state = 'PENDING' AND due_at <= ? ORDER BY due_at LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE reclaim SET due_at = ? WHERE task_id = ?",
+                    ((now + lease_seconds, row[0]) for row in rows)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [ReclaimTask(task_id=row[0], prefix=row[1], attempts=row[2]) for row in rows]
+
+
+    def complete(self, task: ReclaimTask) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM reclaim WHERE task_id = ?", (task.task_id,))
+
+
+    def retry(self, task: ReclaimTask, delay: float, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reclaim SET attempts = attempts + 1, due_at = ?, error = ? WHERE task_id = ?",
+                (time.time() + delay, error, task.task_id)
+            )
+
+
+    def fail(self, task: ReclaimTask, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reclaim SET attempts = attempts + 1, state = 'FAILED', error = ? "
+                "WHERE task_id = ?",
+                (error, task.task_id)
+            )
+
+
+    def count(self) -> int:
+        """
+        Count tasks still waiting to be reclaimed.
+
+        Returns:
+            int: The number of pending tasks.
+        """
+
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM reclaim WHERE state = 'PENDING'"
+            ).fetchone()[0]
+
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,137 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import sqlite3
+import threading
+import time
+from typing import List
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.entities import RepairTask
+from src.domain.repositories import RepairQueue
+
+
+class SqliteRepairQueue(RepairQueue):
+    """
+    Durable replica repair queue in a local SQLite database.
+
+    Leased tasks are hidden until their lease expires, so a worker that dies
+    mid-repair simply lets the task become due again.
+    """
+
+    def __init__(
+        self,
+        path: str
+    ):
+        """
+        Initialize the SqliteRepairQueue, creating the database if needed.
+
+        Args:
+            path (str): The path to the SQLite database file.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repair (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                replica TEXT NOT NULL,
+                op TEXT NOT NULL,
+                path TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                due_at REAL NOT NULL,
+                state TEXT NOT NULL DEFAULT 'PENDING',
+                error TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS repair_due ON repair (due_at) WHERE state = 'PENDING'"
+        )
+
+
+    def enqueue(self, replica: str, op: str, path: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO repair (replica, op, path, due_at) VALUES (?, ?, ?, ?)",
+                (replica, op, path, time.time())
+            )
+
+
+    def lease(self, limit: int, lease_seconds: float) -> List[RepairTask]:
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT task_id, replica, op, path, attempts FROM repair "
+                    "WHERE state = 'PENDING' AND due_at <= ? ORDER BY due_at LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE repair SET due_at = ? WHERE task_id = ?",
+                    ((now + lease_seconds, row[0]) for row in rows)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [
+            RepairTask(task_id=row[0], replica=row[1], op=row[2], path=row[3], attempts=row[4])
+            for row in rows
+        ]
+
+
+    def complete(self, task: RepairTask) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM repair WHERE task_id = ?", (task.task_id,))
+
+
+    def retry(self, task: RepairTask, delay: float, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE repair SET attempts = attempts + 1, due_at = ?, error = ? WHERE task_id = ?",
+                (time.time() + delay, error, task.task_id)
+            )
+
+
+    def fail(self, task: RepairTask, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE repair SET attempts = attempts + 1, state = 'FAILED', error = ? "
+                "WHERE task_id = ?",
+                (error, task.task_id)
+            )
+
+
+    def count(self) -> int:
+        """
+        Count repairs still waiting to be applied.
+
+        Returns:
+            int: The number of pending tasks.
+        """
+
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM repair WHERE state = 'PENDING'"
+            ).fetchone()[0]
+
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,800 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import json
+import sqlite3
+import threading
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+# ---------------------------------------------------------------------
+# Internal application imports
+# ---------------------------------------------------------------------
+from src.domain.entities import Page, VersionRecord
+from src.domain.indexing import index_values, resolve_filters
+from src.domain.repositories import FileMetadataRepository
+from src.domain.snapshots import normalize_timestamp, prefix_end
+
+
+TVersion = TypeVar("TVersion")
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(value: dict) -> Any:
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def _segment(id: str, total: int) -> int:
+    return zlib.crc32(id.encode("utf-8")) % total
+
+
+class SqliteFileMetadataRepository(FileMetadataRepository):
+    """
+    SQLite implementation of the FileMetadataRepository interface.
+
+    Each thread gets its own connection, the database runs in WAL mode so
+    readers never block the writer, and a partial index covers only active
+    versions so `get_active` stays a single index probe however long the
+    history grows.
+
+    Deactivations are stamped on the row, and an index over (id,
+    created_at, deactivated_at) answers point-in-time reads with one probe
+    per file.
+
+    Declared `indexed_fields` are maintained in a side table of
+    (field, value, id, version, status) rows written in the same
+    transaction as the version itself.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        version_cls: Type[TVersion],
+        *,
+        table: str = "file_versions",
+        indexed_fields: Sequence[str] = ()
+    ):
+        """
+        Initialize the SqliteFileMetadataRepository, creating the schema if needed.
+
+        Args:
+            database (str): The path to the SQLite database file.
+            version_cls (Type[TVersion]): The version class to use for deserialization.
+            table (str): The table name.
+            indexed_fields (Sequence[str]): Secondary indexes, e.g. "metadata.customer"
+                or "segmentation_groups[]" for list fields.
+
+        Returns:
+            None
+        """
+
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+
+        self._database = database
+        self._version_cls = version_cls
+        self._table = table
+        self._indexed_fields = tuple(indexed_fields)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        # Statements are built once so sqlite3's statement cache reuses the
+        # compiled form on every call.
+        self._sql_get_active = (
+            f"SELECT data, status, storage_path, attributes FROM {table} "
+            f"WHERE id = ? AND status = 'ACTIVE' ORDER BY version DESC LIMIT 1"
+        )
+        self._sql_get_version = (
+            f"SELECT data, status, storage_path, attributes FROM {table} WHERE id = ? AND version = ?"
+        )
+        self._sql_get_versions = (
+            f"SELECT data, status FROM {table} WHERE id = ? ORDER BY version DESC"
+        )
+        self._sql_save = (
+            f"INSERT OR REPLACE INTO {table} "
+            f"(id, version, status, created_at, storage_path, data, attributes) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?)"
+        )
+        self._sql_deactivate = (
+            f"UPDATE {table} SET status = 'INACTIVE', deactivated_at = ? "
+            f"WHERE id = ? AND status = 'ACTIVE' AND version < ?"
+        )
+        self._sql_delete = (
+            f"UPDATE {table} SET status = 'DELETED', "
+            f"deactivated_at = CASE WHEN status = 'ACTIVE' THEN ? ELSE deactivated_at END, "
+            f"deleted_at = CASE WHEN status != 'DELETED' THEN ? ELSE deleted_at END "
+            f"WHERE id = ?"
+        )
+        self._sql_index_save = (
+            f"INSERT OR REPLACE INTO {table}_index (field, value, id, version, status) "
+            f"VALUES (?, ?, ?, ?, ?)"
+        )
+        self._sql_index_clear = f"DELETE FROM {table}_index WHERE id = ? AND version = ?"
+        self._sql_index_deactivate = (
+            f"UPDATE {table}_index SET status = 'INACTIVE' "
+            f"WHERE id = ? AND status = 'ACTIVE' AND version < ?"
+        )
+        self._sql_index_delete = f"UPDATE {table}_index SET status = 'DELETED' WHERE id = ?"
+        self._sql_get_records = (
+            f"SELECT data, status, storage_path, attributes, deactivated_at, deleted_at FROM {table} "
+            f"WHERE id = ? ORDER BY version DESC"
+        )
+        self._sql_scan = (
+            f"SELECT data, status, storage_path, attributes, id, version FROM {table} "
+            f"WHERE (id, version) > (?, ?) ORDER BY id, version LIMIT ?"
+        )
+        self._sql_scan_segment = (
+            f"SELECT data, status, storage_path, attributes, id, version FROM {table} "
+            f"WHERE (id, version) > (?, ?) AND file_segment(id, ?) = ? "
+            f"ORDER BY id, version LIMIT ?"
+        )
+        self._sql_purge = f"DELETE FROM {table} WHERE id = ? AND version = ?"
+        self._sql_allocate = (
+            f"INSERT INTO {table}_counters (id, value) "
+            f"VALUES (?, COALESCE((SELECT MAX(version) FROM {table} WHERE id = ?), 0) + 1) "
+            f"ON CONFLICT (id) DO UPDATE SET value = value + 1 RETURNING value"
+        )
+        as_of = (
+            "created_at <= ? AND (deactivated_at > ? "
+            "OR (deactivated_at IS NULL AND status != 'DELETED'))"
+        )
+        self._sql_get_as_of = (
+            f"SELECT data, status FROM {table} WHERE id = ? AND {as_of} "
+            f"ORDER BY created_at DESC LIMIT 1"
+        )
+        # SQLite returns the bare columns of the row that holds MAX(created_at).
+        self._sql_snapshot = (
+            f"SELECT data, status, storage_path, attributes, id, MAX(created_at) FROM {table} "
+            f"WHERE {{where}} AND {as_of} GROUP BY id ORDER BY id LIMIT ?"
+        )
+        self._sql_update_location = (
+            f"UPDATE {table} SET storage_path = ?, attributes = ? WHERE id = ? AND version = ?"
+        )
+
+        self._create_schema()
+
+
+    def get_active(
+        self,
+        id: str
+    ) -> Optional[TVersion]:
+        """
+        Get the active version of a file by its ID.
+
+        Args:
+            id (str): The ID of the file to retrieve.
+
+        Returns:
+            Optional[TVersion]: The active version of the file, or None if not found.
+        """
+
+        record = self.get_record(id)
+        return record.version if record else None
+
+
+    def get_record(
+        self,
+        id: str,
+        version: Optional[int] = None
+    ) -> Optional[VersionRecord[TVersion]]:
+        """
+        Get one version of a file together with its storage path.
+
+        Args:
+            id (str): The ID of the file.
+            version (Optional[int]): The version number, or None for the active version.
+
+        Returns:
+            Optional[VersionRecord[TVersion]]: The version record, or None if not found.
+        """
+
+        if version is None:
+            row = self._connection().execute(self._sql_get_active, (id,)).fetchone()
+        else:
+            row = self._connection().execute(self._sql_get_version, (id, version)).fetchone()
+
+        return self._record(row) if row else None
+
+
+    def get_versions(
+        self,
+        id: str
+    ) -> List[TVersion]:
+        """
+        Get all versions of a file by its ID.
+
+        Args:
+            id (str): The ID of the file to retrieve.
+
+        Returns:
+            List[TVersion]: A list of all versions of the file, newest first.
+        """
+
+        rows = self._connection().execute(self._sql_get_versions, (id,)).fetchall()
+        return [self._deserialize(row) for row in rows]
+
+
+    def deactivate_versions(
+        self,
+        id: str,
+        below: Optional[int] = None
+    ) -> None:
+        """
+        Deactivate all versions of a file by its ID.
+
+        Args:
+            id (str): The ID of the file to deactivate.
+            below (Optional[int]): Only deactivate versions numbered below this one.
+
+        Returns:
+            None
+        """
+
+        # Without a bound every version is below the largest SQLite integer.
+        below = (1 << 63) - 1 if below is None else below
+
+        with self._connection() as conn:
+            conn.execute(self._sql_deactivate, (datetime.now().isoformat(), id, below))
+            if self._indexed_fields:
+                conn.execute(self._sql_index_deactivate, (id, below))
+
+
+    def delete_versions(
+        self,
+        id: str
+    ) -> None:
+        """
+        Delete all versions of a file by its ID.
+
+        Args:
+            id (str): The ID of the file to delete.
+
+        Returns:
+            None
+        """
+
+        now = datetime.now().isoformat()
+        with self._connection() as conn:
+            conn.execute(self._sql_delete, (now, now, id))
+            if self._indexed_fields:
+                conn.execute(self._sql_index_delete, (id,))
+
+
+    def save(
+        self,
+        version: TVersion,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Save a file version.
+
+        Args:
+            version (TVersion): The file version to save.
+            path (str): The storage path of the file.
+            attributes (Optional[Dict[str, Any]]): Storage-level attributes kept with the record.
+
+        Returns:
+            None
+        """
+
+        with self._connection() as conn:
+            conn.execute(self._sql_save, self._serialize(version, path, attributes))
+            self._write_index(conn, version)
+
+
+    def save_many(
+        self,
+        items: Iterable[Tuple]
+    ) -> None:
+        """
+        Save many file versions in a single transaction.
+
+        Args:
+            items (Iterable[Tuple]): (version, storage path) pairs, optionally
+                followed by the record attributes.
+
+        Returns:
+            None
+        """
+
+        items = list(items)
+
+        with self._connection() as conn:
+            conn.executemany(
+                self._sql_save,
+                (self._serialize(*item) for item in items)
+            )
+            for version, *_ in items:
+                self._write_index(conn, version)
+
+
+    def find(
+        self,
+        filters: Dict[str, Any],
+        *,
+        active_only: bool = True,
+        limit: int = 100,
+        page_token: Optional[str] = None
+    ) -> Page[TVersion]:
+        """
+        Find versions by equality filters on declared secondary indexes.
+
+        Each filter joins the index table once; results are ordered by
+        (id, version) and paged with a keyset token.
+
+        Args:
+            filters (Dict[str, Any]): Field path to value, e.g. {"metadata.customer": "ACME"}.
+            active_only (bool): Whether to return only active versions.
+            limit (int): The maximum number of versions per page.
+            page_token (Optional[str]): The token of the page to fetch.
+
+        Returns:
+            Page[TVersion]: The matching versions and the token of the next page.
+        """
+
+        resolved = resolve_filters(filters, self._indexed_fields)
+
+        joins = []
+        params: List[Any] = []
+        for n, (field, value) in enumerate(resolved.items()):
+            status = "i{n}.status = 'ACTIVE'" if active_only else "i{n}.status != 'DELETED'"
+            joins.append(
+                f"JOIN {self._table}_index i{n} ON i{n}.id = v.id AND i{n}.version = v.version "
+                f"AND i{n}.field = ? AND i{n}.value = ? AND " + status.format(n=n)
+            )
+            params.extend([field, str(value)])
+
+        where = ""
+        if page_token:
+            last_id, last_version = json.loads(page_token)
+            where = "WHERE (v.id, v.version) > (?, ?)"
+            params.extend([last_id, last_version])
+
+        params.append(limit + 1)
+        rows = self._connection().execute(
+            f"SELECT v.data, v.status, v.id, v.version FROM {self._table} v "
+            f"{' '.join(joins)} {where} ORDER BY v.id, v.version LIMIT ?",
+            params
+        ).fetchall()
+
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = json.dumps([rows[-1][2], rows[-1][3]])
+
+        return Page(items=[self._deserialize(row) for row in rows], next_token=next_token)
+
+
+    def get_records(
+        self,
+        id: str
+    ) -> List[VersionRecord[TVersion]]:
+        """
+        Get all versions of a file together with their storage paths.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            List[VersionRecord[TVersion]]: The version records, newest first.
+        """
+
+        rows = self._connection().execute(self._sql_get_records, (id,)).fetchall()
+        return [self._record(row, stamped=True) for row in rows]
+
+
+    def get_as_of(
+        self,
+        id: str,
+        timestamp: datetime
+    ) -> Optional[TVersion]:
+        """
+        Get the version of a file that was active at a point in time.
+
+        Args:
+            id (str): The ID of the file.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+
+        Returns:
+            Optional[TVersion]: The version, or None if the file had no active version then.
+        """
+
+        at = normalize_timestamp(timestamp).isoformat()
+        row = self._connection().execute(self._sql_get_as_of, (id, at, at)).fetchone()
+        return self._deserialize(row) if row else None
+
+
+    def snapshot(
+        self,
+        selection: Sequence[str] | str,
+        timestamp: datetime,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through the records that were active at a point in time.
+
+        Each page is one grouped query over the (id, created_at,
+        deactivated_at) index: an ID range for a prefix, or an IN list for
+        explicit IDs.
+
+        Args:
+            selection (Sequence[str] | str): The file IDs, or an ID prefix.
+            timestamp (datetime): The point in time, on the same clock as `created_at`.
+            limit (int): The maximum number of files per page.
+            page_token (Optional[str]): The token of the page to fetch.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        at = normalize_timestamp(timestamp).isoformat()
+        conn = self._connection()
+
+        if isinstance(selection, str):
+            last_id = json.loads(page_token) if page_token else ""
+            where = "id > ? AND id >= ?"
+            params: List[Any] = [last_id, selection]
+
+            end = prefix_end(selection)
+            if end is not None:
+                where += " AND id < ?"
+                params.append(end)
+
+            rows = conn.execute(
+                self._sql_snapshot.format(where=where),
+                (*params, at, at, limit)
+            ).fetchall()
+
+            next_token = json.dumps(rows[-1][4]) if len(rows) == limit else None
+            return Page(items=[self._record(row) for row in rows], next_token=next_token)
+
+        ids = list(selection)
+        offset = json.loads(page_token) if page_token else 0
+        chunk = ids[offset:offset + limit]
+
+        found = {}
+        # Stay well below SQLite's bound parameter limit.
+        for start in range(0, len(chunk), 500):
+            part = chunk[start:start + 500]
+            rows = conn.execute(
+                self._sql_snapshot.format(where=f"id IN ({', '.join('?' * len(part))})"),
+                (*part, at, at, len(part))
+            ).fetchall()
+            found.update((row[4], row) for row in rows)
+
+        next_token = json.dumps(offset + limit) if offset + limit < len(ids) else None
+        return Page(
+            items=[self._record(found[id]) for id in dict.fromkeys(chunk) if id in found],
+            next_token=next_token,
+        )
+
+
+    def scan(
+        self,
+        *,
+        limit: int = 1000,
+        page_token: Optional[str] = None,
+        segment: int = 0,
+        total_segments: int = 1
+    ) -> Page[VersionRecord[TVersion]]:
+        """
+        Page through every stored version in (id, version) order.
+
+        Segments split files by a CRC32 of their ID.
+
+        Args:
+            limit (int): The maximum number of records per page.
+            page_token (Optional[str]): The token of the page to fetch.
+            segment (int): The segment to scan, from 0 to `total_segments` - 1.
+            total_segments (int): The number of segments the table is split into.
+
+        Returns:
+            Page[VersionRecord[TVersion]]: The records and the token of the next page.
+        """
+
+        last_id, last_version = json.loads(page_token) if page_token else ("", -1)
+
+        if total_segments > 1:
+            rows = self._connection().execute(
+                self._sql_scan_segment,
+                (last_id, last_version, total_segments, segment, limit)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                self._sql_scan, (last_id, last_version, limit)
+            ).fetchall()
+
+        next_token = json.dumps([rows[-1][4], rows[-1][5]]) if len(rows) == limit else None
+        return Page(items=[self._record(row) for row in rows], next_token=next_token)
+
+
+    def allocate_version(
+        self,
+        id: str
+    ) -> int:
+        """
+        Atomically reserve the next version number of a file.
+
+        The counter row is created on first use, seeded from the highest
+        stored version, and incremented by one upsert afterwards.
+
+        Args:
+            id (str): The ID of the file.
+
+        Returns:
+            int: The reserved version number.
+        """
+
+        with self._connection() as conn:
+            return conn.execute(self._sql_allocate, (id, id)).fetchone()[0]
+
+
+    def update_location(
+        self,
+        id: str,
+        version: int,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Change the storage path and attributes of one version.
+
+        Args:
+            id (str): The ID of the file.
+            version (int): The version number.
+            path (str): The new storage path.
+            attributes (Optional[Dict[str, Any]]): The new storage-level attributes.
+
+        Returns:
+            None
+        """
+
+        with self._connection() as conn:
+            conn.execute(
+                self._sql_update_location,
+                (path, json.dumps(attributes, default=_encode) if attributes else None, id, version)
+            )
+
+
+    def purge(
+        self,
+        versions: List[TVersion]
+    ) -> None:
+        """
+        Permanently remove specific version rows in one transaction.
+
+        Args:
+            versions (List[TVersion]): The versions to remove.
+
+        Returns:
+            None
+        """
+
+        keys = [(v.id, v.version) for v in versions]
+
+        with self._connection() as conn:
+            conn.executemany(self._sql_purge, keys)
+            if self._indexed_fields:
+                conn.executemany(self._sql_index_clear, keys)
+
+
+    def close(self) -> None:
+        """
+        Close the connections opened by every thread.
+        """
+
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: The thread-local connection.
+        """
+
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(self._database, timeout=30.0, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function("file_segment", 2, _segment, deterministic=True)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+
+        return conn
+
+
+    def _create_schema(self) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._table} (
+                    id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at TEXT,
+                    storage_path TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (id, version)
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self._table})")}
+            if "attributes" not in columns:
+                conn.execute(f"ALTER TABLE {self._table} ADD COLUMN attributes TEXT")
+            if "deactivated_at" not in columns:
+                conn.execute(f"ALTER TABLE {self._table} ADD COLUMN deactivated_at TEXT")
+                # Rows deactivated before the column existed ended when their
+                # successor was created.
+                conn.execute(
+                    f"UPDATE {self._table} SET deactivated_at = ("
+                    f"SELECT MIN(n.created_at) FROM {self._table} n "
+                    f"WHERE n.id = {self._table}.id AND n.version > {self._table}.version"
+                    f") WHERE status != 'ACTIVE'"
+                )
+            if "deleted_at" not in columns:
+                conn.execute(f"ALTER TABLE {self._table} ADD COLUMN deleted_at TEXT")
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self._table}_active "
+                f"ON {self._table} (id, version) WHERE status = 'ACTIVE'"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self._table}_as_of "
+                f"ON {self._table} (id, created_at, deactivated_at)"
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._table}_index (
+                    field TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    PRIMARY KEY (field, value, id, version)
+                )
+                """
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self._table}_index_by_id "
+                f"ON {self._table}_index (id, status)"
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._table}_counters (
+                    id TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+                """
+            )
+
+
+    def _write_index(
+        self,
+        conn: sqlite3.Connection,
+        version: TVersion
+    ) -> None:
+        """
+        Replace the secondary index rows of one version.
+
+        Args:
+            conn (sqlite3.Connection): The connection holding the open transaction.
+            version (TVersion): The saved version.
+
+        Returns:
+            None
+        """
+
+        if not self._indexed_fields:
+            return
+
+        data = asdict(version)
+        key = (data["id"], data.get("version", 1))
+        conn.execute(self._sql_index_clear, key)
+        conn.executemany(
+            self._sql_index_save,
+            (
+                (field, value, *key, data["status"])
+                for field in self._indexed_fields
+                for value in index_values(data, field)
+            )
+        )
+
+
+    def _serialize(
+        self,
+        version: TVersion,
+        path: str,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> tuple:
+        """
+        Serialize a version into the row parameters of the save statement.
+
+        Args:
+            version (TVersion): The version to serialize.
+            path (str): The storage path of the file.
+            attributes (Optional[Dict[str, Any]]): Storage-level attributes kept with the record.
+
+        Returns:
+            tuple: The statement parameters.
+        """
+
+        data = asdict(version)
+        created_at = data.get("created_at")
+
+        return (
+            data["id"],
+            data.get("version", 1),
+            data["status"],
+            normalize_timestamp(created_at).isoformat() if isinstance(created_at, datetime) else created_at,
+            path,
+            json.dumps(data, default=_encode),
+            json.dumps(attributes, default=_encode) if attributes else None,
+        )
+
+
+    def _deserialize(
+        self,
+        row: tuple
+    ) -> TVersion:
+        """
+        Deserialize a row into a version object.
+
+        Args:
+            row (tuple): The `data` and `status` columns.
+
+        Returns:
+            TVersion: The deserialized version object.
+        """
+
+        item = json.loads(row[0], object_hook=_decode)
+        item["status"] = row[1]
+
+        allowed_fields = self._version_cls.__dataclass_fields__.keys()
+        filtered = {k: v for k, v in item.items() if k in allowed_fields}
+        return self._version_cls(**filtered)
+
+
+    def _record(
+        self,
+        row: tuple,
+        stamped: bool = False
+    ) -> VersionRecord[TVersion]:
+        """
+        Build a version record from the `data`, `status`, `storage_path` and `attributes` columns.
+
+        Args:
+            row (tuple): The selected columns.
+            stamped (bool): Whether `deactivated_at` and `deleted_at` follow them.
+
+        Returns:
+            VersionRecord[TVersion]: The version record.
+        """
+
+        return VersionRecord(
+            version=self._deserialize(row),
+            storage_path=row[2],
+            attributes=json.loads(row[3], object_hook=_decode) if row[3] else {},
+            deactivated_at=datetime.fromisoformat(row[4]) if stamped and row[4] else None,
+            deleted_at=datetime.fromisoformat(row[5]) if stamped and row[5] else None,
+        )
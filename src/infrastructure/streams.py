@@ -0,0 +1,62 @@
+# ---------------------------------------------------------------------
+# Standard library
+# ---------------------------------------------------------------------
+import io
+
+
+class ViewReader(io.RawIOBase):
+    """
+    Seekable read-only stream over a memoryview.
+
+    Lets SDKs that want a file object send (and rewind for retries) a slice
+    of a memory-mapped file without copying it into a bytes object.
+    """
+
+    def __init__(
+        self,
+        view: memoryview
+    ):
+        """
+        Initialize the ViewReader.
+
+        Args:
+            view (memoryview): The bytes to read.
+
+        Returns:
+            None
+        """
+
+        self._view = memoryview(view).cast("B")
+        self._position = 0
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def seekable(self) -> bool:
+        return True
+
+
+    def tell(self) -> int:
+        return self._position
+
+
+    def seek(
+        self,
+        offset: int,
+        whence: int = io.SEEK_SET
+    ) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+
+    def readinto(
+        self,
+        buffer
+    ) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)